@@ -0,0 +1 @@
+"""Benchmarks for the harness, metrics and protocols."""
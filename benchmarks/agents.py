@@ -0,0 +1,83 @@
+"""Agents used by the benchmarks."""
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from sail_on_client.agent.mock_ond_agents import MockONDAgent
+from sail_on_client.protocol.visual_round import VisualRound
+
+from benchmarks.synthetic import SyntheticTest
+
+
+class SyntheticONDAgent(MockONDAgent):
+    """
+    Mock agent that returns results from a synthetic test.
+
+    The mock agents copy the dataset file as their results, which does not
+    have scores for the harness to parse. This agent returns the detection
+    and classification scores of the synthetic test as arrays, so the
+    protocol exercises the same path as an agent with real predictions
+    without spending time on a model.
+    """
+
+    def __init__(self, test: SyntheticTest) -> None:
+        """
+        Construct agent for a synthetic test.
+
+        Args:
+            test: Synthetic test used for the results
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.test = test
+        self._positions = {
+            instance_id: idx for idx, instance_id in enumerate(test.instance_ids)
+        }
+        self._round_positions = np.zeros(0, dtype=np.int64)
+
+    def feature_extraction(
+        self, toolset: Dict
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Feature extraction step for the algorithm.
+
+        Args:
+            toolset (dict): Dictionary containing parameters for different steps
+
+        Return:
+            Tuple of dictionary
+        """
+        self.dataset = toolset["dataset"]
+        instance_ids = VisualRound.get_instance_ids(self.dataset)
+        self._round_positions = np.asarray(
+            [self._positions[instance_id] for instance_id in instance_ids],
+            dtype=np.int64,
+        )
+        return {}, {}
+
+    def world_detection(self, toolset: Dict) -> np.ndarray:
+        """
+        Detect change in world ( Novelty has been introduced ).
+
+        Args:
+            toolset (dict): Dictionary containing parameters for different steps
+
+        Return:
+            Array with the probability of change in world for every instance
+        """
+        return self.test.detection[self._round_positions] * 0.9 + 0.05
+
+    def novelty_classification(self, toolset: Dict) -> np.ndarray:
+        """
+        Classify data provided in known classes and unknown class.
+
+        Args:
+            toolset (dict): Dictionary containing parameters for different steps
+
+        Return:
+            Array with classification scores for every instance
+        """
+        return self.test.scores[self._round_positions]
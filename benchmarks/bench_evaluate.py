@@ -0,0 +1,66 @@
+"""Benchmarks for evaluating tests with the local harness."""
+
+import json
+
+import pytest
+
+from sail_on_client.evaluate import create_metric_instance
+from sail_on_client.evaluate.evaluation_engine import evaluate_accuracy
+from sail_on_client.harness.local_harness import _read_results
+
+from benchmarks.synthetic import DOMAINS
+
+
+@pytest.mark.parametrize("domain", DOMAINS, scope="session")
+@pytest.mark.parametrize("vectorized_metrics", [False, True])
+def bench_evaluate(
+    benchmark, domain, vectorized_metrics, synthetic_test, posted_session
+):
+    """Benchmark computing every program metric for a test."""
+    harness, session_id = posted_session
+    harness.vectorized_metrics = vectorized_metrics
+    results = benchmark(harness.evaluate, synthetic_test.config.test_id, 0, session_id)
+    assert "m_acc" in results
+
+
+@pytest.mark.parametrize("domain", DOMAINS, scope="session")
+@pytest.mark.parametrize("vectorized_metrics", [False, True])
+def bench_m_acc(
+    benchmark, domain, vectorized_metrics, synthetic_test, posted_session, gt_path
+):
+    """Benchmark top1 and top3 accuracy for a test."""
+    import pandas as pd
+
+    harness, session_id = posted_session
+    config = synthetic_test.config
+    with open(synthetic_test.gt_config, "r") as f:
+        metric = create_metric_instance(config.protocol, domain, json.load(f))
+    gt = pd.read_csv(gt_path, sep=",", header=None, skiprows=1, quotechar="|")
+    classifications = _read_results(
+        str(harness.result_dir),
+        config.protocol,
+        domain,
+        session_id,
+        config.test_id,
+        "classification",
+        quotechar="|",
+    )
+    # Image classification has no novelty labels and uses the detection labels
+    gt_novel_idx = (
+        metric.detection_id if domain == "image_classification" else metric.novel_id
+    )
+    gt_novel, gt_class = gt[gt_novel_idx], gt[metric.classification_id]
+    if vectorized_metrics:
+        m_acc = benchmark(
+            evaluate_accuracy,
+            classifications,
+            gt,
+            gt_novel_idx,
+            metric.classification_id,
+            config.round_size,
+        )
+    else:
+        m_acc = benchmark(
+            metric.m_acc, gt_novel, classifications, gt_class, config.round_size, 5
+        )
+    assert "full_top1" in m_acc
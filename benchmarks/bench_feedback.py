@@ -0,0 +1,35 @@
+"""Benchmarks for feedback provided by the local harness."""
+
+import pytest
+
+from benchmarks.synthetic import DOMAINS
+
+# Feedback types supported by the file provider for every domain
+FEEDBACK_TYPES = {
+    "image_classification": ["classification", "score"],
+    "activity_recognition": ["labels", "score"],
+    "transcripts": ["classification", "score", "transcription"],
+}
+
+
+@pytest.mark.parametrize("domain", DOMAINS, scope="session")
+@pytest.mark.parametrize(
+    "feedback_type", ["classification", "labels", "score", "transcription"]
+)
+def bench_get_feedback(
+    benchmark, domain, feedback_type, synthetic_test, posted_session
+):
+    """Benchmark feedback for every instance in the last round of a test."""
+    if feedback_type not in FEEDBACK_TYPES[domain]:
+        pytest.skip(f"{feedback_type} feedback is not supported for {domain}")
+    harness, session_id = posted_session
+    config = synthetic_test.config
+    feedback_ids = synthetic_test.round_ids(config.num_rounds - 1)
+    feedback = benchmark(
+        harness.file_provider.get_feedback,
+        feedback_ids,
+        feedback_type,
+        session_id,
+        config.test_id,
+    )
+    assert len(feedback.getvalue()) > 0
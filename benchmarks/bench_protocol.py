@@ -0,0 +1,46 @@
+"""Benchmarks for running the OND protocol with the local harness."""
+
+import os
+
+import pytest
+
+from sail_on_client.harness.local_harness import LocalHarness
+from sail_on_client.protocol.ond_protocol import ONDProtocol
+
+from benchmarks.agents import SyntheticONDAgent
+from benchmarks.synthetic import DOMAINS, SyntheticTest, SyntheticTestConfig
+
+
+@pytest.fixture(scope="session")
+def protocol_test(domain, tmp_path_factory):
+    """Synthetic test with 10000 instances in 100 rounds."""
+    config = SyntheticTestConfig(domain, round_size=100, num_rounds=100)
+    return SyntheticTest(str(tmp_path_factory.mktemp("data")), config)
+
+
+@pytest.mark.parametrize("domain", DOMAINS, scope="session")
+def bench_run_protocol(benchmark, domain, protocol_test, tmp_path_factory):
+    """Benchmark running every round of a test with a synthetic agent."""
+
+    def setup():
+        output_dir = str(tmp_path_factory.mktemp("protocol"))
+        harness = LocalHarness(
+            protocol_test.data_dir,
+            os.path.join(output_dir, "results"),
+            protocol_test.gt_dir,
+            protocol_test.gt_config,
+        )
+        ond = ONDProtocol(
+            {"SyntheticONDAgent": SyntheticONDAgent(protocol_test)},
+            protocol_test.data_dir,
+            domain,
+            harness,
+            os.path.join(output_dir, "save"),
+            "seed",
+            [protocol_test.config.test_id],
+            # Mock agents do not characterize novelty
+            skip_stages=["NoveltyCharacterization"],
+        )
+        return (ond, {}), {}
+
+    benchmark.pedantic(ONDProtocol.run_protocol, setup=setup, rounds=5)
@@ -0,0 +1,22 @@
+"""Benchmarks for logging session activity."""
+
+import pytest
+
+from sail_on_client.harness.file_provider_fn import log_session
+
+from benchmarks.synthetic import DOMAINS
+
+
+@pytest.mark.parametrize("domain", DOMAINS, scope="session")
+def bench_log_session(benchmark, domain, synthetic_test, posted_session):
+    """Benchmark logging a data request in a session with every round posted."""
+    harness, session_id = posted_session
+    config = synthetic_test.config
+    benchmark(
+        log_session,
+        str(harness.result_dir),
+        session_id,
+        "data_request",
+        config.test_id,
+        config.num_rounds - 1,
+    )
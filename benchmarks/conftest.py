@@ -0,0 +1,68 @@
+"""Configuration used by pytest to register fixtures for the benchmarks."""
+
+import itertools
+import os
+from typing import Tuple
+
+import pytest
+
+from sail_on_client.harness.local_harness import LocalHarness
+
+from benchmarks.synthetic import SyntheticTest, SyntheticTestConfig
+
+# Sizes of the synthetic tests used by the benchmarks, every domain is
+# benchmarked with every combination of round size, number of rounds and
+# number of classes
+ROUND_SIZES = [32, 100]
+NUM_ROUNDS = [10, 100]
+CLASS_COUNTS = [50, 200]
+TEST_SIZES = list(itertools.product(ROUND_SIZES, NUM_ROUNDS, CLASS_COUNTS))
+
+
+def _size_id(test_size: Tuple[int, int, int]) -> str:
+    """Private function to get the id of a test size in the benchmark name."""
+    return "round_size={}-rounds={}-classes={}".format(*test_size)
+
+
+@pytest.fixture(scope="session", params=TEST_SIZES, ids=_size_id)
+def test_size(request):
+    """Round size, number of rounds and number of classes for a synthetic test."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def synthetic_test(domain, test_size, tmp_path_factory):
+    """Synthetic test for the domain with ground truth written to the disk."""
+    round_size, num_rounds, num_classes = test_size
+    config = SyntheticTestConfig(domain, round_size, num_rounds, num_classes)
+    return SyntheticTest(str(tmp_path_factory.mktemp("data")), config)
+
+
+@pytest.fixture(scope="session")
+def posted_session(synthetic_test, tmp_path_factory):
+    """Local harness with a session where results are posted for every round."""
+    config = synthetic_test.config
+    harness = LocalHarness(
+        synthetic_test.data_dir,
+        str(tmp_path_factory.mktemp("results")),
+        synthetic_test.gt_dir,
+        synthetic_test.gt_config,
+    )
+    session_id = harness.session_request(
+        [config.test_id], config.protocol, config.domain, "0.1.1", [], 0.5
+    )
+    for round_id in range(config.num_rounds):
+        harness.round_dataset_request(config.test_id, round_id, session_id)
+        harness.post_results(
+            synthetic_test.round_results(round_id), config.test_id, round_id, session_id
+        )
+    yield harness, session_id
+    harness.temp_dir.cleanup()
+
+
+@pytest.fixture(scope="session")
+def gt_path(synthetic_test):
+    """Path to the ground truth of the synthetic test."""
+    return os.path.join(
+        synthetic_test.gt_dir, f"{synthetic_test.config.test_id}_single_df.csv"
+    )
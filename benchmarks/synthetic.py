@@ -0,0 +1,287 @@
+"""Synthetic tests used by the benchmarks."""
+
+from dataclasses import dataclass
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+import ubelt as ub
+
+DOMAINS = ["image_classification", "activity_recognition", "transcripts"]
+
+# Columns of the ground truth, matching the column mapping used for the domain
+GT_COLUMNS: Dict[str, List[str]] = {
+    "image_classification": ["image_id", "detection", "classification"],
+    "activity_recognition": [
+        "video_id",
+        "novel",
+        "detection",
+        "classification",
+        "spatial",
+        "temporal",
+    ],
+    "transcripts": [
+        "image_id",
+        "text",
+        "novel",
+        "representation",
+        "detection",
+        "classification",
+        "pen_pressure",
+        "letter_size",
+        "word_spacing",
+        "slant_angle",
+        "attribute",
+    ],
+}
+
+# Position of the score for the unknown class in classification results,
+# the local harness expects the score at this position for every domain
+UNKNOWN_SCORE_IDX = {
+    "image_classification": 0,
+    "activity_recognition": 30,
+    "transcripts": 49,
+}
+
+_WORDS = [
+    "the",
+    "strongest",
+    "partners",
+    "winked",
+    "at",
+    "his",
+    "dust",
+    "They",
+    "all",
+    "Europe",
+    "and",
+    "militarily",
+    "in",
+    ".",
+    ";",
+]
+
+
+@dataclass(frozen=True)
+class SyntheticTestConfig:
+    """Parameters used for generating a synthetic test."""
+
+    domain: str
+    round_size: int = 100
+    num_rounds: int = 100
+    num_classes: int = 50
+    pre_novelty_rounds: int = 5
+    protocol: str = "OND"
+    seed: int = 0
+
+    @property
+    def num_instances(self) -> int:
+        """Number of instances in the test."""
+        return self.round_size * self.num_rounds
+
+    @property
+    def test_id(self) -> str:
+        """Identifier of the test, unique for the size of the test."""
+        return f"{self.protocol}.{self.num_rounds}.{self.round_size}.{self.num_classes}"
+
+
+class SyntheticTest:
+    """
+    Ground truth and results for a synthetic test.
+
+    The ground truth, metadata and column mapping are written in the layout
+    used by the local harness. Novelty is introduced after the pre novelty
+    rounds and half of the instances after the red light are novel. Results
+    are generated from the ground truth, so feedback and metrics exercise
+    both correct and incorrect predictions.
+    """
+
+    def __init__(self, data_dir: str, config: SyntheticTestConfig) -> None:
+        """
+        Generate a synthetic test.
+
+        Args:
+            data_dir: Directory used as the data directory of the harness
+            config: Parameters of the test
+
+        Returns:
+            None
+        """
+        if config.domain not in GT_COLUMNS:
+            raise ValueError(f"Unsupported domain {config.domain}")
+        if config.num_classes < UNKNOWN_SCORE_IDX[config.domain]:
+            raise ValueError(
+                f"{config.domain} requires at least {UNKNOWN_SCORE_IDX[config.domain]} classes"
+            )
+        self.config = config
+        self.data_dir = data_dir
+        self.gt_dir = os.path.join(data_dir, config.protocol, config.domain)
+        self.gt_config = os.path.join(self.gt_dir, f"{config.domain}.json")
+        self._rng = np.random.RandomState(config.seed)
+        num_instances = config.num_instances
+        extension = "mp4" if config.domain == "activity_recognition" else "png"
+        self.instance_ids = [f"{idx:08d}.{extension}" for idx in range(num_instances)]
+        self.red_light_idx = min(
+            config.pre_novelty_rounds * config.round_size, num_instances - 1
+        )
+        self.novel = np.zeros(num_instances, dtype=np.int64)
+        self.novel[self.red_light_idx :] = self._rng.randint(
+            0, 2, num_instances - self.red_light_idx
+        )
+        self.novel[self.red_light_idx] = 1
+        self.detection = np.zeros(num_instances, dtype=np.int64)
+        self.detection[self.red_light_idx :] = 1
+        # Novel instances are labeled with the unknown class
+        self.classes = self._rng.randint(1, config.num_classes + 1, num_instances)
+        self.classes[self.novel == 1] = 0
+        self.transcripts = [
+            " ".join(self._rng.choice(_WORDS, self._rng.randint(5, 15)))
+            for _ in range(num_instances)
+        ]
+        self.scores = self.classification_scores()
+        ub.ensuredir(self.gt_dir)
+        self._write_ground_truth()
+        self._write_metadata()
+
+    def _gt_row(self, idx: int) -> List[str]:
+        """
+        Private function to get a row of the ground truth.
+
+        Args:
+            idx: Position of the instance in the test
+
+        Returns:
+            Values in the row
+        """
+        instance_id = self.instance_ids[idx]
+        novel, detection = str(self.novel[idx]), str(self.detection[idx])
+        gt_class = str(self.classes[idx])
+        if self.config.domain == "image_classification":
+            return [instance_id, detection, gt_class]
+        if self.config.domain == "activity_recognition":
+            return [instance_id, novel, detection, gt_class, "0", "0"]
+        return [
+            instance_id,
+            self.transcripts[idx],
+            novel,
+            "lines_fixed",
+            detection,
+            gt_class,
+            "1",
+            "1",
+            "2",
+            "3",
+            "original",
+        ]
+
+    def _write_ground_truth(self) -> None:
+        """Private function to write the ground truth and the column mapping."""
+        columns = GT_COLUMNS[self.config.domain]
+        gt_path = os.path.join(self.gt_dir, f"{self.config.test_id}_single_df.csv")
+        with open(gt_path, "w") as f:
+            f.write(",".join(columns) + "\n")
+            for idx in range(self.config.num_instances):
+                f.write(",".join(self._gt_row(idx)) + "\n")
+        with open(self.gt_config, "w") as f:
+            json.dump({column: idx for idx, column in enumerate(columns)}, f)
+        with open(os.path.join(self.gt_dir, "test_ids.csv"), "w") as f:
+            f.write(f"{self.config.test_id}\n")
+
+    def _write_metadata(self) -> None:
+        """Private function to write the metadata for the test."""
+        config = self.config
+        metadata = {
+            "protocol": config.protocol,
+            "domain": config.domain,
+            "known_classes": config.num_classes,
+            "max_novel_classes": 1,
+            "round_size": config.round_size,
+            "n_rounds": config.num_rounds,
+            "pre_novelty_batches": config.pre_novelty_rounds,
+            "threshold": 0.5,
+            "red_light": self.instance_ids[self.red_light_idx],
+            # Feedback can be requested repeatedly without exhausting the budget
+            "feedback_max_ids": np.iinfo(np.int32).max,
+        }
+        metadata_path = os.path.join(self.gt_dir, f"{config.test_id}_metadata.json")
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f)
+
+    def round_ids(self, round_id: int) -> List[str]:
+        """
+        Get instance ids in a round.
+
+        Args:
+            round_id: The sequential number of the round
+
+        Returns:
+            List of instance ids
+        """
+        round_size = self.config.round_size
+        return self.instance_ids[round_id * round_size : (round_id + 1) * round_size]
+
+    def classification_scores(self) -> np.ndarray:
+        """
+        Get classification scores for every instance in the test.
+
+        The correct class has the highest score for about two thirds of the
+        instances.
+
+        Returns:
+            Array with a row of scores for every instance
+        """
+        rng = np.random.RandomState(self.config.seed + 1)
+        num_instances, num_scores = (
+            self.config.num_instances,
+            self.config.num_classes + 1,
+        )
+        scores = rng.uniform(0, 0.5, (num_instances, num_scores))
+        # Class 0 is the unknown class, which is placed at the position for the domain
+        label_idx = self.classes.copy()
+        unknown_idx = UNKNOWN_SCORE_IDX[self.config.domain]
+        known = label_idx != 0
+        label_idx[known] = label_idx[known] - 1 + (label_idx[known] > unknown_idx)
+        label_idx[~known] = unknown_idx
+        correct = rng.uniform(size=num_instances) < 2 / 3
+        scores[np.flatnonzero(correct), label_idx[correct]] = 1.0
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def round_results(self, round_id: int) -> Dict[str, bytes]:
+        """
+        Get contents of result files for a round.
+
+        Args:
+            round_id: The sequential number of the round
+
+        Returns:
+            Dictionary with the contents of result files with the type of result as key
+        """
+        round_size = self.config.round_size
+        start, end = round_id * round_size, (round_id + 1) * round_size
+        detection = [
+            f"{instance_id},{score}\n"
+            for instance_id, score in zip(
+                self.instance_ids[start:end], self.detection[start:end] * 0.9 + 0.05
+            )
+        ]
+        classification = [
+            instance_id + "," + ",".join(f"{score:.6f}" for score in scores) + "\n"
+            for instance_id, scores in zip(
+                self.instance_ids[start:end], self.scores[start:end]
+            )
+        ]
+        results = {
+            "detection": "".join(detection).encode("utf-8"),
+            "classification": "".join(classification).encode("utf-8"),
+        }
+        if self.config.domain == "transcripts":
+            # Every other transcript drops the last word
+            transcription = [
+                f"{instance_id},{text if idx % 2 else text.rsplit(' ', 1)[0]}\n"
+                for idx, (instance_id, text) in enumerate(
+                    zip(self.instance_ids[start:end], self.transcripts[start:end])
+                )
+            ]
+            results["transcription"] = "".join(transcription).encode("utf-8")
+        return results
@@ -7,7 +7,6 @@ from typing import Dict, Any, Tuple, Callable
 import logging
 import os
 import shutil
-import torch
 
 log = logging.getLogger(__name__)
 
@@ -182,6 +181,8 @@ class MockCONDDAAdapterWithCheckpoint(MockCONDDAAgent, Checkpointer):
         Return:
             True if both instances have same attributes
         """
+        import torch
+
         if not isinstance(other, MockCONDDAAdapterWithCheckpoint):
             return NotImplemented
 
@@ -8,7 +8,6 @@ from typing import Dict, Any, Tuple, Callable
 import logging
 import os
 import shutil
-import torch
 
 log = logging.getLogger(__name__)
 
@@ -202,6 +201,8 @@ class MockONDAdapterWithCheckpoint(Checkpointer, MockONDAgent):
         Return:
             True if both instances have same attributes
         """
+        import torch
+
         if not isinstance(other, MockONDAdapterWithCheckpoint):
             return NotImplemented
 
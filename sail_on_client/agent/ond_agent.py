@@ -1,6 +1,7 @@
 """Abstract interface for an agent that works under OND."""
 
 from sail_on_client.agent.visual_agent import VisualAgent
+from sail_on_client.harness.results import AgentResultType
 from typing import Dict
 from abc import abstractmethod
 
@@ -13,7 +14,7 @@ class ONDAgent(VisualAgent):
         return {}
 
     @abstractmethod
-    def novelty_classification(self, ncl_toolset: Dict) -> str:
+    def novelty_classification(self, ncl_toolset: Dict) -> AgentResultType:
         """
         Abstract method for novelty classification.
 
@@ -21,7 +22,8 @@ class ONDAgent(VisualAgent):
             ncl_toolset: Parameters for feature extraction
 
         Returns:
-            Path to results for novelty classification.
+            Path to results for novelty classification, the results in
+            memory or an array with a row of results for every instance in the round.
         """
         pass
 
@@ -3,11 +3,10 @@
 from sail_on_client.agent.visual_agent import VisualAgent
 from sail_on_client.agent.ond_agent import ONDAgent
 from sail_on_client.agent.condda_agent import CONDDAAgent
-from typing import Dict, Any, Tuple, Callable
+from typing import Dict, Any, List, Tuple, Callable, Union
 
 import logging
 import os
-import pandas as pd
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +35,8 @@ class PreComputedAgent(VisualAgent):
         self.cache_dir = cache_dir
         self.has_roundwise_file = has_roundwise_file
         self.round_size = round_size
+        # Contents of result files for a test with the offset of every row
+        self._result_index: Dict[str, Tuple[bytes, List[int]]] = {}
         self.step_dict: Dict[str, Callable] = {
             "Initialize": self.initialize,
             "FeatureExtraction": self.feature_extraction,
@@ -74,6 +75,7 @@ class PreComputedAgent(VisualAgent):
         """
         self.round_idx = {"detection": 0, "classification": 0}
         self.test_id = toolset["test_id"]
+        self._result_index = {}
 
     def _get_test_info_from_toolset(self, toolset: Dict) -> Tuple:
         """
@@ -113,20 +115,45 @@ class PreComputedAgent(VisualAgent):
                 self.cache_dir, f"{test_id}_{self.algorithm_name}_{step_descriptor}.csv"
             )
 
-    def _generate_step_result(self, toolset: Dict, step_descriptor: str) -> str:
+    def _load_result_index(self, result_path: str) -> Tuple[bytes, List[int]]:
+        """
+        Private function to read a result file once for a test.
+
+        Args:
+            result_path: Path to the result file for the test
+
+        Return:
+            Contents of the result file with the offset where every row starts
+            and the length of the contents as the last offset
+        """
+        if result_path not in self._result_index:
+            with open(result_path, "rb") as f:
+                content = f.read()
+            offsets = []
+            position = 0
+            for line in content.splitlines(keepends=True):
+                # Blank lines are not rows of the results
+                if line.strip():
+                    offsets.append(position)
+                position += len(line)
+            offsets.append(len(content))
+            self._result_index[result_path] = (content, offsets)
+        return self._result_index[result_path]
+
+    def _generate_step_result(
+        self, toolset: Dict, step_descriptor: str
+    ) -> Union[str, bytes]:
         result_path = self._get_result_path(toolset, step_descriptor)
         if self.has_roundwise_file:
             return result_path
         else:
-            round_file_path = os.path.join(
-                self.cache_dir, f"{self.algorithm_name}_{step_descriptor}.csv"
-            )
+            content, offsets = self._load_result_index(result_path)
+            num_rows = len(offsets) - 1
             round_idx = self.round_idx[step_descriptor]
-            test_df = pd.read_csv(result_path, header=None)
-            round_df = test_df.iloc[round_idx : round_idx + self.round_size]
+            start = offsets[min(round_idx, num_rows)]
+            end = offsets[min(round_idx + self.round_size, num_rows)]
             self.round_idx[step_descriptor] += self.round_size
-            round_df.to_csv(round_file_path, index=False, header=False)
-            return round_file_path
+            return content[start:end]
 
     def feature_extraction(
         self, toolset: Dict
@@ -141,10 +168,9 @@ class PreComputedAgent(VisualAgent):
             Tuple of dictionary
         """
         self.dataset = toolset["dataset"]
-        pd.read_csv(self.dataset, header=None).shape[0]
         return {}, {}
 
-    def world_detection(self, toolset: Dict) -> str:
+    def world_detection(self, toolset: Dict) -> Union[str, bytes]:
         """
         Detect change in world ( Novelty has been introduced ).
 
@@ -152,7 +178,7 @@ class PreComputedAgent(VisualAgent):
             toolset (dict): Dictionary containing parameters for different steps
 
         Return:
-            path to csv file containing the results for change in world
+            path to csv file or contents of the csv file with the results for change in world
         """
         return self._generate_step_result(toolset, "detection")
 
@@ -188,7 +214,7 @@ class PreComputedONDAgent(PreComputedAgent, ONDAgent):
             }
         )
 
-    def novelty_classification(self, toolset: Dict) -> str:
+    def novelty_classification(self, toolset: Dict) -> Union[str, bytes]:
         """
         Classify data provided in known classes and unknown class.
 
@@ -196,7 +222,7 @@ class PreComputedONDAgent(PreComputedAgent, ONDAgent):
             toolset (dict): Dictionary containing parameters for different steps
 
         Return:
-            path to csv file containing the results for novelty classification step
+            path to csv file or contents of the csv file with the results for novelty classification step
         """
         return self._generate_step_result(toolset, "classification")
 
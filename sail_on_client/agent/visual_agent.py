@@ -2,6 +2,8 @@
 
 from smqtk_core import Configurable, Pluggable
 
+from sail_on_client.harness.results import AgentResultType
+
 from typing import Dict, Tuple, Any, TypeVar
 from abc import abstractmethod
 
@@ -45,7 +47,7 @@ class VisualAgent(Configurable, Pluggable):
         pass
 
     @abstractmethod
-    def world_detection(self, wd_toolset: Dict) -> str:
+    def world_detection(self, wd_toolset: Dict) -> AgentResultType:
         """
         Abstract method for detecting that the world has changed.
 
@@ -53,6 +55,7 @@ class VisualAgent(Configurable, Pluggable):
             wd_toolset: Parameters for feature extraction
 
         Returns:
-            Path to results for detecting that the world has changed.
+            Path to results for detecting that the world has changed, the results in
+            memory or an array with a row of results for every instance in the round.
         """
         pass
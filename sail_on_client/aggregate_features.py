@@ -1,9 +1,23 @@
 """Helper script to aggregate features generated by client."""
 import argparse
 from argparse import Namespace
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
 import pickle as pkl
+import shutil
+from tempfile import TemporaryDirectory
 from tqdm import tqdm
-from typing import Dict
+from typing import Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from sail_on_client.utils.feature_store import (
+    FEATURE_FORMATS,
+    FeatureStoreWriter,
+    is_feature_store,
+    load_feature_store,
+    load_features,
+    save_feature_store,
+)
 
 
 def cmd_opts() -> Namespace:
@@ -22,37 +36,170 @@ def cmd_opts() -> Namespace:
     parser.add_argument(
         "--feature-paths",
         nargs="+",
-        help="Path to feature files that would be aggregated",
+        help="Path to feature files or feature stores that would be aggregated",
     )
     parser.add_argument("--output-path", required=True, help="Path of the output file")
+    parser.add_argument(
+        "--output-format",
+        choices=FEATURE_FORMATS,
+        default="pickle",
+        help="Format of the output, mmap writes a feature store incrementally",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used for converting feature files, only used with the mmap output",
+    )
     args = parser.parse_args()
     return args
 
 
-def main() -> None:
+def _convert_features(feature_path: str, store_path: str) -> str:
     """
-    Entrypoint for the helper script.
+    Private function to convert a feature file to a feature store.
 
     Args:
-        None
+        feature_path: Path to a pickle file with features
+        store_path: Directory used for the feature store
+
+    Returns:
+        Path to the feature store
+    """
+    save_feature_store(store_path, load_features(feature_path))
+    return store_path
+
+
+def _load_converted(
+    feature_path: str, future: Optional["Future[str]"]
+) -> Iterator[Mapping[str, Mapping]]:
+    """
+    Private function to load features converted by a worker.
+
+    The temporary feature store is removed once the features are consumed.
+
+    Args:
+        feature_path: Path to the pickle file or the feature store
+        future: Future with the path to the converted store, None for feature stores
+
+    Returns:
+        Iterator with the features of the file
+    """
+    if future is None:
+        yield load_feature_store(feature_path)
+        return
+    store_path = future.result()
+    yield load_feature_store(store_path)
+    shutil.rmtree(store_path, ignore_errors=True)
+
+
+def iter_features(
+    feature_paths: List[str], workers: int = 1, max_in_flight: Optional[int] = None
+) -> Iterator[Mapping[str, Mapping]]:
+    """
+    Iterate over features from multiple files one file at a time.
+
+    With more than one worker, pickle files are converted to temporary
+    feature stores in parallel and the features are read from the stores.
+    Only features that can be saved in a feature store, i.e. arrays with
+    the same shape for every instance, can be converted, so the workers are
+    only used for aggregating features in a feature store. At most
+    max_in_flight files are converted ahead of the file being consumed and
+    temporary stores are removed once they are consumed.
+
+    Args:
+        feature_paths: Path to pickle files or feature stores
+        workers: Number of processes used for converting feature files
+        max_in_flight: Maximum number of files converted ahead, twice the
+                       number of workers by default
+
+    Returns:
+        Iterator over features in the order of the paths
+    """
+    if workers <= 1:
+        for feature_path in feature_paths:
+            yield load_features(feature_path)
+        return
+    max_in_flight = max(2 * workers if max_in_flight is None else max_in_flight, 1)
+    with TemporaryDirectory() as tempdirname, ProcessPoolExecutor(workers) as pool:
+        pending: Deque[Tuple[str, Optional["Future[str]"]]] = deque()
+        for idx, feature_path in enumerate(feature_paths):
+            if len(pending) >= max_in_flight:
+                yield from _load_converted(*pending.popleft())
+            if is_feature_store(feature_path):
+                pending.append((feature_path, None))
+            else:
+                store_path = os.path.join(tempdirname, f"{idx}.store")
+                future = pool.submit(_convert_features, feature_path, store_path)
+                pending.append((feature_path, future))
+        while pending:
+            yield from _load_converted(*pending.popleft())
+
+
+def aggregate_features(
+    feature_paths: List[str],
+    output_path: str,
+    output_format: str = "pickle",
+    workers: int = 1,
+) -> None:
+    """
+    Aggregate features from multiple files.
+
+    Features are read one file at a time. With the mmap format, the features
+    are written to a feature store as they are read, so the aggregated
+    features do not have to fit in memory, and feature files are converted
+    by multiple workers. The pickle format keeps the objects saved in the
+    feature files, so the files are read by a single process.
+
+    Args:
+        feature_paths: Path to pickle files or feature stores
+        output_path: Path of the output file or feature store
+        output_format: Format of the output, one of pickle and mmap
+        workers: Number of processes used for converting feature files with the mmap format
 
     Returns:
         None
     """
-    args = cmd_opts()
-    feature_paths, output_path = args.feature_paths, args.output_path
-    features = list(
-        map(lambda feature_path: pkl.load(open(feature_path, "rb")), feature_paths)
+    if output_format not in FEATURE_FORMATS:
+        raise ValueError(f"Unsupported output format {output_format}")
+    if output_format != "mmap":
+        workers = 1
+    features_iter = tqdm(
+        iter_features(feature_paths, workers),
+        total=len(feature_paths),
+        desc="Aggregating features",
+        unit="file",
     )
+    if output_format == "mmap":
+        with FeatureStoreWriter(output_path) as writer:
+            for feature in features_iter:
+                writer.update(feature)
+        return
     aggregated_features: Dict = {}
-    for feature in tqdm(features):
-        feature_keys = feature.keys()
-        for feature_key in feature_keys:
+    for feature in features_iter:
+        for feature_key in feature.keys():
             if feature_key in aggregated_features.keys():
                 aggregated_features[feature_key].update(feature[feature_key])
             else:
-                aggregated_features[feature_key] = feature[feature_key]
-    pkl.dump(aggregated_features, open(output_path, "wb"))
+                aggregated_features[feature_key] = dict(feature[feature_key])
+    with open(output_path, "wb") as f:
+        pkl.dump(aggregated_features, f)
+
+
+def main() -> None:
+    """
+    Entrypoint for the helper script.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    args = cmd_opts()
+    aggregate_features(
+        args.feature_paths, args.output_path, args.output_format, args.workers
+    )
 
 
 if __name__ == "__main__":
@@ -1,16 +1,29 @@
 """Checkpoint to save and restore attributes."""
 
 import logging
-import torch
 import os
 import pickle as pkl
-from torch import Tensor
+import sys
 
 from typing import Dict, Any
 
 log = logging.getLogger(__name__)
 
 
+def _is_tensor(value: Any) -> bool:
+    """
+    Check if a value is a torch tensor without importing torch.
+
+    Args:
+        value: Value of an attribute
+
+    Returns:
+        True if the value is a tensor, a value can only be a tensor if torch was imported
+    """
+    torch = sys.modules.get("torch")
+    return torch is not None and isinstance(value, torch.Tensor)
+
+
 class Checkpointer(object):
     """Checkpoint object to save and restore attributes."""
 
@@ -59,7 +72,9 @@ class Checkpointer(object):
                 attribute_dict[test_id] = tuple(old_attr_val)
             else:
                 attribute_dict[test_id] = attribute_val
-        elif isinstance(attribute_val, Tensor):
+        elif _is_tensor(attribute_val):
+            import torch
+
             if test_id in attribute_dict:
                 attribute_dict[test_id] = torch.cat(
                     [attribute_dict[test_id], attribute_val]
@@ -122,9 +137,12 @@ class Checkpointer(object):
         Returns
             Detector with updated value for attributes
         """
-        dataset_ids = list(
-            map(lambda x: x.strip(), open(self.toolset["dataset"], "r").readlines())
-        )
+        if self.toolset.get("dataset_ids") is not None:
+            dataset_ids = self.toolset["dataset_ids"]
+        else:
+            dataset_ids = list(
+                map(lambda x: x.strip(), open(self.toolset["dataset"], "r").readlines())
+            )
         round_id = self.toolset["round_id"]
         round_len = len(dataset_ids)
         if isinstance(attribute_val, dict):
@@ -134,7 +152,7 @@ class Checkpointer(object):
         elif (
             isinstance(attribute_val, list)
             or isinstance(attribute_val, tuple)
-            or isinstance(attribute_val, Tensor)
+            or _is_tensor(attribute_val)
         ):
             round_attribute_val = attribute_val[
                 round_id * round_len : (round_id + 1) * round_len
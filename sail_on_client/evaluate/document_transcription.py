@@ -7,9 +7,10 @@ from sail_on_client.evaluate.metrics import m_accuracy_on_novel
 from sail_on_client.evaluate.utils import topk_accuracy
 
 import numpy as np
-from pandas import DataFrame
+from typing import TYPE_CHECKING, Dict
 
-from typing import Dict
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class DocumentTranscriptionMetrics(ProgramMetrics):
@@ -65,9 +66,9 @@ class DocumentTranscriptionMetrics(ProgramMetrics):
 
     def m_acc(
         self,
-        gt_novel: DataFrame,
-        p_class: DataFrame,
-        gt_class: DataFrame,
+        gt_novel: "DataFrame",
+        p_class: "DataFrame",
+        gt_class: "DataFrame",
         round_size: int,
         asymptotic_start_round: int,
     ) -> Dict:
@@ -91,7 +92,7 @@ class DocumentTranscriptionMetrics(ProgramMetrics):
         )
 
     def m_acc_round_wise(
-        self, p_class: DataFrame, gt_class: DataFrame, round_id: int
+        self, p_class: "DataFrame", gt_class: "DataFrame", round_id: int
     ) -> Dict:
         """
         m_acc_round_wise function.
@@ -113,7 +114,7 @@ class DocumentTranscriptionMetrics(ProgramMetrics):
             f"top3_accuracy_round_{round_id}": top3_acc,
         }
 
-    def m_num(self, p_novel: DataFrame, gt_novel: DataFrame) -> Dict:
+    def m_num(self, p_novel: "DataFrame", gt_novel: "DataFrame") -> Dict:
         """
         m_num function.
 
@@ -197,10 +198,10 @@ class DocumentTranscriptionMetrics(ProgramMetrics):
 
     def m_ndp_failed_reaction(
         self,
-        p_novel: DataFrame,
-        gt_novel: DataFrame,
-        p_class: DataFrame,
-        gt_class: DataFrame,
+        p_novel: "DataFrame",
+        gt_novel: "DataFrame",
+        p_class: "DataFrame",
+        gt_class: "DataFrame",
     ) -> Dict:
         """
         m_ndp_failed_reaction function.
@@ -223,7 +224,7 @@ class DocumentTranscriptionMetrics(ProgramMetrics):
         return m_ndp_failed_reaction(p_novel, gt_novel, class_prob, gt_class_idx)
 
     def m_accuracy_on_novel(
-        self, p_class: DataFrame, gt_class: DataFrame, gt_novel: DataFrame
+        self, p_class: "DataFrame", gt_class: "DataFrame", gt_novel: "DataFrame"
     ) -> Dict:
         """
         Additional Metric: Novelty robustness.
@@ -0,0 +1,329 @@
+"""Evaluation engine that computes program metrics from shared intermediates."""
+
+import warnings
+import numpy as np
+from typing import TYPE_CHECKING, Dict, Optional
+
+from sail_on_client.evaluate.metrics import (
+    DETECT_THRESH_,
+    get_ndp_scores,
+    multi_threshold_confusion,
+)
+from sail_on_client.evaluate.utils import (
+    PrefixAccuracy,
+    check_class_validity,
+    check_novel_validity,
+    topk_correct,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NDP_MODES = ["full_test", "pre_novelty", "post_novelty"]
+
+
+def _first_index_at_least(scores: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Find the first index where scores are greater than or equal to thresholds.
+
+    Args:
+        scores: Vector of scores
+        thresholds: Thresholds compared with the scores
+
+    Returns:
+        Index for every threshold, length of scores if no score reaches the threshold
+    """
+    running_max = np.maximum.accumulate(np.where(np.isnan(scores), -np.inf, scores))
+    return np.searchsorted(running_max, thresholds, "left")
+
+
+class ProgramMetricEngine:
+    """Compute program metrics for a test while sharing ranks and counts."""
+
+    def __init__(
+        self,
+        gt_novel: np.ndarray,
+        p_class: np.ndarray,
+        gt_class: np.ndarray,
+        p_detection: Optional[np.ndarray] = None,
+        p_novel: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Validate inputs and compute intermediates shared across metrics.
+
+        Args:
+            gt_novel: NX1 vector with each element 0 (not novel) or 1 (novel)
+            p_class: Nx(K+1) matrix with class probabilities for each sample
+            gt_class: Nx1 vector with ground-truth class for each sample
+            p_detection: NX1 vector with probability of change in the world
+            p_novel: NX1 vector with probability of a sample being novel
+
+        Returns:
+            None
+        """
+        self.gt_novel = np.asarray(gt_novel)
+        self.gt_class = np.asarray(gt_class)
+        p_class = np.asarray(p_class)
+        check_class_validity(p_class, self.gt_class)
+        self.p_detection = p_detection
+        if p_detection is not None:
+            self.p_detection = np.asarray(p_detection)
+            check_novel_validity(self.p_detection, self.gt_novel)
+        self.p_novel = p_novel
+        if p_novel is not None:
+            self.p_novel = np.asarray(p_novel)
+            check_novel_validity(self.p_novel, self.gt_novel)
+        self.num_samples = self.gt_novel.shape[0]
+        novel_idx = np.flatnonzero(self.gt_novel != 0)
+        self.first_novel_idx = int(novel_idx[0]) if novel_idx.shape[0] else None
+        self.correct = {
+            1: topk_correct(p_class, self.gt_class, k=1),
+            3: topk_correct(p_class, self.gt_class, k=3),
+        }
+        self._ndp_counts: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def m_num(self) -> Dict:
+        """Compute number of GT novel samples needed to predict the first true positive."""
+        if np.sum(self.gt_novel) < 1:
+            return {f"{thresh}": -1 for thresh in DETECT_THRESH_}
+        novel_scores = self.p_detection[self.gt_novel == 1]
+        first_idx = _first_index_at_least(novel_scores, np.asarray(DETECT_THRESH_))
+        # argmax over a vector without any detection returns the first index
+        first_idx[first_idx == novel_scores.shape[0]] = 0
+        return {
+            f"{thresh}": np.int64(idx) + 1
+            for thresh, idx in zip(DETECT_THRESH_, first_idx)
+        }
+
+    def m_num_stats(self) -> Dict:
+        """Compute indices for novelty introduction and change in world prediction."""
+        res = {}
+        if np.sum(self.gt_novel) < 1:
+            res["GT_indx"] = len(self.gt_novel) + 1
+        else:
+            res["GT_indx"] = np.where(self.gt_novel == 1)[0][0] + 1
+        first_idx = _first_index_at_least(self.p_detection, np.asarray(DETECT_THRESH_))
+        for thresh, idx in zip(DETECT_THRESH_, first_idx):
+            if idx == len(self.p_detection):
+                res[f"P_indx_{thresh}"] = len(self.p_detection) + 1
+            else:
+                res[f"P_indx_{thresh}"] = np.int64(idx) + 1
+        return res
+
+    def m_ndp(self, mode: str = "full_test") -> Dict:
+        """
+        Compute novelty detection performance.
+
+        Args:
+            mode: One of full_test, pre_novelty or post_novelty
+
+        Returns:
+            Dictionary of various metrics: Accuracy, Precision, Recall, F1_score and Confusion matrix
+        """
+        if mode not in NDP_MODES:
+            raise Exception(
+                "Mode should be one of ['full_test','pre_novelty', 'post_novelty']"
+            )
+        if mode == "post_novelty" and self.first_novel_idx is None:
+            return {
+                f"{metric}_{thresh}": -1
+                for thresh in DETECT_THRESH_
+                for metric in [
+                    "accuracy",
+                    "precision",
+                    "recall",
+                    "f1_score",
+                    "TP",
+                    "FP",
+                    "TN",
+                    "FN",
+                ]
+            }
+        if mode not in self._ndp_counts:
+            segment = slice(None)
+            if mode == "post_novelty":
+                segment = slice(self.first_novel_idx, None)
+            elif mode == "pre_novelty" and self.first_novel_idx is not None:
+                if not np.all(self.gt_novel != 0):
+                    segment = slice(None, self.first_novel_idx)
+            self._ndp_counts[mode] = multi_threshold_confusion(
+                self.p_novel[segment], self.gt_novel[segment], DETECT_THRESH_
+            )
+        return self._ndp_from_counts(self._ndp_counts[mode])
+
+    def m_acc(self, round_size: int, asymptotic_start_round: int) -> Dict:
+        """
+        Compute top1 and top3 accuracy over the test, pre and post novelty.
+
+        Args:
+            round_size: Number of samples in a single round of the test
+            asymptotic_start_round: Round id where metric computation starts
+
+        Returns:
+            Dictionary with results
+        """
+        prefix = {k: PrefixAccuracy(v, round_size) for k, v in self.correct.items()}
+        results: Dict = {}
+        results["full_top1"] = prefix[1].accuracy(0, self.num_samples)
+        results["full_top3"] = prefix[3].accuracy(0, self.num_samples)
+        if self.first_novel_idx is None:
+            results["pre_top1"] = results["full_top1"]
+            results["pre_top3"] = results["full_top3"]
+            results["post_top1"] = -1
+            results["post_top3"] = -1
+            results["post_mean_top1"] = -1
+            results["post_mean_top3"] = -1
+            results["post_std_top1"] = -1
+            results["post_std_top3"] = -1
+            segments = {}
+        else:
+            # The first novel sample is considered a part of pre novelty
+            segments = {
+                "pre": (0, self.first_novel_idx + 1),
+                "post": (self.first_novel_idx + 1, self.num_samples),
+            }
+        for last_i in np.arange(
+            int(asymptotic_start_round) * round_size, self.num_samples, round_size
+        ):
+            segments[f"asymptotic_{last_i}"] = (
+                self.num_samples - last_i if last_i > 0 else 0,
+                self.num_samples,
+            )
+        for name, (start, end) in segments.items():
+            for k in [1, 3]:
+                results[f"{name}_top{k}"] = prefix[k].accuracy(start, end)
+            for k in [1, 3]:
+                [
+                    results[f"{name}_mean_top{k}"],
+                    results[f"{name}_std_top{k}"],
+                ] = prefix[k].rolling_stats(start, end)
+        return results
+
+    def m_ndp_failed_reaction(self) -> Dict:
+        """Compute novelty detection performance for samples with incorrect predictions."""
+        results = {}
+        for k in [1, 3]:
+            incorrect_mask = self.correct[k] == 0
+            if np.sum(incorrect_mask) == 0:
+                warnings.warn(
+                    "WARNING! No incorrect predictions found. Returning empty dictionary"
+                )
+                for metric in {
+                    "accuracy",
+                    "precision",
+                    "recall",
+                    "f1_score",
+                    "FN",
+                    "TP",
+                    "FP",
+                    "TN",
+                }:
+                    results[f"top{k}_{metric}"] = -1
+                continue
+            counts = multi_threshold_confusion(
+                self.p_detection[incorrect_mask],
+                self.gt_novel[incorrect_mask],
+                DETECT_THRESH_,
+            )
+            res = self._ndp_from_counts(counts)
+            for metric in res:
+                results[f"top{k}_{metric}"] = res[metric]
+        return results
+
+    @staticmethod
+    def _ndp_from_counts(counts: Dict[str, np.ndarray]) -> Dict:
+        res = {}
+        for idx, thresh in enumerate(DETECT_THRESH_):
+            res.update(
+                get_ndp_scores(
+                    thresh,
+                    counts["TP"][idx],
+                    counts["FP"][idx],
+                    counts["TN"][idx],
+                    counts["FN"][idx],
+                )
+            )
+        return res
+
+
+def evaluate_program_metrics(
+    metric: "ProgramMetrics",  # type: ignore # noqa: F821
+    detections: "pd.DataFrame",
+    classifications: "pd.DataFrame",
+    gt: "pd.DataFrame",
+    detection_idx: int,
+    novel_idx: int,
+    gt_detection_idx: int,
+    gt_classification_idx: int,
+    round_size: int = 100,
+    asymptotic_start_round: int = 5,
+) -> Dict:
+    """
+    Compute program metrics used by the local harness for a test.
+
+    Args:
+        metric: Metric instance for the domain
+        detections: Detection results for the test
+        classifications: Classification results for the test
+        gt: Ground truth for the test
+        detection_idx: Column in detections with probability of change in world
+        novel_idx: Column in classifications with probability of novelty
+        gt_detection_idx: Column in gt with novelty labels
+        gt_classification_idx: Column in gt with class labels
+        round_size: Size of the round used for rolling statistics
+        asymptotic_start_round: Round id where asymptotic metrics start
+
+    Returns:
+        Dictionary with the same results as computing every metric separately
+    """
+    engine = ProgramMetricEngine(
+        gt[gt_detection_idx].to_numpy(),
+        classifications.iloc[:, 1:].to_numpy(),
+        gt[gt_classification_idx].to_numpy(),
+        detections[detection_idx].to_numpy(),
+        classifications[novel_idx].to_numpy(),
+    )
+    results: Dict = {}
+    results["m_num"] = engine.m_num()
+    results["m_num_stats"] = engine.m_num_stats()
+    results["m_ndp"] = engine.m_ndp("full_test")
+    results["m_ndp_pre"] = engine.m_ndp("pre_novelty")
+    results["m_ndp_post"] = engine.m_ndp("post_novelty")
+    results["m_acc"] = engine.m_acc(round_size, asymptotic_start_round)
+    results["m_acc_failed"] = engine.m_ndp_failed_reaction()
+    results["m_is_cdt_and_is_early"] = metric.m_is_cdt_and_is_early(
+        results["m_num_stats"]["GT_indx"],
+        results["m_num_stats"]["P_indx_0.5"],
+        gt.shape[0],
+    )
+    return results
+
+
+def evaluate_accuracy(
+    classifications: "pd.DataFrame",
+    gt: "pd.DataFrame",
+    gt_detection_idx: int,
+    gt_classification_idx: int,
+    round_size: int = 100,
+    asymptotic_start_round: int = 5,
+) -> Dict:
+    """
+    Compute top1 and top3 accuracy for a test.
+
+    Args:
+        classifications: Classification results for the test
+        gt: Ground truth for the test
+        gt_detection_idx: Column in gt with novelty labels
+        gt_classification_idx: Column in gt with class labels
+        round_size: Size of the round used for rolling statistics
+        asymptotic_start_round: Round id where asymptotic metrics start
+
+    Returns:
+        Dictionary with the same results as m_acc
+    """
+    engine = ProgramMetricEngine(
+        gt[gt_detection_idx].to_numpy(),
+        classifications.iloc[:, 1:].to_numpy(),
+        gt[gt_classification_idx].to_numpy(),
+    )
+    return engine.m_acc(round_size, asymptotic_start_round)
@@ -7,10 +7,10 @@ from sail_on_client.evaluate.metrics import m_accuracy_on_novel
 from sail_on_client.evaluate.utils import topk_accuracy
 
 import numpy as np
-from pandas import DataFrame
-import pandas as pd
+from typing import TYPE_CHECKING, Dict
 
-from typing import Dict
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class ImageClassificationMetrics(ProgramMetrics):
@@ -39,9 +39,9 @@ class ImageClassificationMetrics(ProgramMetrics):
 
     def m_acc(
         self,
-        gt_novel: DataFrame,
-        p_class: DataFrame,
-        gt_class: DataFrame,
+        gt_novel: "DataFrame",
+        p_class: "DataFrame",
+        gt_class: "DataFrame",
         round_size: int,
         asymptotic_start_round: int,
     ) -> Dict:
@@ -65,7 +65,7 @@ class ImageClassificationMetrics(ProgramMetrics):
         )
 
     def m_acc_round_wise(
-        self, p_class: DataFrame, gt_class: DataFrame, round_id: int
+        self, p_class: "DataFrame", gt_class: "DataFrame", round_id: int
     ) -> Dict:
         """
         m_acc_round_wise function.
@@ -87,7 +87,7 @@ class ImageClassificationMetrics(ProgramMetrics):
             f"top3_accuracy_round_{round_id}": top3_acc,
         }
 
-    def m_num(self, p_novel: DataFrame, gt_novel: DataFrame) -> Dict:
+    def m_num(self, p_novel: "DataFrame", gt_novel: "DataFrame") -> Dict:
         """
         m_num function.
 
@@ -180,10 +180,10 @@ class ImageClassificationMetrics(ProgramMetrics):
 
     def m_ndp_failed_reaction(
         self,
-        p_novel: DataFrame,
-        gt_novel: DataFrame,
-        p_class: DataFrame,
-        gt_class: DataFrame,
+        p_novel: "DataFrame",
+        gt_novel: "DataFrame",
+        p_class: "DataFrame",
+        gt_class: "DataFrame",
         mode: str = "full_test",
     ) -> Dict:
         """
@@ -213,7 +213,7 @@ class ImageClassificationMetrics(ProgramMetrics):
         return m_ndp_failed_reaction(p_novel, gt_novel, class_prob, gt_class_idx)
 
     def m_accuracy_on_novel(
-        self, p_class: DataFrame, gt_class: DataFrame, gt_novel: DataFrame
+        self, p_class: "DataFrame", gt_class: "DataFrame", gt_novel: "DataFrame"
     ) -> Dict:
         """
         Additional Metric: Novelty robustness.
@@ -281,6 +281,8 @@ def convert_df(old_filepath: str, new_filepath: str) -> None:
     Return:
         None
     """
+    import pandas as pd
+
     df = pd.read_csv(old_filepath)
     df["id"] = df.current_path
     df["detection"] = df.cls_novelty.cummax()
@@ -3,15 +3,14 @@
 import warnings
 import numpy as np
 from sail_on_client.evaluate.utils import (
+    PrefixAccuracy,
     check_novel_validity,
     check_class_validity,
     get_first_detect_novelty,
-    top1_accuracy,
-    top3_accuracy,
-    get_rolling_stats,
     topk_accuracy,
+    topk_correct,
 )
-from typing import Dict
+from typing import Dict, Sequence
 
 
 DETECT_THRESH_ = [0.175, 0.225, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
@@ -72,6 +71,85 @@ def m_num_stats(p_novel: np.ndarray, gt_novel: np.ndarray) -> Dict:
     return res
 
 
+def multi_threshold_confusion(
+    p_novel: np.ndarray, gt_novel: np.ndarray, thresholds: Sequence[float]
+) -> Dict[str, np.ndarray]:
+    """
+    Compute confusion matrices for multiple thresholds in a single pass.
+
+    A sample is predicted as novel if its score is greater than the threshold
+    and samples with NaN scores are never predicted as novel. Scores are sorted
+    once and the number of predictions above every threshold is found with a
+    binary search, so the cost is O((N + T) log N) for N samples and T thresholds.
+
+    Args:
+        p_novel: NX1 vector with each element corresponding to probability of novelty
+        gt_novel: NX1 vector with each element 0 (not novel) or 1 (novel)
+        thresholds: Thresholds used for predicting novelty
+
+    Returns:
+        Dictionary with TP, FP, TN and FN vectors with an element for every threshold
+    """
+    p_novel = np.asarray(p_novel, dtype=np.float64)
+    gt_novel = np.asarray(gt_novel)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    valid = ~np.isnan(p_novel)
+    novel_scores = np.sort(p_novel[(gt_novel == 1) & valid])
+    known_scores = np.sort(p_novel[(gt_novel == 0) & valid])
+    num_novel = np.int64(np.sum(gt_novel == 1))
+    num_known = np.int64(np.sum(gt_novel == 0))
+    tp = novel_scores.shape[0] - np.searchsorted(novel_scores, thresholds, "right")
+    fp = known_scores.shape[0] - np.searchsorted(known_scores, thresholds, "right")
+    return {
+        "TP": tp.astype(np.int64),
+        "FP": fp.astype(np.int64),
+        "TN": (num_known - fp).astype(np.int64),
+        "FN": (num_novel - tp).astype(np.int64),
+    }
+
+
+def get_ndp_scores(
+    thresh: float, tp: np.int64, fp: np.int64, tn: np.int64, fn: np.int64
+) -> Dict:
+    """
+    Compute novelty detection scores from a confusion matrix.
+
+    Args:
+        thresh: Threshold used for the confusion matrix
+        tp: Number of true positives
+        fp: Number of false positives
+        tn: Number of true negatives
+        fn: Number of false negatives
+
+    Returns:
+        Dictionary of various metrics: Accuracy, Precision, Recall, F1_score and Confusion matrix
+    """
+    acc = (tp + tn) / (tp + tn + fp + fn)
+    if tp + fp == 0.0:
+        precision = 0.0
+    else:
+        precision = tp / (tp + fp)
+    if tp + fn == 0.0:
+        recall = 0.0
+    else:
+        recall = tp / (tp + fn)
+    if precision == 0.0 and recall == 0.0:
+        f1_score = 0.0
+    else:
+        f1_score = 2 * precision * recall / (precision + recall)
+
+    return {
+        f"accuracy_{thresh}": round(acc, 5),
+        f"precision_{thresh}": round(precision, 5),
+        f"recall_{thresh}": round(recall, 5),
+        f"f1_score_{thresh}": round(f1_score, 5),
+        f"TP_{thresh}": tp,
+        f"FP_{thresh}": fp,
+        f"TN_{thresh}": tn,
+        f"FN_{thresh}": fn,
+    }
+
+
 def m_ndp(p_novel: np.ndarray, gt_novel: np.ndarray, mode: str = "full_test") -> Dict:
     """
     Program Metric: Novelty detection performance.
@@ -92,64 +170,47 @@ def m_ndp(p_novel: np.ndarray, gt_novel: np.ndarray, mode: str = "full_test") ->
             "Mode should be one of ['full_test','pre_novelty', 'post_novelty']"
         )
 
-    def get_all_scores_ndp(thresh: float) -> Dict:
-        preds: np.ndarray = p_novel > thresh
-        gt_novel_ = gt_novel
-        if mode == "post_novelty":
-            if any(gt_novel != 0):
-                post_novel_idx = (gt_novel != 0).argmax(axis=0)
-                preds = preds[post_novel_idx:]
-                gt_novel_ = gt_novel[post_novel_idx:]
-            else:
-                return {
-                    f"accuracy_{thresh}": -1,
-                    f"precision_{thresh}": -1,
-                    f"recall_{thresh}": -1,
-                    f"f1_score_{thresh}": -1,
-                    f"TP_{thresh}": -1,
-                    f"FP_{thresh}": -1,
-                    f"TN_{thresh}": -1,
-                    f"FN_{thresh}": -1,
-                }
-        elif mode == "pre_novelty":
-            if any(gt_novel != 0) and not all(gt_novel != 0):
-                post_novel_idx = (gt_novel != 0).argmax(axis=0)
-                preds = preds[:post_novel_idx]
-                gt_novel_ = gt_novel[:post_novel_idx]
-
-        tp = np.sum(np.logical_and(preds == 1, gt_novel_ == 1))
-        fp = np.sum(np.logical_and(preds == 1, gt_novel_ == 0))
-        tn = np.sum(np.logical_and(preds == 0, gt_novel_ == 0))
-        fn = np.sum(np.logical_and(preds == 0, gt_novel_ == 1))
-
-        acc = (tp + tn) / (tp + tn + fp + fn)
-        if tp + fp == 0.0:
-            precision = 0.0
-        else:
-            precision = tp / (tp + fp)
-        if tp + fn == 0.0:
-            recall = 0.0
-        else:
-            recall = tp / (tp + fn)
-        if precision == 0.0 and recall == 0.0:
-            f1_score = 0.0
-        else:
-            f1_score = 2 * precision * recall / (precision + recall)
-
-        return {
-            f"accuracy_{thresh}": round(acc, 5),
-            f"precision_{thresh}": round(precision, 5),
-            f"recall_{thresh}": round(recall, 5),
-            f"f1_score_{thresh}": round(f1_score, 5),
-            f"TP_{thresh}": tp,
-            f"FP_{thresh}": fp,
-            f"TN_{thresh}": tn,
-            f"FN_{thresh}": fn,
-        }
-
+    p_novel = np.asarray(p_novel)
+    gt_novel = np.asarray(gt_novel)
+    has_novelty = bool(np.any(gt_novel != 0))
+    if mode == "post_novelty":
+        if not has_novelty:
+            res = {}
+            for thresh in DETECT_THRESH_:
+                res.update(
+                    {
+                        f"accuracy_{thresh}": -1,
+                        f"precision_{thresh}": -1,
+                        f"recall_{thresh}": -1,
+                        f"f1_score_{thresh}": -1,
+                        f"TP_{thresh}": -1,
+                        f"FP_{thresh}": -1,
+                        f"TN_{thresh}": -1,
+                        f"FN_{thresh}": -1,
+                    }
+                )
+            return res
+        post_novel_idx = (gt_novel != 0).argmax(axis=0)
+        p_novel = p_novel[post_novel_idx:]
+        gt_novel = gt_novel[post_novel_idx:]
+    elif mode == "pre_novelty":
+        if has_novelty and not np.all(gt_novel != 0):
+            post_novel_idx = (gt_novel != 0).argmax(axis=0)
+            p_novel = p_novel[:post_novel_idx]
+            gt_novel = gt_novel[:post_novel_idx]
+
+    confusion = multi_threshold_confusion(p_novel, gt_novel, DETECT_THRESH_)
     res = {}
-    for thresh in DETECT_THRESH_:
-        res.update(get_all_scores_ndp(thresh))
+    for idx, thresh in enumerate(DETECT_THRESH_):
+        res.update(
+            get_ndp_scores(
+                thresh,
+                confusion["TP"][idx],
+                confusion["FP"][idx],
+                confusion["TN"][idx],
+                confusion["FN"][idx],
+            )
+        )
     return res
 
 
@@ -177,8 +238,13 @@ def m_acc(
     batch_size = round_size
     results = {}
     try:
-        results["full_top1"] = top1_accuracy(p_class, gt_class, txt="full_top1")
-        results["full_top3"] = top3_accuracy(p_class, gt_class, txt="full_top3")
+        check_class_validity(p_class, gt_class)
+        # Correctness is computed once and prefix sums give every segment of the test
+        top1 = PrefixAccuracy(topk_correct(p_class, gt_class, k=1), batch_size)
+        top3 = PrefixAccuracy(topk_correct(p_class, gt_class, k=3), batch_size)
+        num_samples = gt_novel.shape[0]
+        results["full_top1"] = top1.accuracy(0, num_samples)
+        results["full_top3"] = top3.accuracy(0, num_samples)
 
         # red button push:
         if np.sum(gt_novel) < 1:
@@ -188,8 +254,8 @@ def m_acc(
             first_novel_indx = np.where(gt_novel == 1)[0][0] + 1
 
         if first_novel_indx == len(gt_novel) + 1:
-            results["pre_top1"] = top1_accuracy(p_class, gt_class, txt="pre_top1")
-            results["pre_top3"] = top3_accuracy(p_class, gt_class, txt="pre_top3")
+            results["pre_top1"] = top1.accuracy(0, num_samples)
+            results["pre_top3"] = top3.accuracy(0, num_samples)
             results["post_top1"] = -1
             results["post_top3"] = -1
             results["post_mean_top1"] = -1
@@ -206,35 +272,25 @@ def m_acc(
                 results["pre_std_top1"] = -1
                 results["pre_std_top3"] = -1
             else:
-                p_class_pre = p_class[:first_novel_indx]
-                gt_class_pre = gt_class[:first_novel_indx]
-                results["pre_top1"] = top1_accuracy(
-                    p_class_pre, gt_class_pre, txt="pre_top1"
-                )
-                results["pre_top3"] = top3_accuracy(
-                    p_class_pre, gt_class_pre, txt="pre_top3"
-                )
-                [results["pre_mean_top1"], results["pre_std_top1"]] = get_rolling_stats(
-                    p_class_pre, gt_class_pre, k=1, window_size=batch_size
-                )
-                [results["pre_mean_top3"], results["pre_std_top3"]] = get_rolling_stats(
-                    p_class_pre, gt_class_pre, k=3, window_size=batch_size
-                )
+                results["pre_top1"] = top1.accuracy(0, first_novel_indx)
+                results["pre_top3"] = top3.accuracy(0, first_novel_indx)
+                [
+                    results["pre_mean_top1"],
+                    results["pre_std_top1"],
+                ] = top1.rolling_stats(0, first_novel_indx)
+                [
+                    results["pre_mean_top3"],
+                    results["pre_std_top3"],
+                ] = top3.rolling_stats(0, first_novel_indx)
 
             # post_novelty
-            p_class_post = p_class[first_novel_indx:]
-            gt_class_post = gt_class[first_novel_indx:]
-            results["post_top1"] = top1_accuracy(
-                p_class_post, gt_class_post, txt="post_top1"
+            results["post_top1"] = top1.accuracy(first_novel_indx, num_samples)
+            results["post_top3"] = top3.accuracy(first_novel_indx, num_samples)
+            [results["post_mean_top1"], results["post_std_top1"]] = top1.rolling_stats(
+                first_novel_indx, num_samples
             )
-            results["post_top3"] = top3_accuracy(
-                p_class_post, gt_class_post, txt="post_top3"
-            )
-            [results["post_mean_top1"], results["post_std_top1"]] = get_rolling_stats(
-                p_class_post, gt_class_post, k=1, window_size=batch_size
-            )
-            [results["post_mean_top3"], results["post_std_top3"]] = get_rolling_stats(
-                p_class_post, gt_class_post, k=3, window_size=batch_size
+            [results["post_mean_top3"], results["post_std_top3"]] = top3.rolling_stats(
+                first_novel_indx, num_samples
             )
 
         # asymptotic performance
@@ -242,26 +298,17 @@ def m_acc(
             int(asymptotic_start_round) * batch_size, gt_novel.shape[0], round_size
         ):
             if len(gt_novel) > last_i:
-                p_class_asym = p_class[-last_i:]
-                gt_class_asym = gt_class[-last_i:]
-                results[f"asymptotic_{last_i}_top1"] = top1_accuracy(
-                    p_class_asym, gt_class_asym, txt=f"asymptotic_{last_i}_top1"
-                )
-                results[f"asymptotic_{last_i}_top3"] = top3_accuracy(
-                    p_class_asym, gt_class_asym, txt=f"asymptotic_{last_i}_top3"
-                )
+                start = num_samples - last_i if last_i > 0 else 0
+                results[f"asymptotic_{last_i}_top1"] = top1.accuracy(start, num_samples)
+                results[f"asymptotic_{last_i}_top3"] = top3.accuracy(start, num_samples)
                 [
                     results[f"asymptotic_{last_i}_mean_top1"],
                     results[f"asymptotic_{last_i}_std_top1"],
-                ] = get_rolling_stats(
-                    p_class_asym, gt_class_asym, k=1, window_size=batch_size
-                )
+                ] = top1.rolling_stats(start, num_samples)
                 [
                     results[f"asymptotic_{last_i}_mean_top3"],
                     results[f"asymptotic_{last_i}_std_top3"],
-                ] = get_rolling_stats(
-                    p_class_asym, gt_class_asym, k=3, window_size=batch_size
-                )
+                ] = top3.rolling_stats(start, num_samples)
             else:
                 results[f"asymptotic_{last_i}_top1"] = -1
                 results[f"asymptotic_{last_i}_top3"] = -1
@@ -335,10 +382,7 @@ def m_ndp_failed_reaction(
     check_class_validity(p_class, gt_class)
     results = {}
     for k in [1, 3]:
-        p_class_k = np.argsort(-p_class, axis=1)[:, :k]
-        gt_class_k = gt_class[:, np.newaxis]
-        check_zero = p_class_k - gt_class_k
-        incorrect_mask = ~np.any(check_zero == 0, axis=1)
+        incorrect_mask = topk_correct(p_class, gt_class, k) == 0
         if np.sum(incorrect_mask) == 0:
             warnings.warn(
                 "WARNING! No incorrect predictions found. Returning empty dictionary"
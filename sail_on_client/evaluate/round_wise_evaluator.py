@@ -0,0 +1,131 @@
+"""Incremental evaluation of rounds in a test."""
+
+import io
+import logging
+import os
+from typing import Dict
+
+from sail_on_client.evaluate import metric_type
+
+log = logging.getLogger(__name__)
+
+
+class RoundWiseEvaluator:
+    """
+    Evaluate the classification results of a test one round at a time.
+
+    The ground truth for the test is parsed once and only the classification
+    rows posted since the previous evaluation are read from the results, so
+    evaluating every round of a test is linear in the size of the test.
+    Running top1 and top3 counters are kept for the rounds evaluated so far.
+    """
+
+    def __init__(
+        self,
+        gt_path: str,
+        classification_path: str,
+        metric: metric_type,
+        round_size: int,
+    ) -> None:
+        """
+        Construct evaluator for the rounds of a test.
+
+        Args:
+            gt_path: Path to the ground truth for the test
+            classification_path: Path to the classification results posted for the test
+            metric: Metric object for the protocol and the domain of the test
+            round_size: Number of instances in a round
+
+        Returns:
+            None
+        """
+        import pandas as pd
+
+        self.classification_path = classification_path
+        self.metric = metric
+        self.round_size = round_size
+        gt = pd.read_csv(gt_path, sep=",", header=None, skiprows=1, quotechar="|")
+        self.gt_class = gt[metric.classification_id]
+        self.num_evaluated = 0
+        self.top1_correct = 0.0
+        self.top3_correct = 0.0
+        self._last_round_id = -1
+        self._reset_classifications()
+
+    def _reset_classifications(self) -> None:
+        """Private function to read classification results from the start."""
+        import pandas as pd
+
+        self._offset = 0
+        self._first_row = 0
+        self._classifications = pd.DataFrame()
+
+    def _read_new_classifications(self) -> None:
+        """Private function to read classification rows posted since the last read."""
+        import pandas as pd
+
+        if os.path.getsize(self.classification_path) <= self._offset:
+            return
+        with open(self.classification_path, "rb") as f:
+            f.seek(self._offset)
+            content = f.read()
+        self._offset += len(content)
+        new_classifications = pd.read_csv(
+            io.BytesIO(content), sep=",", header=None, quotechar="|"
+        )
+        if len(self._classifications) == 0:
+            self._classifications = new_classifications
+        else:
+            self._classifications = pd.concat(
+                [self._classifications, new_classifications], ignore_index=True
+            )
+
+    def evaluate(self, round_id: int) -> Dict:
+        """
+        Evaluate classification results for a round.
+
+        Args:
+            round_id: The sequential number of the round being evaluated
+
+        Returns:
+            Dictionary containing top1, top3 accuracy for the round
+        """
+        start, end = round_id * self.round_size, (round_id + 1) * self.round_size
+        if start < self._first_row:
+            # Rows for earlier rounds are discarded, read the results again
+            self._reset_classifications()
+        self._read_new_classifications()
+        classification_round = self._classifications.iloc[
+            start - self._first_row : end - self._first_row
+        ]
+        gt_round = self.gt_class.iloc[start:end]
+        m_acc = self.metric.m_acc_round_wise(classification_round, gt_round, round_id)
+        # Rows up to the end of the round are not needed by later rounds
+        num_discarded = min(max(end - self._first_row, 0), len(self._classifications))
+        self._classifications = self._classifications.iloc[num_discarded:]
+        self._first_row += num_discarded
+        if round_id > self._last_round_id:
+            num_instances = len(classification_round)
+            self.num_evaluated += num_instances
+            self.top1_correct += (
+                m_acc[f"top1_accuracy_round_{round_id}"] * num_instances
+            )
+            self.top3_correct += (
+                m_acc[f"top3_accuracy_round_{round_id}"] * num_instances
+            )
+            self._last_round_id = round_id
+        return m_acc
+
+    def running_accuracy(self) -> Dict:
+        """
+        Get accuracy over the rounds evaluated so far.
+
+        Returns:
+            Dictionary containing top1, top3 accuracy over the evaluated rounds
+        """
+        if self.num_evaluated == 0:
+            return {"top1_accuracy": 0.0, "top3_accuracy": 0.0}
+        return {
+            "top1_accuracy": self.top1_correct / self.num_evaluated,
+            "top3_accuracy": self.top3_correct / self.num_evaluated,
+        }
@@ -1,7 +1,6 @@
 """Helper functions for metrics."""
 
 import numpy as np
-import pandas as pd
 from typing import List
 
 
@@ -64,6 +63,47 @@ def check_class_validity(p_class: np.ndarray, gt_class: np.ndarray) -> None:
     return
 
 
+def topk_correct(p_class: np.ndarray, gt_class: np.ndarray, k: int) -> np.ndarray:
+    """
+    Find samples where the ground truth class is in the top-K predictions.
+
+    Classes are partially sorted with argpartition, so the cost is linear in
+    the number of classes. Rows where the ground truth ties with the k-th
+    largest probability are resolved with the same argsort used by
+    :func:`topk_accuracy` earlier, so the results are identical.
+
+    Args:
+        p_class: Nx(K+1) matrix with each row corresponding to K+1 class probabilities for each sample
+        gt_class: Nx1 vector with ground-truth class for each sample
+        k: 'k' used in top-K accuracy
+
+    Returns:
+        Nx1 vector with 1 if the sample is correct and 0 otherwise
+    """
+    num_samples, num_classes = p_class.shape
+    gt_class = np.asarray(gt_class).astype(np.intp)
+    if k >= num_classes:
+        return np.ones(num_samples, dtype=int)
+    if num_samples == 0:
+        return np.zeros(0, dtype=int)
+    kth_value = -np.partition(-p_class, k - 1, axis=1)[:, k - 1]
+    gt_value = p_class[np.arange(num_samples), gt_class]
+    is_greater = gt_value > kth_value
+    is_smaller = gt_value < kth_value
+    # Without other classes tied at the boundary, the ground truth is in the top-K
+    num_at_least_kth = np.sum(p_class >= kth_value[:, np.newaxis], axis=1)
+    is_boundary = (gt_value == kth_value) & (num_at_least_kth == k)
+    correct = is_greater | is_boundary
+    # Ties at the boundary (or NaNs) depend on the order used by argsort
+    unresolved = ~(is_greater | is_smaller | is_boundary)
+    if np.any(unresolved):
+        p_class_topk = np.argsort(-p_class[unresolved])[:, :k]
+        correct[unresolved] = np.any(
+            p_class_topk - gt_class[unresolved][:, np.newaxis] == 0, axis=1
+        )
+    return correct.astype(int)
+
+
 def topk_accuracy(
     p_class: np.ndarray, gt_class: np.ndarray, k: int, txt: str = ""
 ) -> float:
@@ -80,11 +120,20 @@ def topk_accuracy(
         top-K accuracy
     """
     check_class_validity(p_class, gt_class)
-    p_class = np.argsort(-p_class)[:, :k]
-    gt_class = gt_class[:, np.newaxis]
-    check_zero: np.ndarray = p_class - gt_class
-    correct = np.sum(np.any(check_zero == 0, axis=1).astype(int))
-    return round(float(correct) / p_class.shape[0], 5)
+    return accuracy_from_correct(topk_correct(p_class, gt_class, k))
+
+
+def accuracy_from_correct(correct: np.ndarray) -> float:
+    """
+    Compute accuracy from per-sample correctness.
+
+    Args:
+        correct: Nx1 vector with 1 if the sample is correct and 0 otherwise
+
+    Returns:
+        Accuracy rounded to 5 decimals
+    """
+    return round(float(np.sum(correct)) / correct.shape[0], 5)
 
 
 def top3_accuracy(p_class: np.ndarray, gt_class: np.ndarray, txt: str = "") -> float:
@@ -133,13 +182,92 @@ def get_rolling_stats(
     Returns:
         List with mean and standard deviation
     """
-    p_cls_topk = np.argsort(-p_class)[:, :k]
-    gt_cls_indx = gt_class[:, np.newaxis]
-    check_zero_topk = p_cls_topk - gt_cls_indx
-    topk_correct = 1 * (np.any(check_zero_topk == 0, axis=1))
-    acc_mean = pd.Series(topk_correct).rolling(window=window_size).mean().mean()
-    acc_std = pd.Series(topk_correct).rolling(window=window_size).mean().std()
-    return [acc_mean, acc_std]
+    return rolling_stats_from_correct(topk_correct(p_class, gt_class, k), window_size)
+
+
+def rolling_stats_from_correct(correct: np.ndarray, window_size: int = 50) -> List:
+    """
+    Compute rolling statistics from per-sample correctness.
+
+    Args:
+        correct: Nx1 vector with 1 if the sample is correct and 0 otherwise
+        window_size: Window size for running stats
+
+    Returns:
+        List with mean and standard deviation
+    """
+    return PrefixAccuracy(correct, window_size).rolling_stats(0, correct.shape[0])
+
+
+class PrefixAccuracy:
+    """
+    Accuracy and rolling statistics for contiguous segments of a test.
+
+    Prefix sums over per-sample correctness give the accuracy of any segment
+    and the rolling mean for every window of the test in linear time. The
+    rolling means of a segment are the rolling means of the test that end in
+    the segment, so they are shared by all segments.
+    """
+
+    def __init__(self, correct: np.ndarray, window_size: int = 50) -> None:
+        """
+        Compute prefix sums and rolling means.
+
+        Args:
+            correct: Nx1 vector with 1 if the sample is correct and 0 otherwise
+            window_size: Window size for running stats
+
+        Returns:
+            None
+        """
+        self.window_size = window_size
+        self.num_samples = correct.shape[0]
+        self.cumsum = np.concatenate([[0], np.cumsum(correct, dtype=np.int64)])
+        self.rolling_mean = np.full(self.num_samples, np.nan)
+        if self.num_samples >= window_size:
+            self.rolling_mean[window_size - 1 :] = (
+                self.cumsum[window_size:] - self.cumsum[:-window_size]
+            ) / window_size
+
+    def accuracy(self, start: int, end: int) -> float:
+        """
+        Compute accuracy for a segment.
+
+        Args:
+            start: Index of the first sample in the segment
+            end: Index after the last sample in the segment
+
+        Returns:
+            Accuracy rounded to 5 decimals
+        """
+        return round(float(self.cumsum[end] - self.cumsum[start]) / int(end - start), 5)
+
+    def rolling_stats(self, start: int, end: int) -> List:
+        """
+        Compute mean and standard deviation of rolling accuracy for a segment.
+
+        The statistics are computed by pandas on the same values as a rolling
+        mean over the segment, so they match :func:`get_rolling_stats`.
+
+        Args:
+            start: Index of the first sample in the segment
+            end: Index after the last sample in the segment
+
+        Returns:
+            List with mean and standard deviation
+        """
+        import pandas as pd
+
+        num_incomplete = min(self.window_size - 1, end - start)
+        rolling_mean = pd.Series(
+            np.concatenate(
+                [
+                    np.full(num_incomplete, np.nan),
+                    self.rolling_mean[start + num_incomplete : end],
+                ]
+            )
+        )
+        return [rolling_mean.mean(), rolling_mean.std()]
 
 
 def get_first_detect_novelty(p_novel: np.ndarray, thresh: float) -> int:
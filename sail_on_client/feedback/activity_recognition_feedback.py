@@ -1,10 +1,13 @@
 """Activity Recognition Feedback."""
 
-from sail_on_client.harness.local_harness import LocalHarness
-from sail_on_client.harness.par_harness import ParHarness
 from sail_on_client.feedback.feedback import Feedback
-from typing import Union, Optional, Dict
-import pandas as pd
+from typing import TYPE_CHECKING, Union, Optional, Dict
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from sail_on_client.harness.local_harness import LocalHarness
+    from sail_on_client.harness.par_harness import ParHarness
 
 SUPPORTED_FEEDBACK = [
     "labels",
@@ -23,7 +26,7 @@ class ActivityRecognitionFeedback(Feedback):
         first_budget: int,
         income_per_batch: int,
         maximum_budget: int,
-        interface: Union[LocalHarness, ParHarness],
+        interface: Union["LocalHarness", "ParHarness"],
         session_id: str,
         test_id: str,
         feedback_type: str,
@@ -59,7 +62,7 @@ class ActivityRecognitionFeedback(Feedback):
 
     def get_classification_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Union[pd.DataFrame, None]:
+    ) -> Union["pd.DataFrame", None]:
         """
         Get labeled feedback for the round.
 
@@ -72,6 +75,8 @@ class ActivityRecognitionFeedback(Feedback):
             A dictionary with the accuracy value or None if
             feedback is requested for an older round
         """
+        import pandas as pd
+
         if round_id > self.current_round:
             self.deposit_income()
             self.current_round = round_id
@@ -99,7 +104,7 @@ class ActivityRecognitionFeedback(Feedback):
 
     def get_detection_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Optional[pd.DataFrame]:
+    ) -> Optional["pd.DataFrame"]:
         """
         Get detection feedback for the round.
 
@@ -111,6 +116,8 @@ class ActivityRecognitionFeedback(Feedback):
         Return:
             A dataframe with id and novelty detection value as columns
         """
+        import pandas as pd
+
         if round_id > self.current_round:
             self.deposit_income()
             self.current_round = round_id
@@ -138,7 +145,7 @@ class ActivityRecognitionFeedback(Feedback):
 
     def get_detection_and_classification_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Optional[pd.DataFrame]:
+    ) -> Optional["pd.DataFrame"]:
         """
         Get detection and classification feedback for the round.
 
@@ -150,6 +157,8 @@ class ActivityRecognitionFeedback(Feedback):
         Return:
             A dataframe with id and novelty detection value as columns
         """
+        import pandas as pd
+
         if round_id > self.current_round:
             self.deposit_income()
             self.current_round = round_id
@@ -191,7 +200,7 @@ class ActivityRecognitionFeedback(Feedback):
 
     def get_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Union[pd.DataFrame, Dict, None]:
+    ) -> Union["pd.DataFrame", Dict, None]:
         """
         Get feedback for the round.
 
@@ -1,11 +1,14 @@
 """Document Transcription Feedback."""
 
-import pandas as pd
-from sail_on_client.harness.local_harness import LocalHarness
-from sail_on_client.harness.par_harness import ParHarness
 from sail_on_client.feedback.feedback import Feedback
 
-from typing import Union, Dict
+from typing import TYPE_CHECKING, Union, Dict
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from sail_on_client.harness.local_harness import LocalHarness
+    from sail_on_client.harness.par_harness import ParHarness
 
 SUPPORTED_FEEDBACK = ["classification", "score", "transcription"]
 
@@ -18,7 +21,7 @@ class DocumentTranscriptionFeedback(Feedback):
         first_budget: int,
         income_per_batch: int,
         maximum_budget: int,
-        interface: Union[LocalHarness, ParHarness],
+        interface: Union["LocalHarness", "ParHarness"],
         session_id: str,
         test_id: str,
         feedback_type: str,
@@ -67,6 +70,8 @@ class DocumentTranscriptionFeedback(Feedback):
             A dictionary containing levenshtein score or None if
             feedback is requested for an older round
         """
+        import pandas as pd
+
         if round_id > self.current_round:
             self.deposit_income()
             self.current_round = round_id
@@ -89,7 +94,7 @@ class DocumentTranscriptionFeedback(Feedback):
 
     def get_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Union[pd.DataFrame, Dict, None]:
+    ) -> Union["pd.DataFrame", Dict, None]:
         """
         Get feedback for the round.
 
@@ -1,10 +1,12 @@
 """Abstract class for feedback for sail-on."""
 
-import pandas as pd
-from sail_on_client.harness.par_harness import ParHarness
-from sail_on_client.harness.local_harness import LocalHarness
+from typing import TYPE_CHECKING, Union, Dict
 
-from typing import Union, Dict
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from sail_on_client.harness.par_harness import ParHarness
+    from sail_on_client.harness.local_harness import LocalHarness
 
 
 class Feedback:
@@ -15,7 +17,7 @@ class Feedback:
         first_budget: int,
         income_per_batch: int,
         maximum_budget: int,
-        interface: Union[LocalHarness, ParHarness],
+        interface: Union["LocalHarness", "ParHarness"],
         session_id: str,
         test_id: str,
         feedback_type: str,
@@ -46,7 +48,7 @@ class Feedback:
 
     def get_labeled_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Union[pd.DataFrame, None]:
+    ) -> Union["pd.DataFrame", None]:
         """
         Get labeled feedback for the round.
 
@@ -59,6 +61,8 @@ class Feedback:
             A dictionary with the accuracy value or None if
             feedback is requested for an older round
         """
+        import pandas as pd
+
         if round_id > self.current_round:
             self.deposit_income()
             self.current_round = round_id
@@ -97,6 +101,8 @@ class Feedback:
             A dictionary with the accuracy value or None if
             feedback is requested for an older round
         """
+        import pandas as pd
+
         if round_id > self.current_round:
             self.deposit_income()
             self.current_round = round_id
@@ -115,7 +121,7 @@ class Feedback:
 
     def get_feedback(
         self, round_id: int, images_id_list: list, image_names: list
-    ) -> Union[pd.DataFrame, Dict, None]:
+    ) -> Union["pd.DataFrame", Dict, None]:
         """
         Get feedback for the round.
 
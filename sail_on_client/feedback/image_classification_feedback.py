@@ -1,9 +1,11 @@
 """Image Classification Feedback."""
 
-from sail_on_client.harness.par_harness import ParHarness
-from sail_on_client.harness.local_harness import LocalHarness
 from sail_on_client.feedback.feedback import Feedback
-from typing import Union
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from sail_on_client.harness.par_harness import ParHarness
+    from sail_on_client.harness.local_harness import LocalHarness
 
 SUPPORTED_FEEDBACK = ["classification", "score"]
 
@@ -16,7 +18,7 @@ class ImageClassificationFeedback(Feedback):
         first_budget: int,
         income_per_batch: int,
         maximum_budget: int,
-        interface: Union[LocalHarness, ParHarness],
+        interface: Union["LocalHarness", "ParHarness"],
         session_id: str,
         test_id: str,
         feedback_type: str,
@@ -0,0 +1,354 @@
+"""Implementation of T&E Harness for PAR Server with asyncio."""
+
+import asyncio
+import concurrent.futures
+import importlib.util
+import logging
+import threading
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_fixed,
+    before_sleep_log,
+)
+
+from sail_on_client.harness.par_harness import ParHarness, ParRequest
+from sail_on_client.harness.results import ResultType
+from sail_on_client.harness.round_dataset import RoundDataset
+
+if TYPE_CHECKING:
+    import httpx
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_fixed(2),
+    reraise=True,
+    before_sleep=before_sleep_log(log, logging.INFO),
+)
+
+
+class AsyncParHarness(ParHarness):
+    """
+    Harness for PAR server with awaitable requests.
+
+    Requests, payloads and responses are handled by ParHarness, only the
+    transport is replaced by a pooled httpx client running on an event loop
+    owned by the harness. The methods of TestAndEvaluationHarness block
+    until the request is complete, while the methods with an `_async`
+    suffix are awaitable and can be scheduled with submit, so requests for
+    several tests and rounds share the loop and the connections to the
+    server. The loop and the client are released by close, which is called
+    by the protocols once they are done with the harness. Since requests
+    from any thread run on the loop of the harness, a single harness is
+    shared by the workers of a thread executor.
+    """
+
+    thread_safe = True
+
+    def __init__(
+        self,
+        url: str,
+        save_directory: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        connect_timeout: float = 0.0,
+        read_timeout: float = 0.0,
+    ) -> None:
+        """
+        Initialize a client connection object.
+
+        Args:
+            url: URL for the server
+            save_directory: A directory to save files
+            pool_connections: Number of connection pools cached by the blocking session
+            pool_maxsize: Maximum number of concurrent connections to the server
+            keep_alive: Flag to reuse connections across requests
+            connect_timeout: Seconds to wait for connecting to the server, no timeout if not positive
+            read_timeout: Seconds to wait for a response from the server, no timeout if not positive
+
+        Returns:
+            None
+        """
+        if not self.is_usable():
+            raise ImportError(
+                "AsyncParHarness requires httpx, install sail-on-client[async]"
+            )
+        ParHarness.__init__(
+            self,
+            url,
+            save_directory,
+            pool_connections,
+            pool_maxsize,
+            keep_alive,
+            connect_timeout,
+            read_timeout,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @classmethod
+    def is_usable(cls) -> bool:
+        """Determine if this class with be detected by SMQTK's plugin."""
+        # httpx is imported when the first request is sent
+        return importlib.util.find_spec("httpx") is not None
+
+    def _create_client(self) -> "httpx.AsyncClient":
+        """
+        Create a client with pooled connections for the server.
+
+        Returns:
+            A client shared by all the requests of the harness
+        """
+        import httpx
+
+        connect_timeout, read_timeout = self._timeout()
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+        )
+        headers = {} if self.keep_alive else {"Connection": "close"}
+        return httpx.AsyncClient(
+            base_url=self.url,
+            limits=limits,
+            headers=headers,
+            timeout=httpx.Timeout(None, connect=connect_timeout, read=read_timeout),
+        )
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """Client used for requests, created on the event loop of the harness."""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop of the harness running in a background thread."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=loop.run_forever, name="AsyncParHarness", daemon=True
+                )
+                self._loop_thread.start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, awaitable: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """
+        Schedule an awaitable on the event loop of the harness.
+
+        Args:
+            awaitable: Awaitable, e.g. a call to one of the `_async` methods
+
+        Returns:
+            A future with the result of the awaitable
+        """
+        return asyncio.run_coroutine_threadsafe(awaitable, self.loop)  # type: ignore
+
+    async def _send_async(self, request: ParRequest) -> Any:
+        """
+        Send a request to the server and handle the response.
+
+        Args:
+            request: Request for the server
+
+        Returns:
+            Value returned by the response handler of the request
+        """
+        with ExitStack() as stack:
+            files = request.open_files(stack)
+            response = await self.client.request(
+                request.method,
+                request.path,
+                params=request.params,
+                files=files or None,
+            )
+        return request.handle_response(response)
+
+    def _send(self, request: ParRequest) -> Any:
+        """
+        Send a request on the event loop of the harness and wait for the response.
+
+        Args:
+            request: Request for the server
+
+        Returns:
+            Value returned by the response handler of the request
+        """
+        return self.submit(self._send_async(request)).result()
+
+    async def _close_async(self) -> None:
+        """Private function to close the client on the event loop of the harness."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        """
+        Close connections to the server and stop the event loop.
+
+        Returns:
+            None
+        """
+        ParHarness.close(self)
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close_async(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if self._loop_thread is not None:
+            self._loop_thread.join()
+            self._loop_thread = None
+        loop.close()
+
+    @_retry
+    async def test_ids_request_async(
+        self,
+        protocol: str,
+        domain: str,
+        detector_seed: str,
+        test_assumptions: str = "{}",
+    ) -> str:
+        """Request Test Identifiers (see test_ids_request)."""
+        return await self._send_async(
+            self._test_ids_request(protocol, domain, detector_seed, test_assumptions)
+        )
+
+    @_retry
+    async def session_request_async(
+        self,
+        test_ids: list,
+        protocol: str,
+        domain: str,
+        novelty_detector_version: str,
+        hints: list,
+        detection_threshold: float,
+    ) -> str:
+        """Create a new session (see session_request)."""
+        return await self._send_async(
+            self._session_request(
+                test_ids,
+                protocol,
+                domain,
+                novelty_detector_version,
+                hints,
+                detection_threshold,
+            )
+        )
+
+    @_retry
+    async def resume_session_async(self, session_id: str) -> List[str]:
+        """Get finished test from an existing session (see resume_session)."""
+        return await self._send_async(self._resume_session_request(session_id))
+
+    async def dataset_request_async(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> str:
+        """Request data for evaluation (see dataset_request)."""
+        dataset = await self.round_dataset_request_async(test_id, round_id, session_id)
+        return dataset.path
+
+    @_retry
+    async def round_dataset_request_async(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> RoundDataset:
+        """Request data with instance ids (see round_dataset_request)."""
+        return await self._send_async(
+            self._round_dataset_request(test_id, round_id, session_id)
+        )
+
+    @_retry
+    async def get_feedback_request_async(
+        self,
+        feedback_ids: list,
+        feedback_type: str,
+        test_id: str,
+        round_id: int,
+        session_id: str,
+    ) -> str:
+        """Get Labels from the server (see get_feedback_request)."""
+        return await self._send_async(
+            self._feedback_request(
+                feedback_ids, feedback_type, test_id, round_id, session_id
+            )
+        )
+
+    @_retry
+    async def post_results_async(
+        self,
+        result_files: Dict[str, ResultType],
+        test_id: str,
+        round_id: int,
+        session_id: str,
+    ) -> None:
+        """Post client detector predictions (see post_results)."""
+        await self._send_async(
+            self._post_results_request(result_files, test_id, round_id, session_id)
+        )
+
+    @_retry
+    async def evaluate_async(
+        self,
+        test_id: str,
+        round_id: int,
+        session_id: str,
+        baseline_session_id: str = None,
+    ) -> Dict:
+        """Get results for test(s) (see evaluate)."""
+        return await self._send_async(
+            self._evaluate_request(test_id, round_id, session_id)
+        )
+
+    @_retry
+    async def get_test_metadata_async(
+        self, session_id: str, test_id: str
+    ) -> Dict[str, Any]:
+        """Retrieve the metadata json (see get_test_metadata)."""
+        return await self._send_async(self._test_metadata_request(session_id, test_id))
+
+    @_retry
+    async def complete_test_async(self, session_id: str, test_id: str) -> None:
+        """Mark test as completed (see complete_test)."""
+        await self._send_async(self._complete_test_request(session_id, test_id))
+
+    @_retry
+    async def terminate_session_async(self, session_id: str) -> None:
+        """Terminate the session (see terminate_session)."""
+        await self._send_async(self._terminate_session_request(session_id))
+
+    def evaluate_batch(
+        self,
+        session_test_ids: List[Tuple[str, str]],
+        round_id: int,
+        baseline_session_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Get results for multiple tests across sessions with concurrent requests.
+
+        Args:
+            session_test_ids: List of session id and test id pairs being evaluated
+            round_id: The sequential number of the round being evaluated
+            baseline_session_id: The id of the session with baseline results
+
+        Returns:
+            List of results in the same order as session_test_ids
+        """
+        futures = [
+            self.submit(
+                self.evaluate_async(test_id, round_id, session_id, baseline_session_id)
+            )
+            for session_id, test_id in session_test_ids
+        ]
+        return [future.result() for future in futures]
@@ -6,18 +6,19 @@ from sail_on_client.harness.file_provider_fn import (
     get_session_info,
     get_session_test_info,
     log_session,
+    log_result_types,
     read_meta_data,
-    read_gt_csv_file,
+    reset_session_test,
+    update_detection_state,
     get_classification_feedback,
     get_classificaton_score_feedback,
     get_single_gt_feedback,
     get_kinetics_labels_var_feedback,
     get_levenshtein_feedback,
     psuedo_label_feedback,
-    write_session_log_file,
 )
+from sail_on_client.harness.ground_truth_store import ground_truth_store
 
-import csv
 import logging
 import os
 import glob
@@ -68,6 +69,33 @@ class FileProvider:
             structure = get_session_info(
                 self.results_folder, session_id, in_process_only=in_process_only
             )
+        except KeyError:
+            raise ProtocolError(
+                "session_id_invalid",
+                f"Provided session id {session_id} could not be found or was improperly set up",
+            )
+        return self._test_metadata(structure, session_id, test_id, api_call)
+
+    def _test_metadata(
+        self,
+        structure: Dict[str, Any],
+        session_id: str,
+        test_id: str,
+        api_call: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Get test metadata for a session that is already loaded.
+
+        Args:
+            structure: Session info returned by get_session_info
+            session_id: Session id for which the info is required
+            test_id: Test id for which the info is required
+            api_call: Flag to change metadata to approved metadata
+
+        Returns:
+            Metadata associated with the test as a dictionary
+        """
+        try:
             info = structure["created"]
             metadata_location = os.path.join(
                 self.folder,
@@ -255,11 +283,7 @@ class FileProvider:
         if round_id is not None:
             # Check for removing leftover files from restarting tests within a session
             if int(round_id) == 0 and test_info:
-                test_session_path = os.path.join(
-                    self.results_folder, f"{str(session_id)}.{str(test_id)}.json"
-                )
-                if os.path.exists(test_session_path):
-                    os.remove(test_session_path)
+                reset_session_test(self.results_folder, session_id, test_id)
                 test_result_paths = glob.glob(
                     os.path.join(
                         self.results_folder,
@@ -272,8 +296,7 @@ class FileProvider:
                     os.remove(path)
 
             temp_file_path = BytesIO()
-            lines = read_gt_csv_file(file_location)
-            lines = [x[0] for x in lines if x[0].strip("\n\t\"',.") != ""]
+            lines = ground_truth_store.get(file_location).dataset_ids
             try:
                 round_pos = int(round_id) * int(metadata["round_size"])
             except KeyError:
@@ -513,18 +536,28 @@ class FileProvider:
                 )
             else:
                 try:
-                    with open(
-                        test_results_structure["detection file path"], "r"
-                    ) as d_file:
-                        d_reader = csv.reader(d_file, delimiter=",")
-                        detection_lines = list(d_reader)
-                    predictions = [float(x[1]) for x in detection_lines]
+                    detection_threshold = structure["created"]["detection_threshold"]
+                    detection_state = test_results_structure.get("detection state")
+                    if detection_state is None or detection_state["max_score"] is None:
+                        # Fallback for results logged without detection state
+                        with open(
+                            test_results_structure["detection file path"], "r"
+                        ) as d_file:
+                            detection_state = update_detection_state(
+                                None,
+                                d_file.read(),
+                                None,
+                                detection_threshold,
+                                metadata.get("red_light"),
+                            )
+                    if detection_state["max_score"] is None:
+                        raise ValueError("Detection file does not have any results")
                     # if given detection and past the detection point
-                    is_given = is_given_detection_mode and metadata.get(
-                        "red_light"
-                    ) in [x[0] for x in detection_lines]
+                    is_given = (
+                        is_given_detection_mode and detection_state["red_light_seen"]
+                    )
                     if (
-                        max(predictions) <= structure["created"]["detection_threshold"]
+                        detection_state["max_score"] <= detection_threshold
                         and not is_given
                     ):
                         if (
@@ -654,10 +687,31 @@ class FileProvider:
             except KeyError:
                 pass
 
+        # Parse detection results before anything is written, so results with
+        # malformed detections are rejected without changing the session
+        log_content = {}
+        if "detection" in result_files.keys():
+            metadata = self._test_metadata(structure, session_id, test_id, False)
+            try:
+                log_content["detection state"] = update_detection_state(
+                    test_structure.get("post_results", {}).get("detection state"),
+                    result_files["detection"],
+                    round_id,
+                    structure["created"]["detection_threshold"],
+                    metadata.get("red_light"),
+                )
+            except (IndexError, ValueError):
+                raise ProtocolError(
+                    "CantReadFile",
+                    f"""Detection results posted for round {round_id} of test id
+                        {test_id} could not be parsed. Every row must contain an
+                        instance id followed by a score.""",
+                    "".join(traceback.format_stack()),
+                )
+
         protocol = structure["created"]["protocol"]
         domain = structure["created"]["domain"]
         os.makedirs(os.path.join(self.results_folder, protocol, domain), exist_ok=True)
-        log_content = {}
         for r_type in result_files.keys():
             filename = f"{str(session_id)}.{str(test_id)}_{r_type}.csv"
             path = os.path.join(self.results_folder, protocol, domain, filename)
@@ -667,7 +721,7 @@ class FileProvider:
 
         # Log call
         log_content["last round"] = str(round_id)
-        updated_test_structure = log_session(
+        log_session(
             self.results_folder,
             activity="post_results",
             session_id=session_id,
@@ -675,22 +729,14 @@ class FileProvider:
             round_id=round_id,
             content=log_content,
             content_loc="activity",
-            return_structure=True,
         )
-        if updated_test_structure:
-            prev_types = updated_test_structure["post_results"]["rounds"][
-                str(round_id)
-            ].get("types", [])
-            new_types = prev_types + list(result_files.keys())
-            updated_test_structure["post_results"]["rounds"][str(round_id)][
-                "types"
-            ] = new_types
-            write_session_log_file(
-                updated_test_structure,
-                os.path.join(
-                    self.results_folder, f"{str(session_id)}.{str(test_id)}.json"
-                ),
-            )
+        log_result_types(
+            self.results_folder,
+            session_id,
+            test_id,
+            round_id,
+            list(result_files.keys()),
+        )
 
     def complete_test(self, session_id: str, test_id: str) -> None:
         """
@@ -1,16 +1,20 @@
 """Set of functions used by file provider."""
 from sail_on_client.errors.errors import ServerError, ProtocolError, RoundError
 from sail_on_client.harness.constants import ProtocolConstants
+from sail_on_client.harness.ground_truth_store import ground_truth_store
+from sail_on_client.harness.session_journal import (
+    SessionJournal,
+    get_session_journal,
+    release_session_journal,
+    result_types_record,
+)
+from sail_on_client.harness.transcript_feedback import transcript_feedback
 
 import csv
-import datetime
 import numpy as np
-import nltk
 import os
 import json
-from typing import List, Optional, Dict, Any
-from sklearn.metrics.cluster import normalized_mutual_info_score
-import re
+from typing import List, Optional, Dict, Any, Tuple
 import traceback
 
 
@@ -77,20 +81,10 @@ def get_session_info(
     Returns:
         Session information as a dict
     """
-    path = os.path.join(folder, f"{str(session_id)}.json")
-    if os.path.exists(path):
-        with open(path, "r") as session_file:
-            info = json.load(session_file)
-            terminated = "termination" in info
-            if terminated and in_process_only:
-                raise ProtocolError(
-                    "SessionEnded",
-                    """The session being requested has already been terminated.
-                       Please either create a new session or request a different ID""",
-                )
-            else:
-                return info
-    return {}
+    journal = get_session_journal(folder, session_id)
+    if in_process_only:
+        _check_session_active(journal)
+    return journal.session_info()
 
 
 def get_session_test_info(folder: str, session_id: str, test_id: str) -> Dict[str, Any]:
@@ -105,18 +99,45 @@ def get_session_test_info(folder: str, session_id: str, test_id: str) -> Dict[st
     Returns:
         Session information associated with test as a dict
     """
-    path = os.path.join(folder, f"{str(session_id)}.{test_id}.json")
-    if os.path.exists(path):
-        with open(path, "r") as session_file:
-            info = json.load(session_file)
-            if "completion" in info:
-                raise ProtocolError(
-                    "TestCompleted",
-                    "The test being requested has already been completed for this session",
-                )
-            else:
-                return info
-    return {}
+    journal = get_session_journal(folder, session_id)
+    _check_test_active(journal, test_id)
+    return journal.test_info(test_id)
+
+
+def _check_session_active(journal: SessionJournal) -> None:
+    """
+    Private function to raise an error if the session was terminated.
+
+    Args:
+        journal: Journal associated with the session
+
+    Returns:
+        None
+    """
+    if journal.is_terminated():
+        raise ProtocolError(
+            "SessionEnded",
+            """The session being requested has already been terminated.
+               Please either create a new session or request a different ID""",
+        )
+
+
+def _check_test_active(journal: SessionJournal, test_id: str) -> None:
+    """
+    Private function to raise an error if the test was completed.
+
+    Args:
+        journal: Journal associated with the session
+        test_id: Test id associated with the session
+
+    Returns:
+        None
+    """
+    if journal.is_test_completed(test_id):
+        raise ProtocolError(
+            "TestCompleted",
+            "The test being requested has already been completed for this session",
+        )
 
 
 def write_session_log_file(structure: Dict, filepath: str) -> None:
@@ -159,54 +180,156 @@ def log_session(
     Returns
         Updated log if `return_structure` is set to True
     """
-    structure = get_session_info(folder, session_id)
-    write_session_file = True
-    if test_id is None:
-        structure[activity] = {"time": [str(datetime.datetime.now())]}
-        if content is not None:
-            structure[activity].update(content)
+    journal = get_session_journal(folder, session_id)
+    with journal.transaction():
+        # Raises an error if the session was terminated or the test completed
+        _check_session_active(journal)
+        if test_id is not None:
+            _check_test_active(journal, test_id)
+        journal.log(activity, test_id, round_id, content, content_loc)
+        if return_structure:
+            return get_session_test_info(folder, session_id, test_id)
+    if activity == "termination" and test_id is None:
+        # Nothing is logged after termination so the journal is not needed
+        release_session_journal(folder, session_id)
+    return None
+
+
+def log_result_types(
+    folder: str, session_id: str, test_id: str, round_id: int, types: List[str]
+) -> None:
+    """
+    Add types of results posted in a round to the session log.
+
+    Args:
+        folder: Folder where the session file is saved
+        session_id: Session id associated with the log
+        test_id: Test id associated with the log
+        round_id: Round id associated with the log
+        types: Types of results posted in the round
+
+    Returns:
+        None
+    """
+    journal = get_session_journal(folder, session_id)
+    with journal.transaction():
+        journal.append(result_types_record(test_id, round_id, types))
+
+
+def reset_session_test(folder: str, session_id: str, test_id: str) -> None:
+    """
+    Remove all logs associated with a test from the session.
+
+    Args:
+        folder: Folder where the session file is saved
+        session_id: Session id associated with the log
+        test_id: Test id for which the logs are removed
+
+    Returns:
+        None
+    """
+    journal = get_session_journal(folder, session_id)
+    with journal.transaction():
+        journal.append({"op": "reset_test", "test_id": test_id})
+    test_session_path = os.path.join(folder, f"{str(session_id)}.{str(test_id)}.json")
+    if os.path.exists(test_session_path):
+        os.remove(test_session_path)
+
+
+def update_session_info(folder: str, session_id: str, key: str, value: Any) -> None:
+    """
+    Set a top level entry in the session log.
+
+    Args:
+        folder: Folder where the session file is saved
+        session_id: Session id associated with the log
+        key: Name of the entry
+        value: Value of the entry
+
+    Returns:
+        None
+    """
+    journal = get_session_journal(folder, session_id)
+    with journal.transaction():
+        journal.append({"op": "update_session", "key": key, "value": value})
+
+
+def update_detection_state(
+    detection_state: Optional[Dict[str, Any]],
+    detection_content: str,
+    round_id: Optional[int],
+    detection_threshold: float,
+    red_light: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Update running detection state with detection results posted in a round.
+
+    Args:
+        detection_state: Detection state before the round, None for a new test
+        detection_content: Content of the posted detection csv
+        round_id: Round id associated with the results
+        detection_threshold: Detection threshold used by the session
+        red_light: Instance id where novelty is introduced
+
+    Returns:
+        Dictionary with max score, red light status and round where the
+        threshold was crossed for the first time
+    """
+    if detection_state is None:
+        detection_state = {
+            "max_score": None,
+            "red_light_seen": False,
+            "first_crossing_round": None,
+        }
     else:
-        test_structure = get_session_test_info(folder, session_id, test_id)
-        if activity not in test_structure:
-            test_structure[activity] = {"time": [str(datetime.datetime.now())]}
-        if content_loc == "activity":
-            if content is not None:
-                test_structure[activity].update(content)
-        if round_id is not None:
-            round_id_str = str(round_id)
-            rounds = test_structure[activity].get("rounds", {})
-            if round_id_str not in rounds:
-                rounds[round_id_str] = {"time": [str(datetime.datetime.now())]}
-            else:
-                rounds[round_id_str]["time"].append(str(datetime.datetime.now()))
-            if content_loc == "round":
-                if content is not None:
-                    rounds[round_id_str].update(content)
-            test_structure[activity]["rounds"] = rounds
-            test_structure[activity]["last round"] = round_id_str
-
-        if not return_structure:
-            write_session_log_file(
-                test_structure,
-                os.path.join(folder, f"{str(session_id)}.{str(test_id)}.json"),
-            )
+        detection_state = dict(detection_state)
+    detection_lines = [
+        x for x in csv.reader(detection_content.splitlines(), delimiter=",") if x
+    ]
+    if not detection_lines:
+        return detection_state
+    round_max = max(float(x[1]) for x in detection_lines)
+    if detection_state["max_score"] is None or round_max > detection_state["max_score"]:
+        detection_state["max_score"] = round_max
+    if red_light is not None and red_light in [x[0] for x in detection_lines]:
+        detection_state["red_light_seen"] = True
+    if (
+        detection_state["first_crossing_round"] is None
+        and round_id is not None
+        and round_max > detection_threshold
+    ):
+        detection_state["first_crossing_round"] = round_id
+    return detection_state
+
+
+def _feedback_window(
+    num_lines: int, metadata: Dict[str, Any], check_constrained: bool
+) -> Tuple[int, int]:
+    """
+    Get the range of lines considered for feedback.
 
-        if activity == "completion":
-            session_tests = structure.get("tests", {"completed_tests": []})
-            session_tests["completed_tests"].append(test_id)
-            structure["tests"] = session_tests
-        else:
-            write_session_file = False
+    Args:
+        num_lines: Number of lines in the file
+        metadata: Dictionary with metadata
+        check_constrained: Flag to check constraints associated with feedback
 
-    if write_session_file:
-        write_session_log_file(
-            structure, os.path.join(folder, f"{str(session_id)}.json")
+    Returns:
+        Tuple with start and end of the range
+    """
+    feedback_constrained = metadata.get("feedback_constrained", True)
+    try:
+        if not check_constrained or not feedback_constrained:
+            return 0, num_lines
+        # under the constrained case, we always look at the last round
+        start = num_lines - int(metadata["round_size"])
+        return start, start + int(metadata["round_size"])
+    except KeyError:
+        raise RoundError(
+            "no_defined_rounds",
+            "round_size not defined in metadata.",
+            "".join(traceback.format_stack()),
         )
 
-    if return_structure:
-        return test_structure
-    return None
-
 
 def read_feedback_file(
     csv_reader: "csv.reader",  # type: ignore
@@ -226,36 +349,62 @@ def read_feedback_file(
     Returns:
         Dictionary containing feedback with feedback_ids as keys
     """
-    feedback_constrained = metadata.get("feedback_constrained", True)
-
     lines: List = list(csv_reader)
+    start, end = _feedback_window(len(lines), metadata, check_constrained)
+    # Only the rows in the window are stripped and ids are matched with a set
+    feedback_id_set = set(feedback_ids) if feedback_ids else None
+    feedback: Dict[str, List[str]] = {}
+    for line in lines[start:end]:
+        row = [value.strip(" \"'") for value in line]
+        if feedback_id_set is None or row[0] in feedback_id_set:
+            feedback[row[0]] = row[1:]
+    return feedback
 
+
+def _argmax_rows(rows: List[List[str]]) -> np.ndarray:
+    """
+    Get the position of the maximum value in every row of scores.
+
+    Args:
+        rows: Rows of scores read from a result file
+
+    Returns:
+        Array with the position of the maximum value for every row
+    """
+    if len(rows) == 0:
+        return np.zeros(0, dtype=np.int64)
     try:
-        if not check_constrained or not feedback_constrained:
-            start = 0
-            end = len(lines)
-        else:
-            # under the constrained case, we always look at the last round
-            start = len(lines) - int(metadata["round_size"])
-            end = start + int(metadata["round_size"])
-    except KeyError:
-        raise RoundError(
-            "no_defined_rounds",
-            "round_size not defined in metadata.",
-            "".join(traceback.format_stack()),
+        scores = np.asarray(rows, dtype=np.float64)
+    except ValueError:
+        # Rows with a different number of scores are handled one at a time
+        return np.array(
+            [np.argmax([float(score) for score in row]) for row in rows],
+            dtype=np.int64,
         )
+    return np.argmax(scores, axis=1)
 
-    if feedback_ids:
-        return {
-            x[0]: list(x[1:])
-            for x in [[n.strip(" \"'") for n in y] for y in lines][start:end]
-            if x[0] in feedback_ids
-        }
-    else:
-        return {
-            x[0]: list(x[1:])
-            for x in [[n.strip(" \"'") for n in y] for y in lines][start:end]
-        }
+
+def read_gt_feedback(
+    gt_file: str,
+    feedback_ids: Optional[List[str]],
+    metadata: Dict[str, Any],
+    check_constrained: bool = True,
+) -> Dict:
+    """
+    Get feedback from ground truth file using the ground truth store.
+
+    Args:
+        gt_file: Path to ground truth file
+        feedback_ids: Element ids for which feedback is requested
+        metadata: Dictionary with metadata
+        check_constrained: Flag to check constraints associated with feedback
+
+    Returns:
+        Dictionary containing feedback with feedback_ids as keys
+    """
+    table = ground_truth_store.get(gt_file)
+    start, end = _feedback_window(table.num_rows, metadata, check_constrained)
+    return table.feedback_rows(feedback_ids, start, end)
 
 
 def get_classification_feedback(
@@ -288,8 +437,8 @@ def get_classification_feedback(
             )
             feedback_ids = list(results.keys())[: int(feedback_max_ids)]
 
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file),
+    ground_truth = read_gt_feedback(
+        gt_file,
         feedback_ids,
         metadata,
         check_constrained=feedback_ids is None or len(feedback_ids) == 0,
@@ -319,8 +468,8 @@ def get_kinetics_labels_var_feedback(
     Returns:
         Dictionary containing feedback with feedback_ids as keys
     """
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file),
+    ground_truth = read_gt_feedback(
+        gt_file,
         feedback_ids,
         metadata,
         check_constrained=feedback_ids is None or len(feedback_ids) == 0,
@@ -362,8 +511,8 @@ def get_single_gt_feedback(
         gt_feedback_ids = list(results.keys())
     else:
         gt_feedback_ids = feedback_ids
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file),
+    ground_truth = read_gt_feedback(
+        gt_file,
         gt_feedback_ids,
         metadata,
         check_constrained=gt_feedback_ids is None or len(gt_feedback_ids) == 0,
@@ -373,20 +522,30 @@ def get_single_gt_feedback(
     # For specific feedback types, and when no feedback ids are specified,
     # will only return feedback on instances marked incorrectly
     if metadata.get("return_incorrect", None) and not feedback_ids:
-        for sample_id in results.keys():
-            r = -1
-            if metadata["return_incorrect"] == ProtocolConstants.CLASSIFICATION:
-                r = int(np.argmax([float(i) for i in results[sample_id]], axis=0))
-            elif metadata["return_incorrect"] == ProtocolConstants.DETECTION:
-                r = int(results[sample_id][1])
-            else:
-                raise ProtocolError(
-                    "FeedbackConfigError",
-                    "The api based feedback config is misconfigured. Please check API",
-                )
-            g = int(ground_truth[sample_id][metadata["columns"][0]])
-            if r != g:
-                return_ids.append(sample_id)
+        sample_ids = list(results.keys())
+        if metadata["return_incorrect"] == ProtocolConstants.CLASSIFICATION:
+            predictions = _argmax_rows([results[sample_id] for sample_id in sample_ids])
+        elif metadata["return_incorrect"] == ProtocolConstants.DETECTION:
+            predictions = np.array(
+                [int(results[sample_id][1]) for sample_id in sample_ids],
+                dtype=np.int64,
+            )
+        elif len(sample_ids) > 0:
+            raise ProtocolError(
+                "FeedbackConfigError",
+                "The api based feedback config is misconfigured. Please check API",
+            )
+        else:
+            predictions = np.zeros(0, dtype=np.int64)
+        labels = np.array(
+            [
+                int(ground_truth[sample_id][metadata["columns"][0]])
+                for sample_id in sample_ids
+            ],
+            dtype=np.int64,
+        )
+        incorrect = np.flatnonzero(predictions != labels)
+        return_ids = [sample_ids[idx] for idx in incorrect]
     else:
         return_ids = list(ground_truth.keys())
 
@@ -411,24 +570,26 @@ def get_classificaton_score_feedback(
     Returns:
         Dictionary containing feedback with feedback_ids as keys
     """
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file), None, metadata, check_constrained=False
-    )
+    ground_truth = read_gt_feedback(gt_file, None, metadata, check_constrained=False)
     with open(result_files[0], "r") as rf:
         result_reader = csv.reader(rf, delimiter=",")
         results = read_feedback_file(
             result_reader, None, metadata, check_constrained=False
         )
 
-    # Go through results and count number correct
-    num_correct = 0
-    for idx in results.keys():
-        r = int(np.argmax([float(i) for i in results[idx]], axis=0))
-        g = int(ground_truth[idx][metadata["columns"][0]])
-        if r == g:
-            num_correct += 1
+    # Count number correct over the entire results at once
+    sample_ids = list(results.keys())
+    predictions = _argmax_rows([results[sample_id] for sample_id in sample_ids])
+    labels = np.array(
+        [
+            int(ground_truth[sample_id][metadata["columns"][0]])
+            for sample_id in sample_ids
+        ],
+        dtype=np.int64,
+    )
+    num_correct = int(np.count_nonzero(predictions == labels))
 
-    accuracy = float(num_correct) / float(len(results.keys()))
+    accuracy = float(num_correct) / float(len(sample_ids))
     return {"accuracy": accuracy}
 
 
@@ -457,8 +618,8 @@ def get_characterization_feedback(
     with open(result_files[0], "r") as rf:
         result_reader = csv.reader(rf, delimiter=",")
         results = read_feedback_file(result_reader, feedback_ids, metadata)
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file), feedback_ids, metadata, check_constrained=False
+    ground_truth = read_gt_feedback(
+        gt_file, feedback_ids, metadata, check_constrained=False
     )
 
     # If ground truth is not novel, returns 1 is prediction is correct,
@@ -481,21 +642,6 @@ def get_characterization_feedback(
     }
 
 
-def _ensure_space(input_str: str) -> str:
-    return " ".join(
-        [
-            x.strip()
-            for x in re.split(
-                r"(\W+)",
-                input_str.replace(";", "")
-                .replace('"', "")
-                .replace("|", "")
-                .replace("  ", " "),
-            )
-        ]
-    )
-
-
 def get_levenshtein_feedback(
     gt_file: str,
     result_files: List[str],
@@ -514,23 +660,16 @@ def get_levenshtein_feedback(
     Returns:
         Dictionary containing feedback with feedback_ids as keys
     """
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file), feedback_ids, metadata, check_constrained=False
+    ground_truth = read_gt_feedback(
+        gt_file, feedback_ids, metadata, check_constrained=False
     )
     with open(result_files[0], "r") as rf:
         result_reader = csv.reader(rf, delimiter=",")
         results = read_feedback_file(result_reader, feedback_ids, metadata)
 
-    return {
-        x: [
-            nltk.edit_distance(
-                _ensure_space(ground_truth[x][metadata["columns"][i]]),
-                _ensure_space(results[x][0]),
-            )
-            for i, _ in enumerate(metadata["columns"])
-        ]
-        for x in results.keys()
-    }
+    return transcript_feedback.levenshtein_feedback(
+        gt_file, ground_truth, results, metadata["columns"]
+    )
 
 
 def get_cluster_feedback(
@@ -551,8 +690,10 @@ def get_cluster_feedback(
     Returns:
         Dictionary containing feedback with feedback_ids as keys
     """
-    ground_truth = read_feedback_file(
-        read_gt_csv_file(gt_file), feedback_ids, metadata, check_constrained=False
+    from sklearn.metrics.cluster import normalized_mutual_info_score
+
+    ground_truth = read_gt_feedback(
+        gt_file, feedback_ids, metadata, check_constrained=False
     )
     with open(result_files[0], "r") as rf:
         result_reader = csv.reader(rf, delimiter=",")
@@ -614,7 +755,7 @@ def psuedo_label_feedback(
     Returns:
         Dictionary containing feedback with feedback_ids as keys
     """
-    ground_truth = read_feedback_file(read_gt_csv_file(gt_file), feedback_ids, metadata)
+    ground_truth = read_gt_feedback(gt_file, feedback_ids, metadata)
 
     structure = get_session_info(folder, session_id)
 
@@ -636,6 +777,6 @@ def psuedo_label_feedback(
         return_dict[x] = labels.index(col)
 
     structure["psuedo_labels"][feedback_type] = labels
-    write_session_log_file(structure, os.path.join(folder, f"{str(session_id)}.json"))
+    update_session_info(folder, session_id, "psuedo_labels", structure["psuedo_labels"])
 
     return return_dict
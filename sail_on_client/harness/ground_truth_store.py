@@ -0,0 +1,205 @@
+"""In-memory store for ground truth files used by the file provider."""
+
+import csv
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Characters stripped from ids and values when reading feedback
+FEEDBACK_STRIP_CHARS = " \"'"
+# Characters stripped from ids when deciding if a row is part of the dataset
+DATASET_STRIP_CHARS = "\n\t\"',."
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class GroundTruthTable:
+    """Columnar representation of a single ground truth file."""
+
+    def __init__(self, file_location: str, mtime_ns: int, size: int) -> None:
+        """
+        Parse a ground truth file.
+
+        Args:
+            file_location: Path to the gt csv file
+            mtime_ns: Modification time of the file when it was parsed
+            size: Size of the file in bytes when it was parsed
+
+        Returns:
+            None
+        """
+        self.file_location = file_location
+        self.mtime_ns = mtime_ns
+        self.size = size
+        with open(file_location, "r") as f:
+            csv_reader = csv.reader(f, delimiter=",", quotechar="|")
+            # Skip the header
+            next(csv_reader, None)
+            rows = list(csv_reader)
+        self.num_rows = len(rows)
+        self.row_lengths = [len(row) for row in rows]
+        num_columns = max(self.row_lengths, default=0)
+        # Short rows are padded with None so that every column has num_rows entries
+        self.columns: List[List[Optional[str]]] = [
+            [row[idx] if idx < len(row) else None for row in rows]
+            for idx in range(num_columns)
+        ]
+        ids = self.columns[0] if num_columns > 0 else []
+        self.index: Dict[str, int] = {}
+        for row_idx, instance_id in enumerate(ids):
+            if instance_id is not None:
+                self.index[instance_id.strip(FEEDBACK_STRIP_CHARS)] = row_idx
+        self.dataset_ids = [
+            instance_id
+            for instance_id in ids
+            if instance_id is not None and instance_id.strip(DATASET_STRIP_CHARS) != ""
+        ]
+
+    def row(self, row_idx: int) -> List[str]:
+        """
+        Get a row of the ground truth as parsed by the csv reader.
+
+        Args:
+            row_idx: Position of the row in the file (excluding header)
+
+        Returns:
+            List of values in the row
+        """
+        return [
+            self.columns[col_idx][row_idx]  # type: ignore
+            for col_idx in range(self.row_lengths[row_idx])
+        ]
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[List[str]]:
+        """
+        Get a range of rows in the ground truth.
+
+        Args:
+            start: Position of the first row
+            end: Position after the last row
+
+        Returns:
+            List of rows
+        """
+        return [self.row(row_idx) for row_idx in range(self.num_rows)[start:end]]
+
+    def feedback_rows(
+        self,
+        feedback_ids: Optional[Iterable[str]],
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Get stripped rows for feedback ids with the same semantics as read_feedback_file.
+
+        Args:
+            feedback_ids: Element ids for which feedback is requested
+            start: Position of the first row considered for feedback
+            end: Position after the last row considered for feedback
+
+        Returns:
+            Dictionary with stripped instance id as key and stripped values as value
+        """
+        row_range = range(self.num_rows)[start:end]
+        if feedback_ids:
+            positions = sorted(
+                {
+                    self.index[feedback_id]
+                    for feedback_id in feedback_ids
+                    if feedback_id in self.index
+                }
+            )
+            positions = [position for position in positions if position in row_range]
+        else:
+            positions = list(row_range)
+        feedback: Dict[str, List[str]] = {}
+        for position in positions:
+            row = [value.strip(FEEDBACK_STRIP_CHARS) for value in self.row(position)]
+            feedback[row[0]] = row[1:]
+        return feedback
+
+
+class GroundTruthStore:
+    """LRU cache of parsed ground truth files bounded by size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_bytes: Maximum size (in bytes of the source files) kept in memory
+
+        Returns:
+            None
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._tables: "OrderedDict[str, GroundTruthTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_location: str) -> GroundTruthTable:
+        """
+        Get parsed ground truth, parsing the file if it changed or was never seen.
+
+        Args:
+            file_location: Path to the gt csv file
+
+        Returns:
+            An instance of GroundTruthTable
+        """
+        key = os.path.abspath(file_location)
+        stat = os.stat(key)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                if table.mtime_ns == stat.st_mtime_ns and table.size == stat.st_size:
+                    self._tables.move_to_end(key)
+                    return table
+                self._remove(key)
+        table = GroundTruthTable(key, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._tables:
+                self._remove(key)
+            self._tables[key] = table
+            self.current_bytes += table.size
+            self._evict()
+        return table
+
+    def invalidate(self, file_location: Optional[str] = None) -> None:
+        """
+        Remove a file or every file from the store.
+
+        Args:
+            file_location: Path to the gt csv file, all files are removed if None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if file_location is None:
+                self._tables.clear()
+                self.current_bytes = 0
+            else:
+                key = os.path.abspath(file_location)
+                if key in self._tables:
+                    self._remove(key)
+
+    def cached_files(self) -> Tuple[str, ...]:
+        """Files currently in the store from least to most recently used."""
+        with self._lock:
+            return tuple(self._tables.keys())
+
+    def _remove(self, key: str) -> None:
+        table = self._tables.pop(key)
+        self.current_bytes -= table.size
+
+    def _evict(self) -> None:
+        # Always keep the most recently used table even if it exceeds the budget
+        while self.current_bytes > self.max_bytes and len(self._tables) > 1:
+            key = next(iter(self._tables))
+            self._remove(key)
+
+
+# Store shared by the file provider and the feedback functions
+ground_truth_store = GroundTruthStore()
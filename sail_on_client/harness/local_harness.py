@@ -4,17 +4,28 @@ from sail_on_client.harness.file_provider import FileProvider
 from sail_on_client.harness.file_provider_fn import get_session_info
 from sail_on_client.errors import RoundError as ClientRoundError
 from sail_on_client.evaluate import create_metric_instance
+from sail_on_client.evaluate.evaluation_engine import (
+    evaluate_accuracy,
+    evaluate_program_metrics,
+)
+from sail_on_client.evaluate.round_wise_evaluator import RoundWiseEvaluator
+from sail_on_client.harness.results import ResultType, read_result
+from sail_on_client.harness.round_dataset import RoundDataset
 from sail_on_client.harness.test_and_evaluation_harness import TestAndEvaluationHarness
 
 from tempfile import TemporaryDirectory
-from typing import Any, Dict, Union, List
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import TYPE_CHECKING, Any, Dict, Union, List, Optional, Tuple
 import os
-import io
 import logging
+import threading
 import ubelt as ub
-import pandas as pd
 import json
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 log = logging.getLogger(__name__)
 
 
@@ -22,7 +33,13 @@ class LocalHarness(TestAndEvaluationHarness):
     """Harness without any server communication."""
 
     def __init__(
-        self, data_dir: str, result_dir: str, gt_dir: str = "", gt_config: str = ""
+        self,
+        data_dir: str,
+        result_dir: str,
+        gt_dir: str = "",
+        gt_config: str = "",
+        vectorized_metrics: bool = False,
+        evaluation_workers: int = 1,
     ) -> None:
         """
         Initialize an object of local harness.
@@ -32,6 +49,8 @@ class LocalHarness(TestAndEvaluationHarness):
             result_dir: Path to the directory where results are stored
             gt_dir: Path to directory with ground truth
             gt_config: Path to config file with column mapping for ground truth
+            vectorized_metrics: Flag to compute program metrics from shared intermediates
+            evaluation_workers: Number of processes used for evaluating tests in a batch
 
         Returns:
             None
@@ -43,7 +62,12 @@ class LocalHarness(TestAndEvaluationHarness):
         self.gt_config = gt_config
         self.temp_dir_name = self.temp_dir.name
         self.result_dir = result_dir
+        self.vectorized_metrics = vectorized_metrics
+        self.evaluation_workers = evaluation_workers
         self.file_provider = FileProvider(self.data_dir, self.result_dir)
+        # Evaluators for tests that are evaluated round wise
+        self._round_wise_evaluators: Dict[Tuple[str, str], RoundWiseEvaluator] = {}
+        self._round_wise_lock = threading.Lock()
 
     def get_config(self) -> Dict:
         """JSON Compliant representation of the object."""
@@ -52,6 +76,8 @@ class LocalHarness(TestAndEvaluationHarness):
             "gt_dir": self.gt_dir,
             "result_dir": self.result_dir,
             "gt_config": self.gt_config,
+            "vectorized_metrics": self.vectorized_metrics,
+            "evaluation_workers": self.evaluation_workers,
         }
 
     def test_ids_request(
@@ -134,6 +160,22 @@ class LocalHarness(TestAndEvaluationHarness):
         Returns:
             Filename of a file containing a list of image files (including full path for each)
         """
+        return self.round_dataset_request(test_id, round_id, session_id).path
+
+    def round_dataset_request(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> RoundDataset:
+        """
+        Request data for evaluation along with the instance ids in the round.
+
+        Args:
+            test_id: The test being evaluated at this moment.
+            round_id: The sequential number of the round being evaluated
+            session_id: The identifier provided by the server for a single experiment
+
+        Returns:
+            Dataset with the path to the dataset file and instance ids for the round
+        """
         self.data_file = os.path.join(
             self.temp_dir_name, f"{session_id}.{test_id}.{round_id}.csv"
         )
@@ -143,9 +185,10 @@ class LocalHarness(TestAndEvaluationHarness):
                 reason="End of Dataset", msg="All Data from dataset has been requested"
             )
         else:
+            content = byte_stream.getvalue()
             with open(self.data_file, "wb") as f:
-                f.write(byte_stream.getbuffer())
-            return self.data_file
+                f.write(content)
+            return RoundDataset.from_bytes(self.data_file, content)
 
     def get_feedback_request(
         self,
@@ -182,13 +225,18 @@ class LocalHarness(TestAndEvaluationHarness):
         return self.feedback_file
 
     def post_results(
-        self, result_files: Dict[str, str], test_id: str, round_id: int, session_id: str
+        self,
+        result_files: Dict[str, ResultType],
+        test_id: str,
+        round_id: int,
+        session_id: str,
     ) -> None:
         """
         Post client detector predictions for the dataset.
 
         Args:
-            result_files: A dictionary of results with protocol constant as key and file path as value
+            result_files: A dictionary of results with protocol constant as key and
+                          file path or contents of the file as value
             test_id: The id of the test currently being evaluated
             round_id: The sequential number of the round being evaluated
             session_id: The id provided by a server denoting a session
@@ -201,58 +249,67 @@ class LocalHarness(TestAndEvaluationHarness):
         domain = info["created"]["domain"]
         base_result_path = os.path.join(str(self.result_dir), protocol, domain)
         os.makedirs(base_result_path, exist_ok=True)
-        result_content = {}
-        for result_key, result_file in result_files.items():
-            with open(result_file, "r") as f:
-                content = f.read()
-            result_content[result_key] = io.StringIO(content).getvalue()
+        result_content = {
+            result_key: read_result(result)
+            for result_key, result in result_files.items()
+        }
         self.file_provider.post_results(session_id, test_id, round_id, result_content)
 
-    def evaluate_round_wise(
-        self,
-        test_id: str,
-        round_id: int,
-        session_id: str,
-    ) -> Dict[str, Any]:
+    def _create_round_wise_evaluator(
+        self, test_id: str, session_id: str
+    ) -> RoundWiseEvaluator:
         """
-        Get results for round(s).
+        Private function to create an evaluator for the rounds of a test.
 
         Args:
             test_id: The id of the test currently being evaluated
-            round_id: The sequential number of the round being evaluated
             session_id: The id provided by a server denoting a session
 
         Returns:
-            Path to a file with the results
+            An instance of RoundWiseEvaluator
         """
         gt_file_id = os.path.join(self.gt_dir, f"{test_id}_single_df.csv")
-        gt = pd.read_csv(gt_file_id, sep=",", header=None, skiprows=1, quotechar="|")
         info = get_session_info(str(self.result_dir), session_id)
         protocol = info["created"]["protocol"]
         domain = info["created"]["domain"]
         metadata = self.get_test_metadata(session_id, test_id)
-        round_size = metadata["round_size"]
-        results: Dict[str, Union[Dict, float]] = {}
-        gt_config = json.load(open(self.gt_config, "r"))
+        with open(self.gt_config, "r") as f:
+            gt_config = json.load(f)
         classification_file_id = os.path.join(
             self.result_dir,
             protocol,
             domain,
             f"{session_id}.{test_id}_classification.csv",
         )
-
-        classifications = pd.read_csv(
-            classification_file_id, sep=",", header=None, quotechar="|"
-        )
-        gt_round = gt.iloc[round_id * round_size : (round_id + 1) * round_size]
-        classification_round = classifications[
-            round_id * round_size : (round_id + 1) * round_size
-        ]
         metric = create_metric_instance(protocol, domain, gt_config)
-        m_acc = metric.m_acc_round_wise(
-            classification_round, gt_round[metric.classification_id], round_id
+        return RoundWiseEvaluator(
+            gt_file_id, classification_file_id, metric, metadata["round_size"]
         )
-        results[f"m_acc_round_{round_id}"] = m_acc
+
+    def evaluate_round_wise(
+        self,
+        test_id: str,
+        round_id: int,
+        session_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Get results for round(s).
+
+        Args:
+            test_id: The id of the test currently being evaluated
+            round_id: The sequential number of the round being evaluated
+            session_id: The id provided by a server denoting a session
+
+        Returns:
+            Path to a file with the results
+        """
+        with self._round_wise_lock:
+            evaluator = self._round_wise_evaluators.get((session_id, test_id))
+            if evaluator is None:
+                evaluator = self._create_round_wise_evaluator(test_id, session_id)
+                self._round_wise_evaluators[(session_id, test_id)] = evaluator
+            results: Dict[str, Union[Dict, float]] = {}
+            results[f"m_acc_round_{round_id}"] = evaluator.evaluate(round_id)
         log.info(f"Accuracy for {test_id}, {round_id}: {ub.repr2(results)}")
         return results
 
@@ -274,112 +331,92 @@ class LocalHarness(TestAndEvaluationHarness):
         Returns:
             Path to a file with the results
         """
-        gt_file_id = os.path.join(self.gt_dir, f"{test_id}_single_df.csv")
-        gt = pd.read_csv(gt_file_id, sep=",", header=None, skiprows=1, quotechar="|")
+        with open(self.gt_config, "r") as f:
+            gt_config = json.load(f)
         info = get_session_info(str(self.result_dir), session_id)
         protocol = info["created"]["protocol"]
         domain = info["created"]["domain"]
-        results: Dict[str, Union[Dict, float]] = {}
-        gt_config = json.load(open(self.gt_config, "r"))
-        detection_file_id = os.path.join(
-            self.result_dir,
-            protocol,
-            domain,
-            f"{session_id}.{test_id}_detection.csv",
-        )
-        detections = pd.read_csv(detection_file_id, sep=",", header=None, quotechar="|")
-        classification_file_id = os.path.join(
-            self.result_dir,
-            protocol,
-            domain,
-            f"{session_id}.{test_id}_classification.csv",
-        )
+        return _evaluate_test(
+            test_id,
+            [(session_id, protocol, domain)],
+            baseline_session_id,
+            self.gt_dir,
+            str(self.result_dir),
+            gt_config,
+            self.vectorized_metrics,
+        )[0]
+
+    def evaluate_batch(
+        self,
+        session_test_ids: List[Tuple[str, str]],
+        round_id: int,
+        baseline_session_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Get results for multiple tests across sessions.
 
-        classifications = pd.read_csv(
-            classification_file_id, sep=",", header=None, quotechar="|"
-        )
-        if baseline_session_id is not None:
-            baseline_classification_file_id = os.path.join(
-                self.result_dir,
-                protocol,
-                domain,
-                f"{baseline_session_id}.{test_id}_classification.csv",
+        The sessions evaluated on a test share the ground truth and baseline
+        accuracy of the test. Tests are evaluated in separate processes when
+        evaluation_workers is greater than 1.
+
+        Args:
+            session_test_ids: List of session id and test id pairs being evaluated
+            round_id: The sequential number of the round being evaluated
+            baseline_session_id: The id of the session with baseline results
+
+        Returns:
+            List of results in the same order as session_test_ids
+        """
+        with open(self.gt_config, "r") as f:
+            gt_config = json.load(f)
+        session_info: Dict[str, Dict] = {}
+        test_sessions: Dict[str, List[Tuple[str, str, str]]] = {}
+        for session_id, test_id in session_test_ids:
+            if session_id not in session_info:
+                info = get_session_info(str(self.result_dir), session_id)
+                session_info[session_id] = info["created"]
+            test_sessions.setdefault(test_id, []).append(
+                (
+                    session_id,
+                    session_info[session_id]["protocol"],
+                    session_info[session_id]["domain"],
+                )
             )
-            baseline_classifications = pd.read_csv(
-                baseline_classification_file_id, sep=",", header=None
+        evaluation_args = {
+            test_id: (
+                test_id,
+                sessions,
+                baseline_session_id,
+                self.gt_dir,
+                str(self.result_dir),
+                gt_config,
+                self.vectorized_metrics,
             )
-        metric = create_metric_instance(protocol, domain, gt_config)
-        detection_idx = 1
-        gt_classification_idx = metric.classification_id
-        # ######## Image Classification Evaluation  ###########
-        if domain == "image_classification":
-            gt_detection_idx = metric.detection_id
-            # p_unknown column for image classification
-            novel_idx = 1
-        # ######## Activity Recognition Evaluation  ###########
-        elif domain == "activity_recognition":
-            detection_idx = 1
-            gt_detection_idx = metric.novel_id
-            # p_unknown column for activity recognition
-            novel_idx = 31
-        # ######## Document Transcription Evaluation  ###########
-        elif domain == "transcripts":
-            detection_idx = 1
-            gt_detection_idx = metric.novel_id
-            # p_unknown column for transcripts in writer identification
-            novel_idx = 50
+            for test_id, sessions in test_sessions.items()
+        }
+        if self.evaluation_workers > 1 and len(test_sessions) > 1:
+            num_workers = min(self.evaluation_workers, len(test_sessions))
+            # Workers are spawned since threads of the protocol, e.g. posting
+            # results or running an event loop, are not safe to fork
+            with ProcessPoolExecutor(
+                max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = {
+                    test_id: executor.submit(_evaluate_test, *args)
+                    for test_id, args in evaluation_args.items()
+                }
+                test_results = {
+                    test_id: future.result() for test_id, future in futures.items()
+                }
         else:
-            raise AttributeError(
-                f'Domain: "{domain}" is not a real domain.  Get a clue.'
-            )
-
-        m_num = metric.m_num(detections[detection_idx], gt[gt_detection_idx])
-        results["m_num"] = m_num
-        m_num_stats = metric.m_num_stats(
-            detections[detection_idx], gt[gt_detection_idx]
-        )
-        results["m_num_stats"] = m_num_stats
-        m_ndp = metric.m_ndp(classifications[novel_idx], gt[gt_detection_idx])
-        results["m_ndp"] = m_ndp
-        m_ndp_pre = metric.m_ndp_pre(classifications[novel_idx], gt[gt_detection_idx])
-        results["m_ndp_pre"] = m_ndp_pre
-        m_ndp_post = metric.m_ndp_post(classifications[novel_idx], gt[gt_detection_idx])
-        results["m_ndp_post"] = m_ndp_post
-        m_acc = metric.m_acc(
-            gt[gt_detection_idx],
-            classifications,
-            gt[gt_classification_idx],
-            100,
-            5,
-        )
-        results["m_acc"] = m_acc
-        m_acc_failed = metric.m_ndp_failed_reaction(
-            detections[detection_idx],
-            gt[gt_detection_idx],
-            classifications,
-            gt[gt_classification_idx],
-        )
-        results["m_acc_failed"] = m_acc_failed
-        m_is_cdt_and_is_early = metric.m_is_cdt_and_is_early(
-            m_num_stats["GT_indx"],
-            m_num_stats["P_indx_0.5"],
-            gt.shape[0],
-        )
-        results["m_is_cdt_and_is_early"] = m_is_cdt_and_is_early
-        if baseline_session_id is not None:
-            m_acc_baseline = metric.m_acc(
-                gt[gt_detection_idx],
-                baseline_classifications,
-                gt[gt_classification_idx],
-                100,
-                5,
-            )
-            log.info(f"Baseline performance for {test_id}: {ub.repr2(m_acc_baseline)}")
-            m_nrp = metric.m_nrp(m_acc, m_acc_baseline)
-            results["m_nrp"] = m_nrp
-
-        log.info(f"Results for {test_id}: {ub.repr2(results)}")
-        return results
+            test_results = {
+                test_id: _evaluate_test(*args)
+                for test_id, args in evaluation_args.items()
+            }
+        ordered_results = {
+            test_id: iter(results) for test_id, results in test_results.items()
+        }
+        return [next(ordered_results[test_id]) for _, test_id in session_test_ids]
 
     def get_test_metadata(self, session_id: str, test_id: str) -> Dict[str, Any]:
         """
@@ -406,6 +443,8 @@ class LocalHarness(TestAndEvaluationHarness):
             None
         """
         self.file_provider.complete_test(session_id, test_id)
+        with self._round_wise_lock:
+            self._round_wise_evaluators.pop((session_id, test_id), None)
 
     def terminate_session(self, session_id: str) -> None:
         """
@@ -417,3 +456,198 @@ class LocalHarness(TestAndEvaluationHarness):
         Returns: None
         """
         self.file_provider.terminate_session(session_id)
+        with self._round_wise_lock:
+            for session_test_id in list(self._round_wise_evaluators):
+                if session_test_id[0] == session_id:
+                    del self._round_wise_evaluators[session_test_id]
+
+
+def _read_results(
+    result_dir: str,
+    protocol: str,
+    domain: str,
+    session_id: str,
+    test_id: str,
+    result_type: str,
+    **kwargs: Any,
+) -> "pd.DataFrame":
+    """Private function to read results posted for a test in a session."""
+    import pandas as pd
+
+    result_file_id = os.path.join(
+        result_dir,
+        protocol,
+        domain,
+        f"{session_id}.{test_id}_{result_type}.csv",
+    )
+    return pd.read_csv(result_file_id, sep=",", header=None, **kwargs)
+
+
+def _evaluate_test(
+    test_id: str,
+    sessions: List[Tuple[str, str, str]],
+    baseline_session_id: Optional[str],
+    gt_dir: str,
+    result_dir: str,
+    gt_config: Dict,
+    vectorized_metrics: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Private function to evaluate a test for one or more sessions.
+
+    Args:
+        test_id: The id of the test being evaluated
+        sessions: List of session id, protocol and domain for every session
+        baseline_session_id: The id of the session with baseline results
+        gt_dir: Path to directory with ground truth
+        result_dir: Path to the directory where results are stored
+        gt_config: Column mapping for ground truth
+        vectorized_metrics: Flag to compute program metrics from shared intermediates
+
+    Returns:
+        List of results for every session
+    """
+    import pandas as pd
+
+    gt_file_id = os.path.join(gt_dir, f"{test_id}_single_df.csv")
+    gt = pd.read_csv(gt_file_id, sep=",", header=None, skiprows=1, quotechar="|")
+    # Baseline accuracy is shared by all sessions with the same protocol and domain
+    baseline_accuracy: Dict[Tuple[str, str], Dict] = {}
+    session_results = []
+    for session_id, protocol, domain in sessions:
+        results: Dict[str, Union[Dict, float]] = {}
+        detections = _read_results(
+            result_dir,
+            protocol,
+            domain,
+            session_id,
+            test_id,
+            "detection",
+            quotechar="|",
+        )
+        classifications = _read_results(
+            result_dir,
+            protocol,
+            domain,
+            session_id,
+            test_id,
+            "classification",
+            quotechar="|",
+        )
+        metric = create_metric_instance(protocol, domain, gt_config)
+        detection_idx = 1
+        gt_classification_idx = metric.classification_id
+        # ######## Image Classification Evaluation  ###########
+        if domain == "image_classification":
+            gt_detection_idx = metric.detection_id
+            # p_unknown column for image classification
+            novel_idx = 1
+        # ######## Activity Recognition Evaluation  ###########
+        elif domain == "activity_recognition":
+            detection_idx = 1
+            gt_detection_idx = metric.novel_id
+            # p_unknown column for activity recognition
+            novel_idx = 31
+        # ######## Document Transcription Evaluation  ###########
+        elif domain == "transcripts":
+            detection_idx = 1
+            gt_detection_idx = metric.novel_id
+            # p_unknown column for transcripts in writer identification
+            novel_idx = 50
+        else:
+            raise AttributeError(
+                f'Domain: "{domain}" is not a real domain.  Get a clue.'
+            )
+
+        if vectorized_metrics:
+            results.update(
+                evaluate_program_metrics(
+                    metric,
+                    detections,
+                    classifications,
+                    gt,
+                    detection_idx,
+                    novel_idx,
+                    gt_detection_idx,
+                    gt_classification_idx,
+                    100,
+                    5,
+                )
+            )
+        else:
+            m_num = metric.m_num(detections[detection_idx], gt[gt_detection_idx])
+            results["m_num"] = m_num
+            m_num_stats = metric.m_num_stats(
+                detections[detection_idx], gt[gt_detection_idx]
+            )
+            results["m_num_stats"] = m_num_stats
+            m_ndp = metric.m_ndp(classifications[novel_idx], gt[gt_detection_idx])
+            results["m_ndp"] = m_ndp
+            m_ndp_pre = metric.m_ndp_pre(
+                classifications[novel_idx], gt[gt_detection_idx]
+            )
+            results["m_ndp_pre"] = m_ndp_pre
+            m_ndp_post = metric.m_ndp_post(
+                classifications[novel_idx], gt[gt_detection_idx]
+            )
+            results["m_ndp_post"] = m_ndp_post
+            m_acc = metric.m_acc(
+                gt[gt_detection_idx],
+                classifications,
+                gt[gt_classification_idx],
+                100,
+                5,
+            )
+            results["m_acc"] = m_acc
+            m_acc_failed = metric.m_ndp_failed_reaction(
+                detections[detection_idx],
+                gt[gt_detection_idx],
+                classifications,
+                gt[gt_classification_idx],
+            )
+            results["m_acc_failed"] = m_acc_failed
+            m_is_cdt_and_is_early = metric.m_is_cdt_and_is_early(
+                m_num_stats["GT_indx"],
+                m_num_stats["P_indx_0.5"],
+                gt.shape[0],
+            )
+            results["m_is_cdt_and_is_early"] = m_is_cdt_and_is_early
+        if baseline_session_id is not None:
+            if (protocol, domain) not in baseline_accuracy:
+                baseline_classifications = _read_results(
+                    result_dir,
+                    protocol,
+                    domain,
+                    baseline_session_id,
+                    test_id,
+                    "classification",
+                )
+                if vectorized_metrics:
+                    m_acc_baseline = evaluate_accuracy(
+                        baseline_classifications,
+                        gt,
+                        gt_detection_idx,
+                        gt_classification_idx,
+                        100,
+                        5,
+                    )
+                else:
+                    m_acc_baseline = metric.m_acc(
+                        gt[gt_detection_idx],
+                        baseline_classifications,
+                        gt[gt_classification_idx],
+                        100,
+                        5,
+                    )
+                log.info(
+                    f"Baseline performance for {test_id}: {ub.repr2(m_acc_baseline)}"
+                )
+                baseline_accuracy[(protocol, domain)] = m_acc_baseline
+            m_nrp = metric.m_nrp(
+                results["m_acc"], baseline_accuracy[(protocol, domain)]
+            )
+            results["m_nrp"] = m_nrp
+
+        log.info(f"Results for {test_id}: {ub.repr2(results)}")
+        session_results.append(results)
+    return session_results
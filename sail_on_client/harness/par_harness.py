@@ -6,11 +6,16 @@ import io
 import os
 import traceback
 import logging
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 
 from sail_on_client.harness.test_and_evaluation_harness import TestAndEvaluationHarness
-from typing import Any, Dict, Union, List
+from typing import Any, Callable, Dict, IO, Optional, Tuple, List
 from requests import Response
+from requests.adapters import HTTPAdapter
 from sail_on_client.errors import ApiError, RoundError
+from sail_on_client.harness.results import ResultType, open_result
+from sail_on_client.harness.round_dataset import RoundDataset
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -22,16 +27,65 @@ from json import JSONDecodeError
 log = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ParRequest:
+    """
+    Request for the PAR server along with the function handling the response.
+
+    The request only describes what is sent to the server, so the same
+    request is used by the harness with blocking requests and by the
+    harness with awaitable requests.
+    """
+
+    method: str
+    path: str
+    handle_response: Callable[[Any], Any] = field(repr=False)
+    params: Optional[Dict[str, Any]] = None
+    files: Dict[str, bytes] = field(default_factory=dict, repr=False)
+    result_files: Dict[str, ResultType] = field(default_factory=dict, repr=False)
+
+    def open_files(self, stack: ExitStack) -> Dict[str, IO]:
+        """
+        Open files uploaded with the request.
+
+        Args:
+            stack: Stack that closes the files once the request is sent
+
+        Returns:
+            Dictionary with a stream for every file, empty if the request has no files
+        """
+        files: Dict[str, IO] = {
+            name: io.BytesIO(content) for name, content in self.files.items()
+        }
+        for name, result in self.result_files.items():
+            files[name] = stack.enter_context(open_result(result))
+        return files
+
+
 class ParHarness(TestAndEvaluationHarness):
     """Harness for PAR server."""
 
-    def __init__(self, url: str, save_directory: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        save_directory: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        connect_timeout: float = 0.0,
+        read_timeout: float = 0.0,
+    ) -> None:
         """
         Initialize a client connection object.
 
         Args:
             url: URL for the server
             save_directory: A directory to save files
+            pool_connections: Number of connection pools cached by the session
+            pool_maxsize: Maximum number of connections saved in a pool
+            keep_alive: Flag to reuse connections across requests
+            connect_timeout: Seconds to wait for connecting to the server, no timeout if not positive
+            read_timeout: Seconds to wait for a response from the server, no timeout if not positive
 
         Returns:
             None
@@ -39,10 +93,298 @@ class ParHarness(TestAndEvaluationHarness):
         TestAndEvaluationHarness.__init__(self)
         self.url = url
         self.save_directory = save_directory
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = self._create_session()
 
     def get_config(self) -> Dict:
         """JSON Compliant representation of the object."""
-        return {"url": self.url, "save_directory": self.save_directory}
+        return {
+            "url": self.url,
+            "save_directory": self.save_directory,
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "keep_alive": self.keep_alive,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+        }
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a session with pooled connections for the server.
+
+        Returns:
+            A session shared by all the requests of the harness
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Get connect and read timeout used for the requests.
+
+        Returns:
+            Tuple with connect and read timeout
+        """
+        return (
+            self.connect_timeout if self.connect_timeout > 0 else None,
+            self.read_timeout if self.read_timeout > 0 else None,
+        )
+
+    def close(self) -> None:
+        """
+        Close connections to the server.
+
+        Returns:
+            None
+        """
+        self.session.close()
+
+    def _send(self, request: ParRequest) -> Any:
+        """
+        Send a request to the server and handle the response.
+
+        Args:
+            request: Request for the server
+
+        Returns:
+            Value returned by the response handler of the request
+        """
+        with ExitStack() as stack:
+            files = request.open_files(stack)
+            response = self.session.request(
+                request.method,
+                f"{self.url}{request.path}",
+                params=request.params,
+                files=files or None,  # type: ignore
+                timeout=self._timeout(),
+            )
+        return request.handle_response(response)
+
+    def _save_response(self, response: Response, filename: str) -> str:
+        """
+        Check the response and save the contents in the save directory.
+
+        Args:
+            response: The response object obtained from the server
+            filename: Name of the file in the save directory
+
+        Returns:
+            Absolute path to the file
+        """
+        self._check_response(response)
+        path = os.path.abspath(os.path.join(self.save_directory, filename))
+        with open(path, "wb") as f:
+            f.write(response.content)
+        return path
+
+    def _json_response(self, response: Response) -> Any:
+        """
+        Check the response and parse the contents as json.
+
+        Args:
+            response: The response object obtained from the server
+
+        Returns:
+            Parsed contents of the response
+        """
+        self._check_response(response)
+        return json.loads(response.content)
+
+    def _test_ids_request(
+        self,
+        protocol: str,
+        domain: str,
+        detector_seed: str,
+        test_assumptions: str,
+    ) -> ParRequest:
+        """Private function to create the request for test_ids_request."""
+        payload = {
+            "protocol": protocol,
+            "domain": domain,
+            "detector_seed": detector_seed,
+        }
+
+        with open(test_assumptions, "rb") as f:
+            contents = f.read()
+
+        filename = f"{protocol}.{domain}.{detector_seed}.csv"
+        return ParRequest(
+            "GET",
+            "/test/ids",
+            lambda response: self._save_response(response, filename),
+            files={
+                "test_requirements": json.dumps(payload).encode("utf-8"),
+                "test_assumptions": contents,
+            },
+        )
+
+    def _session_request(
+        self,
+        test_ids: list,
+        protocol: str,
+        domain: str,
+        novelty_detector_version: str,
+        hints: list,
+        detection_threshold: float,
+    ) -> ParRequest:
+        """Private function to create the request for session_request."""
+        payload = {
+            "protocol": protocol,
+            "novelty_detector_version": novelty_detector_version,
+            "domain": domain,
+            "hints": hints,
+            "detection_threshold": detection_threshold,
+        }
+
+        ids = "\n".join(test_ids) + "\n"
+
+        return ParRequest(
+            "POST",
+            "/session",
+            lambda response: self._json_response(response)["session_id"],
+            files={
+                "test_ids": ids.encode("utf-8"),
+                "configuration": json.dumps(payload).encode("utf-8"),
+            },
+        )
+
+    def _resume_session_request(self, session_id: str) -> ParRequest:
+        """Private function to create the request for resume_session."""
+        return ParRequest(
+            "GET",
+            "/session/latest",
+            lambda response: self._json_response(response)["finished_tests"],
+            params={"session_id": session_id},
+        )
+
+    def _round_dataset_request(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> ParRequest:
+        """Private function to create the request for round_dataset_request."""
+
+        def handle_response(response: Response) -> RoundDataset:
+            if response.status_code == 204:
+                raise RoundError(
+                    "End of Dataset", "The entire dataset has been requested"
+                )
+            filename = self._save_response(
+                response, f"{session_id}.{test_id}.{round_id}.csv"
+            )
+            return RoundDataset.from_bytes(filename, response.content)
+
+        return ParRequest(
+            "GET",
+            "/session/dataset",
+            handle_response,
+            params={
+                "session_id": session_id,
+                "test_id": test_id,
+                "round_id": round_id,
+            },
+        )
+
+    def _feedback_request(
+        self,
+        feedback_ids: list,
+        feedback_type: str,
+        test_id: str,
+        round_id: int,
+        session_id: str,
+    ) -> ParRequest:
+        """Private function to create the request for get_feedback_request."""
+        filename = f"{session_id}.{test_id}.{round_id}_{feedback_type}.csv"
+        return ParRequest(
+            "GET",
+            "/session/feedback",
+            lambda response: self._save_response(response, filename),
+            params={
+                "feedback_ids": "|".join(feedback_ids),
+                "session_id": session_id,
+                "test_id": test_id,
+                "feedback_type": feedback_type,
+            },
+        )
+
+    def _post_results_request(
+        self,
+        result_files: Dict[str, ResultType],
+        test_id: str,
+        round_id: int,
+        session_id: str,
+    ) -> ParRequest:
+        """Private function to create the request for post_results."""
+        payload = {
+            "session_id": session_id,
+            "test_id": test_id,
+            "round_id": round_id,
+            "result_types": "|".join(result_files.keys()),
+        }
+
+        if len(result_files.keys()) == 0:
+            raise Exception("Must provide at least one result file")
+
+        return ParRequest(
+            "POST",
+            "/session/results",
+            self._check_response,
+            files={"test_identification": json.dumps(payload).encode("utf-8")},
+            result_files={
+                f"{r_type}_file": result for r_type, result in result_files.items()
+            },
+        )
+
+    def _evaluate_request(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> ParRequest:
+        """Private function to create the request for evaluate."""
+        return ParRequest(
+            "GET",
+            "/session/evaluations",
+            self._json_response,
+            params={
+                "session_id": session_id,
+                "test_id": test_id,
+                "round_id": round_id,
+            },
+        )
+
+    def _test_metadata_request(self, session_id: str, test_id: str) -> ParRequest:
+        """Private function to create the request for get_test_metadata."""
+        return ParRequest(
+            "GET",
+            "/test/metadata",
+            self._json_response,
+            params={"test_id": test_id, "session_id": session_id},
+        )
+
+    def _complete_test_request(self, session_id: str, test_id: str) -> ParRequest:
+        """Private function to create the request for complete_test."""
+        return ParRequest(
+            "DELETE",
+            "/test",
+            lambda response: None,
+            params={"test_id": test_id, "session_id": session_id},
+        )
+
+    def _terminate_session_request(self, session_id: str) -> ParRequest:
+        """Private function to create the request for terminate_session."""
+        return ParRequest(
+            "DELETE",
+            "/session",
+            self._check_response,
+            params={"session_id": session_id},
+        )
 
     def _check_response(self, response: Response) -> None:
         """
@@ -94,35 +436,10 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             Filename of file containing test ids
         """
-        payload = {
-            "protocol": protocol,
-            "domain": domain,
-            "detector_seed": detector_seed,
-        }
-
-        with open(test_assumptions, "r") as f:
-            contents = f.read()
-
-        response = requests.get(
-            f"{self.url}/test/ids",
-            files={  # type: ignore
-                "test_requirements": io.StringIO(json.dumps(payload)),
-                "test_assumptions": io.StringIO(contents),
-            },
+        return self._send(
+            self._test_ids_request(protocol, domain, detector_seed, test_assumptions)
         )
 
-        self._check_response(response)
-
-        filename = os.path.abspath(
-            os.path.join(
-                self.save_directory, f"{protocol}.{domain}.{detector_seed}.csv"
-            )
-        )
-        with open(filename, "w") as f:
-            f.write(response.content.decode("utf-8"))
-
-        return filename
-
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_fixed(2),
@@ -152,24 +469,17 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             A session identifier provided by the server
         """
-        payload = {
-            "protocol": protocol,
-            "novelty_detector_version": novelty_detector_version,
-            "domain": domain,
-            "hints": hints,
-            "detection_threshold": detection_threshold,
-        }
-
-        ids = "\n".join(test_ids) + "\n"
-
-        response = requests.post(
-            f"{self.url}/session",
-            files={"test_ids": ids, "configuration": io.StringIO(json.dumps(payload))},  # type: ignore
+        return self._send(
+            self._session_request(
+                test_ids,
+                protocol,
+                domain,
+                novelty_detector_version,
+                hints,
+                detection_threshold,
+            )
         )
 
-        self._check_response(response)
-        return response.json()["session_id"]
-
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_fixed(2),
@@ -186,10 +496,21 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             List of tests finished in the session
         """
-        params: Dict[str, str] = {"session_id": session_id}
-        response = requests.get(f"{self.url}/session/latest", params=params)
-        self._check_response(response)
-        return response.json()["finished_tests"]
+        return self._send(self._resume_session_request(session_id))
+
+    def dataset_request(self, test_id: str, round_id: int, session_id: str) -> str:
+        """
+        Request data for evaluation.
+
+        Args:
+            test_id: The test being evaluated at this moment.
+            round_id: The sequential number of the round being evaluated
+            session_id: The identifier provided by the server for a single experiment
+
+        Returns:
+            Filename of a file containing a list of image files (including full path for each)
+        """
+        return self.round_dataset_request(test_id, round_id, session_id).path
 
     @retry(
         stop=stop_after_attempt(5),
@@ -197,9 +518,11 @@ class ParHarness(TestAndEvaluationHarness):
         reraise=True,
         before_sleep=before_sleep_log(log, logging.INFO),
     )
-    def dataset_request(self, test_id: str, round_id: int, session_id: str) -> str:
+    def round_dataset_request(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> RoundDataset:
         """
-        Request data for evaluation.
+        Request data for evaluation along with the instance ids in the round.
 
         Args:
             test_id: The test being evaluated at this moment.
@@ -207,27 +530,9 @@ class ParHarness(TestAndEvaluationHarness):
             session_id: The identifier provided by the server for a single experiment
 
         Returns:
-            Filename of a file containing a list of image files (including full path for each)
+            Dataset with the path to the dataset file and instance ids for the round
         """
-        params: Dict[str, Union[str, int]] = {
-            "session_id": session_id,
-            "test_id": test_id,
-            "round_id": round_id,
-        }
-        response = requests.get(
-            f"{self.url}/session/dataset",
-            params=params,
-        )
-        if response.status_code == 204:
-            raise RoundError("End of Dataset", "The entire dataset has been requested")
-        self._check_response(response)
-
-        filename = os.path.abspath(
-            os.path.join(self.save_directory, f"{session_id}.{test_id}.{round_id}.csv")
-        )
-        with open(filename, "wb") as f:
-            f.write(response.content)
-        return filename
+        return self._send(self._round_dataset_request(test_id, round_id, session_id))
 
     @retry(
         stop=stop_after_attempt(5),
@@ -256,27 +561,11 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             Path to a file containing containing requested feedback
         """
-        params: Dict[str, Union[str, int]] = {
-            "feedback_ids": "|".join(feedback_ids),
-            "session_id": session_id,
-            "test_id": test_id,
-            "feedback_type": feedback_type,
-        }
-        response = requests.get(
-            f"{self.url}/session/feedback",
-            params=params,
-        )
-        self._check_response(response)
-        filename = os.path.abspath(
-            os.path.join(
-                self.save_directory,
-                f"{session_id}.{test_id}.{round_id}_{feedback_type}.csv",
+        return self._send(
+            self._feedback_request(
+                feedback_ids, feedback_type, test_id, round_id, session_id
             )
         )
-        with open(filename, "wb") as f:
-            f.write(response.content)
-
-        return filename
 
     @retry(
         stop=stop_after_attempt(5),
@@ -285,13 +574,18 @@ class ParHarness(TestAndEvaluationHarness):
         before_sleep=before_sleep_log(log, logging.INFO),
     )
     def post_results(
-        self, result_files: Dict[str, str], test_id: str, round_id: int, session_id: str
+        self,
+        result_files: Dict[str, ResultType],
+        test_id: str,
+        round_id: int,
+        session_id: str,
     ) -> None:
         """
         Post client detector predictions for the dataset.
 
         Args:
-            result_files: A dictionary of results with protocol constant as key and file path as value
+            result_files: A dictionary of results with protocol constant as key and
+                          file path or contents of the file as value
             test_id: The id of the test currently being evaluated
             round_id: The sequential number of the round being evaluated
             session_id: The id provided by a server denoting a session
@@ -299,26 +593,9 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             None
         """
-        payload = {
-            "session_id": session_id,
-            "test_id": test_id,
-            "round_id": round_id,
-            "result_types": "|".join(result_files.keys()),
-        }
-
-        files = {"test_identification": io.StringIO(json.dumps(payload))}
-
-        if len(result_files.keys()) == 0:
-            raise Exception("Must provide at least one result file")
-
-        for r_type in result_files:
-            with open(result_files[r_type], "r") as f:
-                contents = f.read()
-                files[f"{r_type}_file"] = io.StringIO(contents)
-
-        response = requests.post(f"{self.url}/session/results", files=files)  # type: ignore
-
-        self._check_response(response)
+        self._send(
+            self._post_results_request(result_files, test_id, round_id, session_id)
+        )
 
     @retry(
         stop=stop_after_attempt(5),
@@ -369,18 +646,7 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             Path to a file with the results
         """
-        params: Dict[str, Union[str, int]] = {
-            "session_id": session_id,
-            "test_id": test_id,
-            "round_id": round_id,
-        }
-        response = requests.get(
-            f"{self.url}/session/evaluations",
-            params=params,
-        )
-
-        self._check_response(response)
-        return json.loads(response.text)
+        return self._send(self._evaluate_request(test_id, round_id, session_id))
 
     @retry(
         stop=stop_after_attempt(5),
@@ -399,13 +665,7 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             A dictionary containing metadata
         """
-        response = requests.get(
-            f"{self.url}/test/metadata",
-            params={"test_id": test_id, "session_id": session_id},
-        )
-
-        self._check_response(response)
-        return response.json()
+        return self._send(self._test_metadata_request(session_id, test_id))
 
     @retry(
         stop=stop_after_attempt(5),
@@ -424,10 +684,7 @@ class ParHarness(TestAndEvaluationHarness):
         Returns:
             None
         """
-        requests.delete(
-            f"{self.url}/test",
-            params={"test_id": test_id, "session_id": session_id},
-        )
+        self._send(self._complete_test_request(session_id, test_id))
 
     @retry(
         stop=stop_after_attempt(5),
@@ -444,8 +701,4 @@ class ParHarness(TestAndEvaluationHarness):
 
         Returns: None
         """
-        response = requests.delete(
-            f"{self.url}/session", params={"session_id": session_id}
-        )
-
-        self._check_response(response)
+        self._send(self._terminate_session_request(session_id))
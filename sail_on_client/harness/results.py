@@ -0,0 +1,92 @@
+"""Results posted by the protocols to the harness."""
+
+import io
+from typing import BinaryIO, List, Union
+
+import numpy as np
+
+# Path to a csv file or the contents of the csv file in memory
+ResultType = Union[str, bytes, io.StringIO, io.BytesIO]
+# Results provided by agents, arrays have a row for every instance in a round
+AgentResultType = Union[ResultType, np.ndarray]
+
+
+def is_result_file(result: ResultType) -> bool:
+    """
+    Check if a result is stored in a file.
+
+    Args:
+        result: Path to a csv file or the contents of the csv file
+
+    Returns:
+        True if the result is a path to a file
+    """
+    return isinstance(result, str)
+
+
+def read_result(result: ResultType) -> str:
+    """
+    Get the contents of a result.
+
+    Args:
+        result: Path to a csv file or the contents of the csv file
+
+    Returns:
+        Contents of the csv file
+    """
+    if isinstance(result, str):
+        with open(result, "r") as f:
+            return f.read()
+    if isinstance(result, io.StringIO):
+        return result.getvalue()
+    if isinstance(result, io.BytesIO):
+        return result.getvalue().decode("utf-8")
+    if isinstance(result, bytes):
+        return result.decode("utf-8")
+    raise TypeError(f"Unsupported result type {type(result).__name__}")
+
+
+def open_result(result: ResultType) -> BinaryIO:
+    """
+    Open a result for uploading it to the server.
+
+    Args:
+        result: Path to a csv file or the contents of the csv file
+
+    Returns:
+        A binary stream with the contents of the csv file, the caller closes the stream
+    """
+    if isinstance(result, str):
+        return open(result, "rb")
+    if isinstance(result, io.BytesIO):
+        return io.BytesIO(result.getbuffer())
+    if isinstance(result, bytes):
+        return io.BytesIO(result)
+    return io.BytesIO(read_result(result).encode("utf-8"))
+
+
+def array_to_result(instance_ids: List[str], values: np.ndarray) -> io.StringIO:
+    """
+    Convert an array of results for a round to the contents of a csv file.
+
+    Args:
+        instance_ids: Identifiers associated with data for a round
+        values: Array with a row of values for every instance
+
+    Returns:
+        Contents of the csv file with the instance id followed by the values in every row
+    """
+    import pandas as pd
+
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    if values.ndim != 2 or values.shape[0] != len(instance_ids):
+        raise ValueError(
+            f"Expected an array with {len(instance_ids)} rows, got {values.shape}"
+        )
+    result_df = pd.DataFrame(values)
+    result_df.insert(0, "id", instance_ids)
+    result = io.StringIO()
+    result_df.to_csv(result, index=False, header=False)
+    return result
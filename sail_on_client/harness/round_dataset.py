@@ -0,0 +1,57 @@
+"""Dataset provided by the harness for a round."""
+
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass(frozen=True)
+class RoundDataset:
+    """
+    Instances used in a round along with the file that lists them.
+
+    The file is still written for agents that read the dataset from the
+    disk, but the protocol and agents use the parsed instance ids instead
+    of reading the file again.
+    """
+
+    path: str
+    instance_ids: List[str] = field(repr=False)
+
+    @classmethod
+    def from_bytes(cls, path: str, content: bytes) -> "RoundDataset":
+        """
+        Create dataset from the contents of the dataset file.
+
+        Args:
+            path: Path to the file with the dataset for the round
+            content: Contents of the file with an instance id on every line
+
+        Returns:
+            An instance of RoundDataset
+        """
+        instance_ids = [
+            instance_id.strip() for instance_id in content.decode("utf-8").splitlines()
+        ]
+        return cls(path, instance_ids)
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoundDataset":
+        """
+        Create dataset by reading the dataset file.
+
+        Args:
+            path: Path to the file with the dataset for the round
+
+        Returns:
+            An instance of RoundDataset
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(path, f.read())
+
+    def __fspath__(self) -> str:
+        """Use the dataset in place of the path to the dataset file."""
+        return self.path
+
+    def __len__(self) -> int:
+        """Get number of instances in the round."""
+        return len(self.instance_ids)
@@ -0,0 +1,395 @@
+"""Append-only journal for session logs used by the file provider."""
+
+import contextlib
+import copy
+import datetime
+import glob
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+# Number of records appended to a journal before it is compacted
+COMPACT_EVERY = 128
+
+
+def _now() -> str:
+    return str(datetime.datetime.now())
+
+
+def _write_json(structure: Dict[str, Any], filepath: str) -> None:
+    with open(filepath, "w") as session_file:
+        json.dump(structure, session_file, indent=2)
+
+
+def _apply_log(
+    session: Dict[str, Any], tests: Dict[str, Dict[str, Any]], record: Dict[str, Any]
+) -> None:
+    """Apply a log record in the same way log_session updates the json files."""
+    activity = record["activity"]
+    test_id = record.get("test_id")
+    round_id = record.get("round_id")
+    content = record.get("content")
+    content_loc = record.get("content_loc", "round")
+    time = record["time"]
+    if test_id is None:
+        session[activity] = {"time": [time]}
+        if content is not None:
+            session[activity].update(content)
+        return
+    test_structure = tests.setdefault(test_id, {})
+    if activity not in test_structure:
+        test_structure[activity] = {"time": [time]}
+    if content_loc == "activity":
+        if content is not None:
+            test_structure[activity].update(content)
+    if round_id is not None:
+        round_id_str = str(round_id)
+        rounds = test_structure[activity].get("rounds", {})
+        if round_id_str not in rounds:
+            rounds[round_id_str] = {"time": [time]}
+        else:
+            rounds[round_id_str]["time"].append(time)
+        if content_loc == "round":
+            if content is not None:
+                rounds[round_id_str].update(content)
+        test_structure[activity]["rounds"] = rounds
+        test_structure[activity]["last round"] = round_id_str
+    if activity == "completion":
+        session_tests = session.get("tests", {"completed_tests": []})
+        session_tests["completed_tests"].append(test_id)
+        session["tests"] = session_tests
+
+
+class SessionJournal:
+    """
+    Journal of all activity in a session with an in-memory view.
+
+    Every change to the session is appended as a json line to
+    `{session_id}.jsonl`. The session and test dictionaries are materialized
+    in memory and refreshed by reading records appended by other processes.
+    The journal is periodically compacted into a single snapshot record and
+    the legacy `{session_id}.json` and `{session_id}.{test_id}.json` files are
+    written at the same time.
+    """
+
+    def __init__(
+        self, folder: str, session_id: str, compact_every: int = COMPACT_EVERY
+    ) -> None:
+        """
+        Initialize the journal.
+
+        Args:
+            folder: Folder where the session files are saved
+            session_id: Session id associated with the journal
+            compact_every: Number of records appended before compacting the journal
+
+        Returns:
+            None
+        """
+        self.folder = folder
+        self.session_id = session_id
+        self.compact_every = compact_every
+        self.path = os.path.join(folder, f"{session_id}.jsonl")
+        self.lock_path = f"{self.path}.lock"
+        self.session: Dict[str, Any] = {}
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self._records = 0
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._legacy_signature: Optional[Tuple[int, int]] = None
+        self._dirty_session = False
+        self._dirty_tests: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def session_info(self) -> Dict[str, Any]:
+        """Get a copy of the session information."""
+        with self._lock:
+            self.refresh()
+            return copy.deepcopy(self.session)
+
+    def test_info(self, test_id: str) -> Dict[str, Any]:
+        """Get a copy of the session information associated with a test."""
+        with self._lock:
+            self.refresh()
+            return copy.deepcopy(self.tests.get(test_id, {}))
+
+    def is_terminated(self) -> bool:
+        """Check if the session was terminated without copying the session."""
+        with self._lock:
+            self.refresh()
+            return "termination" in self.session
+
+    def is_test_completed(self, test_id: str) -> bool:
+        """Check if a test was completed without copying the test information."""
+        with self._lock:
+            self.refresh()
+            return "completion" in self.tests.get(test_id, {})
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator["SessionJournal"]:
+        """
+        Lock the journal across threads and processes and refresh the view.
+
+        Returns:
+            Iterator with the journal
+        """
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self.refresh()
+                    yield self
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def log(
+        self,
+        activity: str,
+        test_id: Optional[str] = None,
+        round_id: Optional[int] = None,
+        content: Optional[Dict[str, Any]] = None,
+        content_loc: Optional[str] = "round",
+    ) -> None:
+        """
+        Append an activity to the journal.
+
+        Args:
+            activity: Name of the activity
+            test_id: Test id associated with the log
+            round_id: Round id associated with the log
+            content: Content of the log
+            content_loc: Location where the content should be added
+
+        Returns:
+            None
+        """
+        self.append(
+            {
+                "op": "log",
+                "activity": activity,
+                "test_id": test_id,
+                "round_id": round_id,
+                "content": content,
+                "content_loc": content_loc,
+                "time": _now(),
+            }
+        )
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Append a record to the journal and apply it to the view.
+
+        Should be called within a transaction.
+
+        Args:
+            record: Record added to the journal
+
+        Returns:
+            None
+        """
+        lines = []
+        if self._offset == 0 and (self.session or self.tests):
+            # View was restored from legacy files so the journal starts with it
+            lines.append(json.dumps(self._snapshot()))
+        lines.append(json.dumps(record))
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        with open(self.path, "ab") as journal_file:
+            journal_file.write(data)
+            self._inode = os.fstat(journal_file.fileno()).st_ino
+        self._offset += len(data)
+        self._records += 1
+        self._apply(record)
+        if self._records >= self.compact_every or record.get("activity") in [
+            "completion",
+            "termination",
+        ]:
+            self.compact()
+
+    def refresh(self) -> None:
+        """Update the view with records appended since the last refresh."""
+        try:
+            journal_file = open(self.path, "rb")
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._reset()
+            self._load_legacy()
+            return
+        with journal_file:
+            stat = os.fstat(journal_file.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # Journal was compacted or replaced by another process
+                self._reset()
+                self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return
+            journal_file.seek(self._offset)
+            data = journal_file.read()
+        # Ignore a partially written record at the end of the file
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self._records += 1
+        self._offset += end
+
+    def compact(self) -> None:
+        """
+        Write legacy session files and replace the journal with a snapshot.
+
+        Should be called within a transaction.
+        """
+        for test_id in self._dirty_tests:
+            test_path = os.path.join(
+                self.folder, f"{str(self.session_id)}.{str(test_id)}.json"
+            )
+            if test_id in self.tests:
+                _write_json(self.tests[test_id], test_path)
+            elif os.path.exists(test_path):
+                os.remove(test_path)
+        if self._dirty_session:
+            _write_json(
+                self.session,
+                os.path.join(self.folder, f"{str(self.session_id)}.json"),
+            )
+        self._dirty_tests = set()
+        self._dirty_session = False
+        data = (json.dumps(self._snapshot()) + "\n").encode("utf-8")
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as journal_file:
+            journal_file.write(data)
+        os.replace(tmp_path, self.path)
+        self._inode = os.stat(self.path).st_ino
+        self._offset = len(data)
+        self._records = 1
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {"op": "snapshot", "session": self.session, "tests": self.tests}
+
+    def _reset(self) -> None:
+        self.session = {}
+        self.tests = {}
+        self._records = 0
+        self._offset = 0
+        self._inode = None
+        self._legacy_signature = None
+
+    def _load_legacy(self) -> None:
+        session_path = os.path.join(self.folder, f"{str(self.session_id)}.json")
+        try:
+            stat = os.stat(session_path)
+        except FileNotFoundError:
+            if self._legacy_signature is not None:
+                self._reset()
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._legacy_signature:
+            return
+        with open(session_path, "r") as session_file:
+            self.session = json.load(session_file)
+        self.tests = {}
+        for test_path in glob.glob(
+            os.path.join(glob.escape(self.folder), f"{str(self.session_id)}.*.json")
+        ):
+            test_id = os.path.basename(test_path)[len(f"{self.session_id}.") : -5]
+            with open(test_path, "r") as test_file:
+                self.tests[test_id] = json.load(test_file)
+        self._legacy_signature = signature
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        op = record["op"]
+        test_id = record.get("test_id")
+        if op == "snapshot":
+            self.session = record["session"]
+            self.tests = record["tests"]
+            return
+        if op == "log":
+            _apply_log(self.session, self.tests, record)
+        elif op == "result_types":
+            rounds = self.tests[test_id]["post_results"]["rounds"]
+            round_structure = rounds[str(record["round_id"])]
+            round_structure["types"] = round_structure.get("types", []) + list(
+                record["types"]
+            )
+        elif op == "update_session":
+            self.session[record["key"]] = record["value"]
+        elif op == "reset_test":
+            self.tests.pop(test_id, None)
+        else:
+            raise ValueError(f"Unknown session journal operation {op}")
+        if test_id is not None:
+            self._dirty_tests.add(test_id)
+        if test_id is None or record.get("activity") == "completion":
+            self._dirty_session = True
+
+
+_journals: Dict[Tuple[str, str], SessionJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_session_journal(folder: str, session_id: str) -> SessionJournal:
+    """
+    Get the journal associated with a session.
+
+    Args:
+        folder: Folder where the session files are saved
+        session_id: Session id associated with the journal
+
+    Returns:
+        An instance of SessionJournal
+    """
+    key = (os.path.abspath(folder), str(session_id))
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = SessionJournal(key[0], key[1])
+        return _journals[key]
+
+
+def release_session_journal(folder: str, session_id: str) -> None:
+    """
+    Release the journal associated with a terminated session.
+
+    The journal is removed from the journals kept by the process. The
+    journal and its lock file are kept, so the session can still be read
+    after it is released and processes that hold the lock are not affected.
+
+    Args:
+        folder: Folder where the session files are saved
+        session_id: Session id associated with the journal
+
+    Returns:
+        None
+    """
+    key = (os.path.abspath(folder), str(session_id))
+    with _journals_lock:
+        _journals.pop(key, None)
+
+
+def result_types_record(
+    test_id: str, round_id: int, types: List[str]
+) -> Dict[str, Any]:
+    """
+    Create a record for result types posted in a round.
+
+    Args:
+        test_id: Test id associated with the results
+        round_id: Round id associated with the results
+        types: Types of results posted
+
+    Returns:
+        Record that can be appended to a journal
+    """
+    return {
+        "op": "result_types",
+        "test_id": test_id,
+        "round_id": round_id,
+        "types": types,
+    }
@@ -2,7 +2,11 @@
 
 from smqtk_core import Configurable, Pluggable
 from abc import abstractmethod
-from typing import List, Dict, Any, TypeVar
+from types import TracebackType
+from typing import List, Dict, Any, Optional, Tuple, Type, TypeVar
+
+from sail_on_client.harness.results import ResultType
+from sail_on_client.harness.round_dataset import RoundDataset
 
 TestAndEvaluationHarnessType = TypeVar(
     "TestAndEvaluationHarnessType", bound="TestAndEvaluationHarness"
@@ -12,6 +16,9 @@ TestAndEvaluationHarnessType = TypeVar(
 class TestAndEvaluationHarness(Configurable, Pluggable):
     """Abstract interface for test and evaluation harness."""
 
+    # Flag set by harnesses that can be used by multiple threads at once
+    thread_safe = False
+
     @classmethod
     def is_usable(cls) -> bool:
         """Determine if this class with be detected by SMQTK's plugin."""
@@ -21,6 +28,31 @@ class TestAndEvaluationHarness(Configurable, Pluggable):
         """Return a default configuration dictionary."""
         return {}
 
+    def __enter__(self) -> "TestAndEvaluationHarness":
+        """Use the harness for a run of a protocol."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Release resources held by the harness."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release resources held by the harness, e.g. connections to the server.
+
+        The harness can still be used after it is closed, resources are
+        acquired again by the next request.
+
+        Returns:
+            None
+        """
+        pass
+
     @abstractmethod
     def test_ids_request(
         self,
@@ -97,6 +129,24 @@ class TestAndEvaluationHarness(Configurable, Pluggable):
         """
         pass
 
+    def round_dataset_request(
+        self, test_id: str, round_id: int, session_id: str
+    ) -> RoundDataset:
+        """
+        Request data for evaluation along with the instance ids in the round.
+
+        Args:
+            test_id: The test being evaluated at this moment.
+            round_id: The sequential number of the round being evaluated
+            session_id: The identifier provided by the server for a single experiment
+
+        Returns:
+            Dataset with the path to the dataset file and instance ids for the round
+        """
+        return RoundDataset.from_file(
+            self.dataset_request(test_id, round_id, session_id)
+        )
+
     @abstractmethod
     def get_feedback_request(
         self,
@@ -123,13 +173,18 @@ class TestAndEvaluationHarness(Configurable, Pluggable):
 
     @abstractmethod
     def post_results(
-        self, result_files: Dict[str, str], test_id: str, round_id: int, session_id: str
+        self,
+        result_files: Dict[str, ResultType],
+        test_id: str,
+        round_id: int,
+        session_id: str,
     ) -> None:
         """
         Post client detector predictions for the dataset.
 
         Args:
-            result_files: A dictionary of results with protocol constant as key and file path as value
+            result_files: A dictionary of results with protocol constant as key and
+                          file path or contents of the file as value
             test_id: The id of the test currently being evaluated
             round_id: The sequential number of the round being evaluated
             session_id: The id provided by a server denoting a session
@@ -180,6 +235,28 @@ class TestAndEvaluationHarness(Configurable, Pluggable):
         """
         pass
 
+    def evaluate_batch(
+        self,
+        session_test_ids: List[Tuple[str, str]],
+        round_id: int,
+        baseline_session_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Get results for multiple tests across sessions.
+
+        Args:
+            session_test_ids: List of session id and test id pairs being evaluated
+            round_id: The sequential number of the round being evaluated
+            baseline_session_id: The id of the session with baseline results
+
+        Returns:
+            List of results in the same order as session_test_ids
+        """
+        return [
+            self.evaluate(test_id, round_id, session_id, baseline_session_id)
+            for session_id, test_id in session_test_ids
+        ]
+
     @abstractmethod
     def get_test_metadata(self, session_id: str, test_id: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,240 @@
+"""Levenshtein feedback for document transcription."""
+
+import functools
+import re
+import threading
+import weakref
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sail_on_client.harness.ground_truth_store import (
+    GroundTruthStore,
+    GroundTruthTable,
+    ground_truth_store,
+)
+
+_TOKEN_SPLIT = re.compile(r"(\W+)")
+_REMOVED_CHARS = str.maketrans("", "", ';"|')
+
+
+@functools.lru_cache(maxsize=None)
+def _levenshtein() -> Optional[Any]:
+    """
+    Private function to import the Levenshtein distance from rapidfuzz on first use.
+
+    Returns:
+        The Levenshtein module from rapidfuzz, None if rapidfuzz is not installed
+    """
+    try:
+        from rapidfuzz.distance import Levenshtein
+    except ImportError:
+        return None
+    return Levenshtein
+
+
+def normalize_transcript(transcript: str) -> str:
+    """
+    Normalize a transcript before computing the edit distance.
+
+    Quotes, semicolons and pipes are removed and every run of non word
+    characters is separated from the surrounding words by a single space.
+
+    Args:
+        transcript: Transcript from the ground truth or the results
+
+    Returns:
+        Normalized transcript
+    """
+    return " ".join(
+        token.strip()
+        for token in _TOKEN_SPLIT.split(
+            transcript.translate(_REMOVED_CHARS).replace("  ", " ")
+        )
+    )
+
+
+def _bit_parallel_distance(source: str, target: str) -> int:
+    """
+    Private function to compute the edit distance with Myers' bit-parallel algorithm.
+
+    The columns of the dynamic programming matrix are encoded in integers
+    with a bit for every character in the source, so the distance is
+    computed with a few integer operations per character in the target.
+
+    Args:
+        source: The shorter of the two strings
+        target: The longer of the two strings
+
+    Returns:
+        Levenshtein distance between the strings
+    """
+    num_chars = len(source)
+    if num_chars == 0:
+        return len(target)
+    match_masks: Dict[str, int] = {}
+    for idx, char in enumerate(source):
+        match_masks[char] = match_masks.get(char, 0) | (1 << idx)
+    mask = (1 << num_chars) - 1
+    last_bit = 1 << (num_chars - 1)
+    positive_vertical, negative_vertical = mask, 0
+    distance = num_chars
+    for char in target:
+        match = match_masks.get(char, 0)
+        vertical = match | negative_vertical
+        horizontal = (
+            ((match & positive_vertical) + positive_vertical) ^ positive_vertical
+        ) | match
+        positive_horizontal = negative_vertical | ~(horizontal | positive_vertical)
+        negative_horizontal = positive_vertical & horizontal
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+        positive_vertical = (
+            negative_horizontal | ~(vertical | positive_horizontal)
+        ) & mask
+        negative_vertical = positive_horizontal & vertical
+    return distance
+
+
+def edit_distance(source: str, target: str) -> int:
+    """
+    Compute the Levenshtein distance between two strings.
+
+    The result is identical to nltk.edit_distance with the default
+    substitution cost and without transpositions.
+
+    Args:
+        source: First string
+        target: Second string
+
+    Returns:
+        Levenshtein distance between the strings
+    """
+    levenshtein = _levenshtein()
+    if levenshtein is not None:
+        return levenshtein.distance(source, target)
+    # Common prefix and suffix do not change the distance
+    prefix = 0
+    max_prefix = min(len(source), len(target))
+    while prefix < max_prefix and source[prefix] == target[prefix]:
+        prefix += 1
+    source, target = source[prefix:], target[prefix:]
+    suffix = 0
+    max_suffix = min(len(source), len(target))
+    while suffix < max_suffix and source[-1 - suffix] == target[-1 - suffix]:
+        suffix += 1
+    if suffix > 0:
+        source, target = source[:-suffix], target[:-suffix]
+    if len(source) > len(target):
+        source, target = target, source
+    return _bit_parallel_distance(source, target)
+
+
+def edit_distances(pairs: Iterable[Tuple[str, str]]) -> List[int]:
+    """
+    Compute the Levenshtein distance for multiple pairs of strings.
+
+    Args:
+        pairs: Pairs of strings
+
+    Returns:
+        Levenshtein distance for every pair
+    """
+    return [edit_distance(source, target) for source, target in pairs]
+
+
+class TranscriptFeedback:
+    """
+    Levenshtein feedback with normalized ground truth cached for every test.
+
+    Transcripts in the ground truth are normalized the first time they are
+    used for feedback and reused by later rounds of the test. The normalized
+    transcripts are released with the parsed ground truth when it is evicted
+    from the ground truth store.
+    """
+
+    def __init__(self, store: GroundTruthStore = ground_truth_store) -> None:
+        """
+        Construct feedback for document transcription.
+
+        Args:
+            store: Store used for reading the ground truth
+
+        Returns:
+            None
+        """
+        self.store = store
+        self._normalized: "weakref.WeakKeyDictionary[GroundTruthTable, Dict[str, str]]"
+        self._normalized = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def normalized_ground_truth(
+        self, gt_file: str, transcripts: Iterable[str]
+    ) -> List[str]:
+        """
+        Get normalized transcripts from the ground truth.
+
+        Args:
+            gt_file: Path to ground truth file
+            transcripts: Transcripts read from the ground truth file
+
+        Returns:
+            Normalized transcripts
+        """
+        table = self.store.get(gt_file)
+        with self._lock:
+            normalized = self._normalized.setdefault(table, {})
+        transcripts_normalized = []
+        for transcript in transcripts:
+            if transcript not in normalized:
+                normalized[transcript] = normalize_transcript(transcript)
+            transcripts_normalized.append(normalized[transcript])
+        return transcripts_normalized
+
+    def levenshtein_feedback(
+        self,
+        gt_file: str,
+        ground_truth: Mapping[str, List[str]],
+        results: Mapping[str, List[str]],
+        columns: Sequence[int],
+    ) -> Dict[str, List[int]]:
+        """
+        Compute edit distance between the ground truth and the results.
+
+        Args:
+            gt_file: Path to ground truth file
+            ground_truth: Dictionary with rows of the ground truth for the feedback ids
+            results: Dictionary with rows of the results for the feedback ids
+            columns: Columns of the ground truth compared with the results
+
+        Returns:
+            Dictionary with a distance for every column with feedback ids as keys
+        """
+        instance_ids = list(results.keys())
+        gt_transcripts = self.normalized_ground_truth(
+            gt_file,
+            [
+                ground_truth[instance_id][column]
+                for instance_id in instance_ids
+                for column in columns
+            ],
+        )
+        num_columns = len(columns)
+        result_transcripts = [
+            normalize_transcript(results[instance_id][0])
+            for instance_id in instance_ids
+        ]
+        distances = edit_distances(
+            (gt_transcript, result_transcripts[idx // num_columns])
+            for idx, gt_transcript in enumerate(gt_transcripts)
+        )
+        return {
+            instance_id: distances[idx * num_columns : (idx + 1) * num_columns]
+            for idx, instance_id in enumerate(instance_ids)
+        }
+
+
+# Feedback shared by the file provider functions
+transcript_feedback = TranscriptFeedback()
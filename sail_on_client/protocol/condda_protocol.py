@@ -6,7 +6,9 @@ from sail_on_client.harness.test_and_evaluation_harness import (
 )
 from sail_on_client.protocol.visual_protocol import VisualProtocol
 from sail_on_client.protocol.condda_dataclasses import AlgorithmAttributes
+from sail_on_client.protocol.feature_provider import DEFAULT_FEATURE_CACHE_SIZE
 from sail_on_client.protocol.condda_test import CONDDATest
+from sail_on_client.protocol.condda_scheduler import CONDDATestScheduler
 
 import logging
 
@@ -42,6 +44,11 @@ class Condda(VisualProtocol):
         use_consolidated_features: bool = False,
         use_saved_attributes: bool = False,
         use_saved_features: bool = False,
+        executor: str = "serial",
+        num_workers: int = 1,
+        max_in_flight: int = 0,
+        feature_format: str = "pickle",
+        feature_cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
     ) -> None:
         """
         Initialize CONDDA protocol object.
@@ -69,6 +76,11 @@ class Condda(VisualProtocol):
             use_consolidated_features: Flag to use consolidated features
             use_saved_attributes: Flag to use saved attributes
             use_saved_features: Flag to use saved features
+            executor: Run tests with a serial, thread or process executor
+            num_workers: Number of workers used by thread or process executor
+            max_in_flight: Maximum number of tests submitted to the workers at once
+            feature_format: Format used for saving features, one of pickle or mmap
+            feature_cache_size: Number of instances whose saved features are cached
 
         Returns:
             None
@@ -106,6 +118,11 @@ class Condda(VisualProtocol):
         self.use_consolidated_features = use_consolidated_features
         self.use_saved_attributes = use_saved_attributes
         self.use_saved_features = use_saved_features
+        self.executor = executor
+        self.num_workers = num_workers
+        self.max_in_flight = max_in_flight
+        self.feature_format = feature_format
+        self.feature_cache_size = feature_cache_size
 
     def create_algorithm_attributes(
         self, algorithm_name: str, algorithm_param: Dict, test_ids: List[str]
@@ -205,7 +222,20 @@ class Condda(VisualProtocol):
 
     def run_protocol(self, config: Dict) -> None:
         """
-        Run protocol.
+        Run the protocol and close the harness once the run ends.
+
+        Args:
+            config: Parameters provided in the config
+
+        Returns:
+            None
+        """
+        with self.harness:
+            self._run_protocol(config)
+
+    def _run_protocol(self, config: Dict) -> None:
+        """
+        Private function to run the protocol.
 
         Args:
             config: Parameters provided in the config
@@ -239,12 +269,32 @@ class Condda(VisualProtocol):
             )
 
         # Run tests for all the algorithms
+        if self.executor != "serial":
+            scheduler = CONDDATestScheduler(
+                self.harness, self.executor, self.num_workers, self.max_in_flight
+            )
         for algorithm_attributes in algorithms_attributes:
             algorithm_name = algorithm_attributes.name
             session_id = algorithm_attributes.session_id
             test_ids = algorithm_attributes.test_ids
             log.info(f"Starting session: {session_id} for algorithm: {algorithm_name}")
             skip_stages = self.skip_stages.copy()
+            if self.executor != "serial":
+                test_params = {
+                    "data_root": self.dataset_root,
+                    "domain": self.domain,
+                    "feature_dir": "",
+                    "save_dir": self.save_dir,
+                    "session_id": session_id,
+                    "skip_stages": skip_stages,
+                    "use_consolidated_features": self.use_consolidated_features,
+                    "use_saved_features": self.use_saved_features,
+                    "feature_format": self.feature_format,
+                    "feature_cache_size": self.feature_cache_size,
+                }
+                for test_id in test_ids:
+                    scheduler.add_test(algorithm_attributes, test_params, test_id)
+                continue
             condda_test = CONDDATest(
                 algorithm_attributes,
                 self.dataset_root,
@@ -256,11 +306,15 @@ class Condda(VisualProtocol):
                 skip_stages,
                 self.use_consolidated_features,
                 self.use_saved_features,
+                self.feature_format,
+                self.feature_cache_size,
             )
             for test_id in test_ids:
                 log.info(f"Start test: {test_id}")
                 condda_test(test_id)
                 log.info(f"Test complete: {test_id}")
+        if self.executor != "serial":
+            scheduler.run()
 
         # Terminate algorithms
         for algorithm_attributes in algorithms_attributes:
@@ -1,12 +1,15 @@
 """Round for CONDDA."""
 
 import logging
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional, Union
 
+from sail_on_client.harness.round_dataset import RoundDataset
 from sail_on_client.harness.test_and_evaluation_harness import (
     TestAndEvaluationHarnessType,
 )
 from sail_on_client.utils.decorators import skip_stage
+from sail_on_client.protocol.feature_provider import FeatureProvider
 from sail_on_client.protocol.visual_round import VisualRound
 from sail_on_client.protocol.condda_dataclasses import NoveltyCharacterizationParams
 from sail_on_client.protocol.visual_dataclasses import (
@@ -32,6 +35,7 @@ class CONDDARound(VisualRound):
         session_id: str,
         skip_stages: List[str],
         test_id: str,
+        feature_provider: Optional[FeatureProvider] = None,
     ) -> None:
         """
         Construct CONDDARound.
@@ -46,6 +50,7 @@ class CONDDARound(VisualRound):
             session_id: Session id associated with the algorithm
             skip_stages: List of stages that are skipped
             test_id: Test id associated with the round
+            feature_provider: Provider for saved features, features_dict and logit_dict are used if not provided
 
         Returns:
             None
@@ -60,6 +65,7 @@ class CONDDARound(VisualRound):
             session_id,
             skip_stages,
             test_id,
+            feature_provider=feature_provider,
         )
 
     @skip_stage("NoveltyCharacterization")
@@ -82,20 +88,23 @@ class CONDDARound(VisualRound):
         else:
             log.warn("No characterization result provided by the algorithm")
 
-    def __call__(self, dataset: str, round_id: int) -> None:
+    def __call__(self, dataset: Union[str, RoundDataset], round_id: int) -> None:
         """
         Core logic for running round in CONDDA.
 
         Args:
-            dataset: Path to a file with the dataset for the round
+            dataset: Path to a file with the dataset for the round or the dataset for the round
             round_id: An Identifier for a round
 
         Returns:
             None
         """
         # Run feature extraction
-        fe_params = FeatureExtractionParams(dataset, self.data_root, round_id)
         instance_ids = CONDDARound.get_instance_ids(dataset)
+        fe_params = FeatureExtractionParams(
+            os.fspath(dataset), self.data_root, round_id, instance_ids
+        )
+        self.instance_ids = instance_ids
         rfeature_dict, rlogit_dict = self._run_feature_extraction(
             fe_params, instance_ids
         )
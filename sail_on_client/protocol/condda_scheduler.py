@@ -0,0 +1,168 @@
+"""Scheduler for running CONDDA tests concurrently."""
+
+import dataclasses
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Dict, List, Set, Tuple, Type
+
+from sail_on_client.harness.test_and_evaluation_harness import (
+    TestAndEvaluationHarnessType,
+)
+from sail_on_client.protocol.condda_dataclasses import AlgorithmAttributes
+from sail_on_client.protocol.condda_test import CONDDATest
+from sail_on_client.utils.executor import (
+    HarnessSpec,
+    create_executor,
+    worker_harness,
+    worker_harness_spec,
+    worker_instance,
+)
+
+log = logging.getLogger(__name__)
+
+
+class CONDDATestScheduler:
+    """
+    Dispatch CONDDA tests to a pool of workers.
+
+    Every worker runs tests with its own algorithm instance and its own
+    harness, unless the harness of the protocol can be shared by threads.
+    Tests are marked as completed by the harness of the protocol on the
+    thread running the scheduler once a worker has finished the test.
+    """
+
+    def __init__(
+        self,
+        harness: TestAndEvaluationHarnessType,
+        executor: str,
+        num_workers: int,
+        max_in_flight: int = 0,
+    ) -> None:
+        """
+        Construct scheduler for CONDDA tests.
+
+        Args:
+            harness: Harness used by the protocol to complete tests
+            executor: Run tests with a thread or process executor
+            num_workers: Number of workers used by the executor
+            max_in_flight: Maximum number of tests submitted to the workers at once,
+                           defaults to num_workers when it is not positive
+
+        Returns:
+            None
+        """
+        self.harness = harness
+        self.executor = executor
+        self.num_workers = num_workers
+        if max_in_flight > 0:
+            self.max_in_flight = max_in_flight
+        else:
+            self.max_in_flight = num_workers
+        self.tests: List[Tuple[AlgorithmAttributes, Dict, str]] = []
+
+    def add_test(
+        self, algorithm_attributes: AlgorithmAttributes, test_params: Dict, test_id: str
+    ) -> None:
+        """
+        Add a test that is run by the scheduler.
+
+        Args:
+            algorithm_attributes: An instance of algorithm_attributes
+            test_params: Parameters used to create CONDDATest except the harness
+            test_id: An identifier for the test
+
+        Returns:
+            None
+        """
+        self.tests.append((algorithm_attributes, test_params, test_id))
+
+    def run(self) -> None:
+        """
+        Run all the tests added to the scheduler.
+
+        Returns:
+            None
+        """
+        pool = create_executor(self.executor, self.num_workers)
+        if pool is None:
+            raise ValueError(
+                "CONDDATestScheduler requires a thread or process executor"
+            )
+        harness_spec = worker_harness_spec(self.harness, self.executor)
+        pending: Set[Future] = set()
+        submitted_tests: Dict[Future, Tuple[str, str]] = {}
+        try:
+            for algorithm_attributes, test_params, test_id in self.tests:
+                while len(pending) >= self.max_in_flight:
+                    pending = self._complete_tests(pending, submitted_tests)
+                algorithm = algorithm_attributes.instance
+                log.info(f"Submit test: {test_id}")
+                future = pool.submit(
+                    _run_condda_test,
+                    harness_spec,
+                    (type(algorithm), algorithm.get_config()),
+                    dataclasses.replace(algorithm_attributes, instance=None),
+                    test_params,
+                    test_id,
+                )
+                pending.add(future)
+                submitted_tests[future] = (algorithm_attributes.session_id, test_id)
+            while pending:
+                pending = self._complete_tests(pending, submitted_tests)
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+        self.tests = []
+
+    def _complete_tests(
+        self, pending: Set[Future], submitted_tests: Dict[Future, Tuple[str, str]]
+    ) -> Set[Future]:
+        """
+        Private function to wait for tests and mark finished tests as completed.
+
+        Args:
+            pending: Futures for tests that are running
+            submitted_tests: Session id and test id associated with the futures
+
+        Returns:
+            Futures for tests that are still running
+        """
+        done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            # Propagate failures from the worker before completing the test
+            future.result()
+            session_id, test_id = submitted_tests.pop(future)
+            self.harness.complete_test(session_id, test_id)
+            log.info(f"Test complete: {test_id}")
+        return not_done
+
+
+def _run_condda_test(
+    harness_spec: HarnessSpec,
+    algorithm_spec: Tuple[Type, Dict],
+    algorithm_attributes: AlgorithmAttributes,
+    test_params: Dict,
+    test_id: str,
+) -> None:
+    """
+    Private function to run a test in a worker of the scheduler.
+
+    Args:
+        harness_spec: Harness shared with the worker or its class and config
+        algorithm_spec: Class and config of the algorithm used in the test
+        algorithm_attributes: Attributes of the algorithm without the instance
+        test_params: Parameters used to create CONDDATest
+        test_id: An identifier for the test
+
+    Returns:
+        None
+    """
+    algorithm_attributes = dataclasses.replace(
+        algorithm_attributes, instance=worker_instance(*algorithm_spec)
+    )
+    with worker_harness(harness_spec) as harness:
+        condda_test = CONDDATest(algorithm_attributes, harness=harness, **test_params)
+        condda_test(test_id, complete_test=False)
@@ -8,6 +8,7 @@ from sail_on_client.protocol.condda_dataclasses import (
     AlgorithmAttributes,
     InitializeParams,
 )
+from sail_on_client.protocol.feature_provider import DEFAULT_FEATURE_CACHE_SIZE
 from sail_on_client.protocol.visual_test import VisualTest
 from sail_on_client.protocol.condda_round import CONDDARound
 from sail_on_client.harness.test_and_evaluation_harness import (
@@ -35,6 +36,8 @@ class CONDDATest(VisualTest):
         skip_stages: List[str],
         use_consolidated_features: bool,
         use_saved_features: bool,
+        feature_format: str = "pickle",
+        feature_cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
     ) -> None:
         """
         Construct test for CONDDA.
@@ -50,6 +53,8 @@ class CONDDATest(VisualTest):
             skip_stages: List of stages that would be skipped
             use_consolidated_features: Flag for using consolidated features
             use_saved_features: Flag for using saved features
+            feature_format: Format used for saving features, one of pickle or mmap
+            feature_cache_size: Number of instances whose saved features are cached
 
         Returns:
             None
@@ -65,14 +70,17 @@ class CONDDATest(VisualTest):
             skip_stages,
             use_consolidated_features,
             use_saved_features,
+            feature_format,
+            feature_cache_size,
         )
 
-    def __call__(self, test_id: str) -> None:
+    def __call__(self, test_id: str, complete_test: bool = True) -> None:
         """
         Core logic for running test in CONDDA.
 
         Args:
             test_id: An identifier for the test
+            complete_test: Flag to mark the test as completed with the harness
 
         Returns:
             Score for the test
@@ -87,35 +95,38 @@ class CONDDATest(VisualTest):
         )
         algorithm_instance.execute(algorithm_init_params.get_toolset(), "Initialize")
 
-        # Restore features
-        features_dict, logit_dict = self._restore_features(test_id)
+        # Restore features lazily for the instances in every round
+        feature_provider = self._create_feature_provider(test_id)
 
         # Initialize Round
         round_instance = CONDDARound(
             algorithm_instance,
             self.data_root,
-            features_dict,
+            {},
             self.harness,
-            logit_dict,
+            {},
             redlight_instance,
             self.session_id,
             self.skip_stages,
             test_id,
+            feature_provider,
         )
         aggregated_features_dict: Dict = {}
         aggregated_logit_dict: Dict = {}
+        features_replayed = self.use_saved_features
         # Run algorithm for multiple rounds
         for round_id in count(0):
             log.info(f"Start round: {round_id}")
             # see if there is another round available
             try:
-                dataset = self.harness.dataset_request(
+                dataset = self.harness.round_dataset_request(
                     test_id, round_id, self.session_id
                 )
             except RoundError:
                 # no more rounds available, this test is done.
                 break
             round_instance(dataset, round_id)
+            features_replayed &= round_instance.features_replayed
             (
                 aggregated_features_dict,
                 aggregated_logit_dict,
@@ -123,7 +134,11 @@ class CONDDATest(VisualTest):
                 round_instance, aggregated_features_dict, aggregated_logit_dict
             )
             # cleanup the dataset file for the round
-            safe_remove(dataset)
+            safe_remove(dataset.path)
             log.info(f"Round complete: {round_id}")
-        self.harness.complete_test(self.session_id, test_id)
-        self._save_features(test_id, aggregated_features_dict, aggregated_logit_dict)
+        if complete_test:
+            self.harness.complete_test(self.session_id, test_id)
+        if not features_replayed:
+            self._save_features(
+                test_id, aggregated_features_dict, aggregated_logit_dict
+            )
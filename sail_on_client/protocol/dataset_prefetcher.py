@@ -0,0 +1,142 @@
+"""Prefetcher for requesting datasets of upcoming rounds in a test."""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from types import TracebackType
+from typing import Deque, Iterator, Optional, Tuple, Type
+
+from sail_on_client.errors import RoundError
+from sail_on_client.harness.round_dataset import RoundDataset
+from sail_on_client.harness.test_and_evaluation_harness import (
+    TestAndEvaluationHarnessType,
+)
+from sail_on_client.utils.utils import safe_remove
+
+log = logging.getLogger(__name__)
+
+
+class DatasetPrefetcher:
+    """
+    Iterate over the datasets for the rounds of a test.
+
+    With a positive lookahead the datasets for the upcoming rounds are
+    requested in a background thread while the current round is running.
+    The prefetcher stops requesting datasets once the harness signals the
+    end of the test with a RoundError.
+    """
+
+    def __init__(
+        self,
+        harness: TestAndEvaluationHarnessType,
+        session_id: str,
+        test_id: str,
+        lookahead: int = 0,
+    ) -> None:
+        """
+        Construct prefetcher for the rounds of a test.
+
+        Args:
+            harness: An Instance of harness used for T&E
+            session_id: Session identifier for the test
+            test_id: An identifier for the test
+            lookahead: Number of rounds requested ahead of the current round,
+                       datasets are requested on demand when it is not positive
+
+        Returns:
+            None
+        """
+        self.harness = harness
+        self.session_id = session_id
+        self.test_id = test_id
+        self.lookahead = lookahead
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+        self._end_of_dataset = threading.Event()
+
+    def __enter__(self) -> "DatasetPrefetcher":
+        """Start the thread used for prefetching datasets."""
+        if self.lookahead > 0:
+            self._pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="DatasetPrefetcher"
+            )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop prefetching and remove datasets that were not consumed."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop prefetching and remove datasets that were not consumed.
+
+        Returns:
+            None
+        """
+        self._end_of_dataset.set()
+        for future in self._pending:
+            future.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.cancelled() and future.exception() is None:
+                safe_remove(future.result().path)
+
+    def _request(self, round_id: int) -> RoundDataset:
+        """
+        Private function to request the dataset for a round.
+
+        Args:
+            round_id: The sequential number of the round
+
+        Returns:
+            Dataset with the path to the dataset file and instance ids for the round
+        """
+        if self._end_of_dataset.is_set():
+            raise RoundError("End of Dataset", "The entire dataset has been requested")
+        try:
+            return self.harness.round_dataset_request(
+                self.test_id, round_id, self.session_id
+            )
+        except RoundError:
+            self._end_of_dataset.set()
+            raise
+
+    def __iter__(self) -> Iterator[Tuple[int, RoundDataset]]:
+        """
+        Iterate over the rounds of the test.
+
+        Returns:
+            Iterator over round id and the dataset for the round
+        """
+        next_round = 0
+        for round_id in count(0):
+            try:
+                if self._pool is None:
+                    dataset = self._request(round_id)
+                else:
+                    while (
+                        next_round <= round_id + self.lookahead
+                        and not self._end_of_dataset.is_set()
+                    ):
+                        log.debug(f"Prefetch round: {next_round}")
+                        self._pending.append(
+                            self._pool.submit(self._request, next_round)
+                        )
+                        next_round += 1
+                    if not self._pending:
+                        return
+                    dataset = self._pending.popleft().result()
+            except RoundError:
+                # no more rounds available, the test is done.
+                return
+            yield round_id, dataset
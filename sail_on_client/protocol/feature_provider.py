@@ -0,0 +1,99 @@
+"""Provider for features restored for the rounds of a test."""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sail_on_client.utils.feature_store import load_features
+
+log = logging.getLogger(__name__)
+
+DEFAULT_FEATURE_CACHE_SIZE = 1024
+
+
+class FeatureProvider:
+    """
+    Provide saved features for the instances in a round.
+
+    Features are loaded from the disk when they are requested for the first
+    time and rounds only query the instances used in the round. Features for
+    recently used instances are kept in a bounded cache, which avoids reading
+    rows of memory mapped features again when an instance is used in
+    multiple rounds.
+    """
+
+    def __init__(
+        self,
+        features_dict: Optional[Mapping] = None,
+        logit_dict: Optional[Mapping] = None,
+        feature_path: str = "",
+        cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
+    ) -> None:
+        """
+        Construct provider for saved features.
+
+        Args:
+            features_dict: Mapping with features for the entire dataset
+            logit_dict: Mapping with logits for the entire dataset
+            feature_path: Path to a pickle file or a feature store, used if
+                          features_dict and logit_dict are not provided
+            cache_size: Number of instances whose features are cached, 0 disables the cache
+
+        Returns:
+            None
+        """
+        self.feature_path = feature_path
+        self.cache_size = cache_size
+        self._features_dict = features_dict
+        self._logit_dict = logit_dict
+        self._cache: "OrderedDict[str, Tuple[Any, Any]]" = OrderedDict()
+
+    def _load(self) -> Tuple[Mapping, Mapping]:
+        """
+        Private function to load features on first use.
+
+        Returns:
+            Tuple of mappings with features and logits for the entire dataset
+        """
+        if self._features_dict is None or self._logit_dict is None:
+            log.info(f"Loading features from {self.feature_path}")
+            test_features = load_features(self.feature_path)
+            self._features_dict = test_features["features_dict"]
+            self._logit_dict = test_features["logit_dict"]
+        return self._features_dict, self._logit_dict
+
+    def has_features(self) -> bool:
+        """
+        Check if features and logits are available.
+
+        Returns:
+            True if the provider has features and logits for the dataset
+        """
+        features_dict, logit_dict = self._load()
+        return len(features_dict) > 0 and len(logit_dict) > 0
+
+    def get_round_features(self, instance_ids: List[str]) -> Tuple[Dict, Dict]:
+        """
+        Get features for the instances in a round.
+
+        Args:
+            instance_ids: Identifiers associated with data for a round
+
+        Returns:
+            Tuple for feature and logit dictionary for a round
+        """
+        features_dict, logit_dict = self._load()
+        rfeature_dict, rlogit_dict = {}, {}
+        for instance_id in instance_ids:
+            if instance_id in self._cache:
+                self._cache.move_to_end(instance_id)
+                feature, logit = self._cache[instance_id]
+            else:
+                feature, logit = features_dict[instance_id], logit_dict[instance_id]
+                if self.cache_size > 0:
+                    self._cache[instance_id] = (feature, logit)
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            rfeature_dict[instance_id] = feature
+            rlogit_dict[instance_id] = logit
+        return rfeature_dict, rlogit_dict
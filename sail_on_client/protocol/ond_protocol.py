@@ -7,14 +7,23 @@ from sail_on_client.harness.test_and_evaluation_harness import (
 from sail_on_client.protocol.visual_protocol import VisualProtocol
 from sail_on_client.utils.numpy_encoder import NumpyEncoder
 from sail_on_client.protocol.ond_dataclasses import AlgorithmAttributes
+from sail_on_client.protocol.feature_provider import DEFAULT_FEATURE_CACHE_SIZE
 from sail_on_client.protocol.ond_test import ONDTest
 from sail_on_client.utils.decorators import skip_stage
+from sail_on_client.utils.executor import (
+    HarnessSpec,
+    create_executor,
+    worker_harness,
+    worker_harness_spec,
+    worker_instance,
+)
 
+import dataclasses
 import os
 import json
 import logging
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 log = logging.getLogger(__name__)
 
@@ -51,6 +60,12 @@ class ONDProtocol(VisualProtocol):
         use_consolidated_features: bool = False,
         use_saved_attributes: bool = False,
         use_saved_features: bool = False,
+        executor: str = "serial",
+        num_workers: int = 1,
+        prefetch_rounds: int = 0,
+        background_posting: bool = False,
+        feature_format: str = "pickle",
+        feature_cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
     ) -> None:
         """
         Construct OND protocol.
@@ -82,6 +97,12 @@ class ONDProtocol(VisualProtocol):
             use_feedback: Flag to use feedback
             use_saved_attributes: Flag to use saved attributes
             use_saved_features: Flag to use saved features
+            executor: Run tests with a serial, thread or process executor
+            num_workers: Number of workers used by thread or process executor
+            prefetch_rounds: Number of rounds whose datasets are requested ahead of the current round
+            background_posting: Flag to post results for a round in the background
+            feature_format: Format used for saving features, one of pickle or mmap
+            feature_cache_size: Number of instances whose saved features are cached
 
         Returns:
             None
@@ -124,6 +145,12 @@ class ONDProtocol(VisualProtocol):
         self.use_feedback = use_feedback
         self.use_saved_attributes = use_saved_attributes
         self.use_saved_features = use_saved_features
+        self.executor = executor
+        self.num_workers = num_workers
+        self.prefetch_rounds = prefetch_rounds
+        self.background_posting = background_posting
+        self.feature_format = feature_format
+        self.feature_cache_size = feature_cache_size
 
     def get_config(self) -> Dict:
         """Get dictionary representation of the object."""
@@ -154,6 +181,12 @@ class ONDProtocol(VisualProtocol):
                 "use_feedback": self.use_feedback,
                 "use_saved_attributes": self.use_saved_attributes,
                 "use_saved_features": self.use_saved_features,
+                "executor": self.executor,
+                "num_workers": self.num_workers,
+                "prefetch_rounds": self.prefetch_rounds,
+                "background_posting": self.background_posting,
+                "feature_format": self.feature_format,
+                "feature_cache_size": self.feature_cache_size,
             }
         )
         return config
@@ -285,21 +318,29 @@ class ONDProtocol(VisualProtocol):
             )
         else:
             baseline_session_id = None
-        for algorithm_attributes in algorithms_attributes:
-            if (
+        evaluated_algorithms = [
+            algorithm_attributes
+            for algorithm_attributes in algorithms_attributes
+            if not (
                 algorithm_attributes.is_baseline
                 or algorithm_attributes.is_reaction_baseline
-            ):
-                continue
-            session_id = algorithm_attributes.session_id
-            test_ids = algorithm_attributes.test_ids
+            )
+        ]
+        # All tests are evaluated together to share ground truth and baseline
+        session_test_ids = [
+            (algorithm_attributes.session_id, test_id)
+            for algorithm_attributes in evaluated_algorithms
+            for test_id in algorithm_attributes.test_ids
+        ]
+        log.info(f"Started evaluating {len(session_test_ids)} tests")
+        scores = iter(
+            self.harness.evaluate_batch(session_test_ids, 0, baseline_session_id)
+        )
+        for algorithm_attributes in evaluated_algorithms:
             algorithm_name = algorithm_attributes.name
             test_scores = algorithm_scores[algorithm_name]
-            log.info(f"Started evaluating {algorithm_name}")
-            for test_id in test_ids:
-                score = self.harness.evaluate(
-                    test_id, 0, session_id, baseline_session_id
-                )
+            for test_id in algorithm_attributes.test_ids:
+                score = next(scores)
                 score.update(test_scores[test_id])
                 with open(
                     os.path.join(save_dir, f"{test_id}_{algorithm_name}.json"), "w"
@@ -308,6 +349,89 @@ class ONDProtocol(VisualProtocol):
                     json.dump(score, f, indent=4, cls=NumpyEncoder)  # type: ignore
             log.info(f"Finished evaluating {algorithm_name}")
 
+    def _run_tests(self, algorithms_attributes: List[AlgorithmAttributes]) -> Dict:
+        """
+        Run tests for all the algorithms.
+
+        Tests are run serially with the harness and algorithms of the protocol
+        or concurrently across tests and algorithms with algorithm instances
+        owned by every worker. Scores are always collected in the order of the
+        algorithms and tests in the config.
+
+        Args:
+            algorithms_attributes: All algorithms present in the config
+
+        Returns:
+            Dictionary with scores for every test of every algorithm
+        """
+        pool = create_executor(self.executor, self.num_workers)
+        test_runs: Dict[str, Dict] = {}
+        harness_spec = worker_harness_spec(self.harness, self.executor)
+        for algorithm_attributes in algorithms_attributes:
+            algorithm_name = algorithm_attributes.name
+            session_id = algorithm_attributes.session_id
+            test_ids = algorithm_attributes.test_ids
+            log.info(f"Starting session: {session_id} for algorithm: {algorithm_name}")
+            skip_stages = self.skip_stages.copy()
+            if algorithm_attributes.is_reaction_baseline:
+                skip_stages.append("WorldDetection")
+                skip_stages.append("NoveltyCharacterization")
+            test_params = {
+                "data_root": self.dataset_root,
+                "domain": self.domain,
+                "feedback_type": self.feedback_type,
+                "feature_dir": self.feature_dir,
+                "save_dir": self.save_dir,
+                "session_id": session_id,
+                "skip_stages": skip_stages,
+                "use_consolidated_features": self.use_consolidated_features,
+                "use_saved_features": self.use_saved_features,
+                "prefetch_rounds": self.prefetch_rounds,
+                "background_posting": self.background_posting,
+                "feature_format": self.feature_format,
+                "feature_cache_size": self.feature_cache_size,
+            }
+            test_runs[algorithm_name] = {}
+            if pool is None:
+                ond_test = ONDTest(
+                    algorithm_attributes, harness=self.harness, **test_params
+                )
+                for test_id in test_ids:
+                    log.info(f"Start test: {test_id}")
+                    test_runs[algorithm_name][test_id] = ond_test(test_id)
+                    log.info(f"Test complete: {test_id}")
+                continue
+            algorithm = algorithm_attributes.instance
+            algorithm_spec = (type(algorithm), algorithm.get_config())
+            worker_attributes = dataclasses.replace(algorithm_attributes, instance=None)
+            for test_id in test_ids:
+                log.info(f"Submit test: {test_id}")
+                test_runs[algorithm_name][test_id] = pool.submit(
+                    _run_ond_test,
+                    harness_spec,
+                    algorithm_spec,
+                    worker_attributes,
+                    test_params,
+                    test_id,
+                )
+        if pool is None:
+            return test_runs
+        algorithm_scores: Dict[str, Dict] = {}
+        try:
+            for algorithm_name, futures in test_runs.items():
+                algorithm_scores[algorithm_name] = {}
+                for test_id, future in futures.items():
+                    algorithm_scores[algorithm_name][test_id] = future.result()
+                    log.info(f"Test complete: {test_id}")
+        except Exception:
+            for futures in test_runs.values():
+                for future in futures.values():
+                    future.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+        return algorithm_scores
+
     def update_skip_stages(
         self,
         skip_stages: List[str],
@@ -351,7 +475,20 @@ class ONDProtocol(VisualProtocol):
 
     def run_protocol(self, config: Dict) -> None:
         """
-        Run the protocol.
+        Run the protocol and close the harness once the run ends.
+
+        Args:
+            config: Parameters provided in the config
+
+        Returns:
+            None
+        """
+        with self.harness:
+            self._run_protocol(config)
+
+    def _run_protocol(self, config: Dict) -> None:
+        """
+        Private function to run the protocol.
 
         Args:
             config: Parameters provided in the config
@@ -396,36 +533,7 @@ class ONDProtocol(VisualProtocol):
             )
 
         # Run tests for all the algorithms
-        algorithm_scores = {}
-        for algorithm_attributes in algorithms_attributes:
-            algorithm_name = algorithm_attributes.name
-            session_id = algorithm_attributes.session_id
-            test_ids = algorithm_attributes.test_ids
-            log.info(f"Starting session: {session_id} for algorithm: {algorithm_name}")
-            skip_stages = self.skip_stages.copy()
-            if algorithm_attributes.is_reaction_baseline:
-                skip_stages.append("WorldDetection")
-                skip_stages.append("NoveltyCharacterization")
-            ond_test = ONDTest(
-                algorithm_attributes,
-                self.dataset_root,
-                self.domain,
-                self.feedback_type,
-                self.feature_dir,
-                self.harness,
-                self.save_dir,
-                session_id,
-                skip_stages,
-                self.use_consolidated_features,
-                self.use_saved_features,
-            )
-            test_scores = {}
-            for test_id in test_ids:
-                log.info(f"Start test: {test_id}")
-                test_score = ond_test(test_id)
-                test_scores[test_id] = test_score
-                log.info(f"Test complete: {test_id}")
-            algorithm_scores[algorithm_name] = test_scores
+        algorithm_scores = self._run_tests(algorithms_attributes)
 
         # Evaluate algorithms
         self._evaluate_algorithms(
@@ -438,3 +546,31 @@ class ONDProtocol(VisualProtocol):
             session_id = algorithm_attributes.session_id
             self.harness.terminate_session(session_id)
             log.info(f"Session ended for {algorithm_name}: {session_id}")
+
+
+def _run_ond_test(
+    harness_spec: HarnessSpec,
+    algorithm_spec: Tuple[Type, Dict],
+    algorithm_attributes: AlgorithmAttributes,
+    test_params: Dict,
+    test_id: str,
+) -> Union[Dict, None]:
+    """
+    Private function to run a test in a worker of the executor.
+
+    Args:
+        harness_spec: Harness shared with the worker or its class and config
+        algorithm_spec: Class and config of the algorithm used in the test
+        algorithm_attributes: Attributes of the algorithm without the instance
+        test_params: Parameters used to create ONDTest
+        test_id: An identifier for the test
+
+    Returns:
+        Score for the test
+    """
+    algorithm_attributes = dataclasses.replace(
+        algorithm_attributes, instance=worker_instance(*algorithm_spec)
+    )
+    with worker_harness(harness_spec) as harness:
+        ond_test = ONDTest(algorithm_attributes, harness=harness, **test_params)
+        return ond_test(test_id)
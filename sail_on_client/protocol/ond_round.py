@@ -1,7 +1,9 @@
 """Round for OND."""
 
 import logging
-from typing import List, Any, Dict, Union
+import os
+from concurrent.futures import Future
+from typing import List, Any, Dict, Optional, Union
 
 from sail_on_client.protocol.ond_dataclasses import (
     NoveltyClassificationParams,
@@ -11,11 +13,13 @@ from sail_on_client.protocol.visual_dataclasses import (
     FeatureExtractionParams,
     WorldChangeDetectionParams,
 )
+from sail_on_client.protocol.result_poster import ResultPoster
+from sail_on_client.protocol.feature_provider import FeatureProvider
 from sail_on_client.protocol.visual_round import VisualRound
+from sail_on_client.harness.round_dataset import RoundDataset
 from sail_on_client.harness.test_and_evaluation_harness import (
     TestAndEvaluationHarnessType,
 )
-from sail_on_client.utils.utils import safe_remove
 from sail_on_client.utils.decorators import skip_stage
 
 
@@ -36,6 +40,8 @@ class ONDRound(VisualRound):
         session_id: str,
         skip_stages: List[str],
         test_id: str,
+        result_poster: Optional[ResultPoster] = None,
+        feature_provider: Optional[FeatureProvider] = None,
     ) -> None:
         """
         Construct round for OND.
@@ -50,6 +56,8 @@ class ONDRound(VisualRound):
             session_id: Session id associated with the algorithm
             skip_stages: List of stages that are skipped
             test_id: Test id associated with the round
+            result_poster: Poster used for results, results are posted immediately if not provided
+            feature_provider: Provider for saved features, features_dict and logit_dict are used if not provided
 
         Returns:
             None
@@ -64,6 +72,8 @@ class ONDRound(VisualRound):
             session_id,
             skip_stages,
             test_id,
+            result_poster,
+            feature_provider,
         )
 
     @skip_stage("NoveltyClassification")
@@ -83,23 +93,22 @@ class ONDRound(VisualRound):
         ncl_result = self.algorithm.execute(
             nc_params.get_toolset(), "NoveltyClassification"
         )
-        self.harness.post_results(
-            {"classification": ncl_result}, self.test_id, round_id, self.session_id
+        self.result_poster.post(
+            {"classification": self._round_result(ncl_result)}, round_id
         )
-        safe_remove(ncl_result)
 
     @skip_stage("EvaluateRoundwise")
-    def _evaluate_roundwise(self, round_id: int) -> Dict:
+    def _evaluate_roundwise(self, round_id: int) -> "Future[Dict]":
         """
-        Compute roundwise accuracy.
+        Compute roundwise accuracy once the results for the round are posted.
 
         Args:
             round_id: Identifier for a round
 
         Returns:
-            Dictionary with accuracy metrics for round
+            Future with dictionary of accuracy metrics for round
         """
-        return self.harness.evaluate_round_wise(self.test_id, round_id, self.session_id)
+        return self.result_poster.evaluate_round_wise(round_id)
 
     @skip_stage("NoveltyAdaptation")
     def _run_novelty_adaptation(self, na_params: NoveltyAdaptationParams) -> None:
@@ -114,21 +123,47 @@ class ONDRound(VisualRound):
         """
         return self.algorithm.execute(na_params.get_toolset(), "NoveltyAdaptation")
 
-    def __call__(self, dataset: str, round_id: int) -> Union[Dict, None]:
+    def __call__(
+        self, dataset: Union[str, RoundDataset], round_id: int
+    ) -> Union[Dict, None]:
         """
         Core logic for running round in OND.
 
         Args:
             algorithm: An instance of the algorithm
-            dataset: Path to a file with the dataset for the round
+            dataset: Path to a file with the dataset for the round or the dataset for the round
             round_id: An Identifier for a round
 
         Returns:
             Score for the round
         """
+        round_score = self.run(dataset, round_id)
+        if round_score is None:
+            return None
+        return round_score.result()
+
+    def run(
+        self, dataset: Union[str, RoundDataset], round_id: int
+    ) -> Optional["Future[Dict]"]:
+        """
+        Run round in OND without waiting for the score of the round.
+
+        With results posted in the background, the round is evaluated after
+        its results are posted while the next round is running.
+
+        Args:
+            dataset: Path to a file with the dataset for the round or the dataset for the round
+            round_id: An Identifier for a round
+
+        Returns:
+            Future with the score for the round or None if the round is not evaluated
+        """
         # Run feature extraction
-        fe_params = FeatureExtractionParams(dataset, self.data_root, round_id)
         instance_ids = ONDRound.get_instance_ids(dataset)
+        fe_params = FeatureExtractionParams(
+            os.fspath(dataset), self.data_root, round_id, instance_ids
+        )
+        self.instance_ids = instance_ids
         rfeature_dict, rlogit_dict = self._run_feature_extraction(
             fe_params, instance_ids
         )
@@ -140,7 +175,9 @@ class ONDRound(VisualRound):
         # Run Novelty Classification
         nc_params = NoveltyClassificationParams(rfeature_dict, rlogit_dict, round_id)
         self._run_novelty_classification(nc_params, round_id)
-        # Compute metrics for the round
+        # Post the results for the round while the agent continues
+        self.result_poster.flush()
+        # Compute metrics for the round after the results are posted
         round_score = self._evaluate_roundwise(round_id)
 
         na_params = NoveltyAdaptationParams(round_id)
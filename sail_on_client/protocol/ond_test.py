@@ -1,7 +1,7 @@
 """Test for OND."""
 
 import logging
-from itertools import count
+from concurrent.futures import Future
 from typing import Union, Dict, Any, List
 
 from sail_on_client.protocol.ond_dataclasses import (
@@ -9,7 +9,10 @@ from sail_on_client.protocol.ond_dataclasses import (
     InitializeParams,
     NoveltyCharacterizationParams,
 )
+from sail_on_client.protocol.dataset_prefetcher import DatasetPrefetcher
+from sail_on_client.protocol.feature_provider import DEFAULT_FEATURE_CACHE_SIZE
 from sail_on_client.protocol.ond_round import ONDRound
+from sail_on_client.protocol.result_poster import ResultPoster
 from sail_on_client.protocol.visual_test import VisualTest
 from sail_on_client.feedback import create_feedback_instance, feedback_type
 from sail_on_client.harness.test_and_evaluation_harness import (
@@ -17,7 +20,6 @@ from sail_on_client.harness.test_and_evaluation_harness import (
 )
 from sail_on_client.utils.utils import safe_remove
 from sail_on_client.utils.decorators import skip_stage
-from sail_on_client.errors import RoundError
 
 
 log = logging.getLogger(__name__)
@@ -39,6 +41,10 @@ class ONDTest(VisualTest):
         skip_stages: List[str],
         use_consolidated_features: bool,
         use_saved_features: bool,
+        prefetch_rounds: int = 0,
+        background_posting: bool = False,
+        feature_format: str = "pickle",
+        feature_cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
     ) -> None:
         """
         Construct test for OND.
@@ -54,6 +60,11 @@ class ONDTest(VisualTest):
             skip_stages: List of stages that would be skipped
             use_consolidated_features: Flag for using consolidated features
             use_saved_features: Flag for using saved features
+            prefetch_rounds: Number of rounds whose datasets are requested in the
+                             background while the current round is running
+            background_posting: Flag to post results for a round in the background
+            feature_format: Format used for saving features, one of pickle or mmap
+            feature_cache_size: Number of instances whose saved features are cached
 
         Returns:
             None
@@ -69,12 +80,16 @@ class ONDTest(VisualTest):
             skip_stages,
             use_consolidated_features,
             use_saved_features,
+            feature_format,
+            feature_cache_size,
         )
         self.feedback_type = feedback_type
+        self.prefetch_rounds = prefetch_rounds
+        self.background_posting = background_posting
 
     @skip_stage("CreateFeedbackInstance")
     def _create_feedback_instance(
-        self, test_id: str, feedback_max_ids: int
+        self, test_id: str, feedback_max_ids: int, result_poster: ResultPoster
     ) -> feedback_type:
         """
         Private function for creating feedback object.
@@ -82,6 +97,7 @@ class ONDTest(VisualTest):
         Args:
            test_id: An identifier for the test
            feedback_max_ids: Budget provided in metadata
+           result_poster: Poster used for the results of the test
 
         Return:
             An instance of feedback for the domain
@@ -96,7 +112,8 @@ class ONDTest(VisualTest):
             "first_budget": feedback_max_ids,
             "income_per_batch": feedback_max_ids,
             "maximum_budget": feedback_max_ids,
-            "interface": self.harness,
+            # Feedback waits for results that are posted in the background
+            "interface": result_poster if self.background_posting else self.harness,
             "session_id": self.session_id,
             "test_id": test_id,
             "feedback_type": self.feedback_type,
@@ -136,8 +153,13 @@ class ONDTest(VisualTest):
         redlight_instance = metadata.get("red_light", "")
         feedback_max_ids = metadata.get("feedback_max_ids", 0)
         pre_novelty_batches = metadata.get("pre_novelty_batches", 0)
+        result_poster = ResultPoster(
+            self.harness, self.session_id, test_id, self.background_posting
+        )
         # Initialize feedback object for the domains
-        feedback_instance = self._create_feedback_instance(test_id, feedback_max_ids)
+        feedback_instance = self._create_feedback_instance(
+            test_id, feedback_max_ids, result_poster
+        )
 
         # Initialize algorithm
         algorithm_instance = self.algorithm_attributes.instance
@@ -151,51 +173,59 @@ class ONDTest(VisualTest):
         )
         algorithm_instance.execute(algorithm_init_params.get_toolset(), "Initialize")
 
-        # Restore features
-        features_dict, logit_dict = self._restore_features(test_id)
+        # Restore features lazily for the instances in every round
+        feature_provider = self._create_feature_provider(test_id)
 
         # Initialize Round
         round_instance = ONDRound(
             algorithm_instance,
             self.data_root,
-            features_dict,
+            {},
             self.harness,
-            logit_dict,
+            {},
             redlight_instance,
             self.session_id,
             self.skip_stages,
             test_id,
+            result_poster,
+            feature_provider,
         )
         aggregated_features_dict: Dict = {}
         aggregated_logit_dict: Dict = {}
-        test_score = {}
+        round_scores: Dict[str, "Future[Dict]"] = {}
         test_instances = []
-        # Run algorithm for multiple rounds
-        for round_id in count(0):
-            log.info(f"Start round: {round_id}")
-            # see if there is another round available
-            try:
-                dataset = self.harness.dataset_request(
-                    test_id, round_id, self.session_id
+        features_replayed = self.use_saved_features
+        # Run algorithm for multiple rounds until no more rounds are available
+        with result_poster, DatasetPrefetcher(
+            self.harness, self.session_id, test_id, self.prefetch_rounds
+        ) as datasets:
+            for round_id, dataset in datasets:
+                log.info(f"Start round: {round_id}")
+                round_score = round_instance.run(dataset, round_id)
+                test_instances.extend(dataset.instance_ids)
+                if round_score is not None:
+                    round_scores[f"Round {round_id}"] = round_score
+                features_replayed &= round_instance.features_replayed
+                (
+                    aggregated_features_dict,
+                    aggregated_logit_dict,
+                ) = self._aggregate_features_across_round(
+                    round_instance, aggregated_features_dict, aggregated_logit_dict
                 )
-            except RoundError:
-                # no more rounds available, this test is done.
-                break
-            round_score = round_instance(dataset, round_id)
-            test_instances.extend(ONDRound.get_instance_ids(dataset))
-            if round_score:
-                test_score[f"Round {round_id}"] = round_score
-            (
-                aggregated_features_dict,
-                aggregated_logit_dict,
-            ) = self._aggregate_features_across_round(
-                round_instance, aggregated_features_dict, aggregated_logit_dict
-            )
-            # cleanup the dataset file for the round
-            safe_remove(dataset)
-            log.info(f"Round complete: {round_id}")
+                # cleanup the dataset file for the round
+                safe_remove(dataset.path)
+                log.info(f"Round complete: {round_id}")
+        # Scores are available once the results of every round are posted
+        test_score = {}
+        for round_name, round_score in round_scores.items():
+            score = round_score.result()
+            if score:
+                test_score[round_name] = score
         nc_params = NoveltyCharacterizationParams(test_instances)
         self._run_novelty_characterization(algorithm_instance, nc_params, test_id)
         self.harness.complete_test(self.session_id, test_id)
-        self._save_features(test_id, aggregated_features_dict, aggregated_logit_dict)
+        if not features_replayed:
+            self._save_features(
+                test_id, aggregated_features_dict, aggregated_logit_dict
+            )
         return test_score
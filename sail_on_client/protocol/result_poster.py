@@ -0,0 +1,246 @@
+"""Poster for submitting results of a test to the harness."""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Deque, Dict, Optional, Type
+
+from sail_on_client.harness.test_and_evaluation_harness import (
+    TestAndEvaluationHarnessType,
+)
+from sail_on_client.utils.utils import safe_remove_results
+
+log = logging.getLogger(__name__)
+
+
+class ResultPoster:
+    """
+    Post results for the rounds of a test.
+
+    By default results are posted as soon as they are available. When
+    posting in the background, results for a round are collected until the
+    round is flushed and posted with a single request in a background thread,
+    so the agent can continue with the next stage. Requests are posted in the
+    order of the rounds, and waiting for the poster guarantees that all the
+    results were accepted by the harness. Round wise evaluation is scheduled
+    on the same thread, so it runs once the results of the round are posted
+    without blocking the agent.
+    """
+
+    def __init__(
+        self,
+        harness: TestAndEvaluationHarnessType,
+        session_id: str,
+        test_id: str,
+        background: bool = False,
+    ) -> None:
+        """
+        Construct poster for the results of a test.
+
+        Args:
+            harness: An Instance of harness used for T&E
+            session_id: Session identifier for the test
+            test_id: An identifier for the test
+            background: Flag to post results of a round together in a background thread
+
+        Returns:
+            None
+        """
+        self.harness = harness
+        self.session_id = session_id
+        self.test_id = test_id
+        self.background = background
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+        self._evaluations: Deque[Future] = deque()
+        self._round_id: Optional[int] = None
+        self._round_results: Dict[str, str] = {}
+        self._failed = threading.Event()
+
+    def __enter__(self) -> "ResultPoster":
+        """Use the poster for the rounds of a test."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Wait for results that are being posted, or discard them on errors."""
+        if exc_type is None:
+            self.close()
+        else:
+            self._round_id, self._round_results = None, {}
+            for future in [*self._pending, *self._evaluations]:
+                future.cancel()
+            self._shutdown()
+
+    def _post(self, result_files: Dict[str, str], round_id: int) -> None:
+        """
+        Private function to post results and remove the result files.
+
+        Args:
+            result_files: A dictionary of results with protocol constant as key and file path as value
+            round_id: The sequential number of the round
+
+        Returns:
+            None
+        """
+        if self._failed.is_set():
+            # Results for later rounds are not posted after a failure
+            return
+        try:
+            self.harness.post_results(
+                result_files, self.test_id, round_id, self.session_id
+            )
+        except Exception:
+            if self.background:
+                self._failed.set()
+            raise
+        safe_remove_results(result_files)
+
+    def post(self, result_files: Dict[str, str], round_id: int) -> None:
+        """
+        Post results for a round.
+
+        Args:
+            result_files: A dictionary of results with protocol constant as key and file path as value
+            round_id: The sequential number of the round
+
+        Returns:
+            None
+        """
+        if not self.background:
+            self._post(result_files, round_id)
+            return
+        if self._round_id is not None and self._round_id != round_id:
+            self.flush()
+        self._round_id = round_id
+        self._round_results.update(result_files)
+
+    def flush(self) -> None:
+        """
+        Start posting the results collected for the current round.
+
+        Returns:
+            None
+        """
+        self._raise_errors()
+        if self._round_id is None:
+            return
+        log.debug(f"Post results for round: {self._round_id}")
+        self._pending.append(
+            self._executor().submit(self._post, self._round_results, self._round_id)
+        )
+        self._round_id, self._round_results = None, {}
+
+    def wait(self) -> None:
+        """
+        Post the results collected so far and wait for the requests to finish.
+
+        Returns:
+            None
+        """
+        self.flush()
+        while self._pending:
+            self._pending.popleft().result()
+
+    def close(self) -> None:
+        """
+        Wait for the results and stop the thread used for posting results.
+
+        Returns:
+            None
+        """
+        try:
+            self.wait()
+        finally:
+            self._shutdown()
+
+    def _evaluate_round_wise(self, round_id: int) -> Dict[str, Any]:
+        """
+        Private function to evaluate a round once its results are posted.
+
+        Args:
+            round_id: The sequential number of the round
+
+        Returns:
+            Dictionary with metrics for the round
+        """
+        if self._failed.is_set():
+            raise RuntimeError(f"Results for round {round_id} were not posted")
+        return self.harness.evaluate_round_wise(self.test_id, round_id, self.session_id)
+
+    def evaluate_round_wise(self, round_id: int) -> "Future[Dict[str, Any]]":
+        """
+        Evaluate a round after the results for the round are posted.
+
+        Without background posting the round is evaluated immediately,
+        otherwise the evaluation is scheduled after the results for the round
+        and the future is resolved once the harness returns the metrics.
+
+        Args:
+            round_id: The sequential number of the round
+
+        Returns:
+            A future with the metrics for the round
+        """
+        future: "Future[Dict[str, Any]]"
+        if not self.background:
+            future = Future()
+            future.set_result(self._evaluate_round_wise(round_id))
+            return future
+        self.flush()
+        future = self._executor().submit(self._evaluate_round_wise, round_id)
+        self._evaluations.append(future)
+        return future
+
+    def get_feedback_request(
+        self,
+        feedback_ids: list,
+        feedback_type: str,
+        test_id: str,
+        round_id: int,
+        session_id: str,
+    ) -> str:
+        """
+        Get feedback from the harness after posting results that it depends on.
+
+        Args:
+            feedback_ids: List of media ids for which feedback is required
+            feedback_type: Protocols constants with the values: label, detection, characterization
+            test_id: The id of the test currently being evaluated
+            round_id: The sequential number of the round being evaluated
+            session_id: The id provided by a server denoting a session
+
+        Returns:
+            Path to a file containing containing requested feedback
+        """
+        self.wait()
+        return self.harness.get_feedback_request(
+            feedback_ids, feedback_type, test_id, round_id, session_id
+        )
+
+    def _raise_errors(self) -> None:
+        """Private function to raise errors from requests that have finished."""
+        while self._pending and self._pending[0].done():
+            self._pending.popleft().result()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Private function to get the thread used for posting results."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="ResultPoster"
+            )
+        return self._pool
+
+    def _shutdown(self) -> None:
+        """Private function to stop the thread used for posting results."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._pending.clear()
+        self._evaluations.clear()
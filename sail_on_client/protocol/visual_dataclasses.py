@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
 
 
 log = logging.getLogger(__name__)
@@ -15,6 +15,7 @@ class FeatureExtractionParams:
     dataset: str
     data_root: str
     round_id: int
+    dataset_ids: Optional[List[str]] = None
 
     def get_toolset(self) -> Dict:
         """
@@ -23,11 +24,15 @@ class FeatureExtractionParams:
         Returns
             A dictionary with data associated with the class
         """
-        return {
+        toolset = {
             "dataset": self.dataset,
             "dataset_root": self.data_root,
             "round_id": self.round_id,
         }
+        # Instance ids in the dataset so agents don't have to read the dataset
+        if self.dataset_ids is not None:
+            toolset["dataset_ids"] = self.dataset_ids
+        return toolset
 
 
 @dataclass
@@ -1,7 +1,8 @@
 """Round for visual protocol."""
 
 import logging
-from typing import List, Any, Tuple, Dict
+import numpy as np
+from typing import List, Any, Tuple, Dict, Optional, Union
 
 from sail_on_client.protocol.visual_dataclasses import (
     FeatureExtractionParams,
@@ -10,7 +11,14 @@ from sail_on_client.protocol.visual_dataclasses import (
 from sail_on_client.harness.test_and_evaluation_harness import (
     TestAndEvaluationHarnessType,
 )
-from sail_on_client.utils.utils import safe_remove
+from sail_on_client.harness.results import (
+    AgentResultType,
+    ResultType,
+    array_to_result,
+)
+from sail_on_client.harness.round_dataset import RoundDataset
+from sail_on_client.protocol.feature_provider import FeatureProvider
+from sail_on_client.protocol.result_poster import ResultPoster
 from sail_on_client.utils.decorators import skip_stage
 
 
@@ -31,6 +39,8 @@ class VisualRound:
         session_id: str,
         skip_stages: List[str],
         test_id: str,
+        result_poster: Optional[ResultPoster] = None,
+        feature_provider: Optional[FeatureProvider] = None,
     ) -> None:
         """
         Construct VisualRound.
@@ -45,6 +55,8 @@ class VisualRound:
             session_id: Session id associated with the algorithm
             skip_stages: List of stages that are skipped
             test_id: Test id associated with the round
+            result_poster: Poster used for results, results are posted immediately if not provided
+            feature_provider: Provider for saved features, features_dict and logit_dict are used if not provided
 
         Returns:
             None
@@ -58,23 +70,52 @@ class VisualRound:
         self.session_id = session_id
         self.skip_stages = skip_stages
         self.test_id = test_id
+        self.instance_ids: List[str] = []
+        if result_poster is None:
+            self.result_poster = ResultPoster(harness, session_id, test_id)
+        else:
+            self.result_poster = result_poster
+        if feature_provider is None:
+            self.feature_provider = FeatureProvider(
+                features_dict, logit_dict, cache_size=0
+            )
+        else:
+            self.feature_provider = feature_provider
+        # Set when features for the last round were provided by saved features
+        self.features_replayed = False
 
     @staticmethod
-    def get_instance_ids(dataset_path: str) -> List[str]:
+    def get_instance_ids(dataset_path: Union[str, RoundDataset]) -> List[str]:
         """
         Get instance ids from the dataset.
 
         Args:
-            dataset_path: Path to text file with instances used in a round
+            dataset_path: Path to text file with instances used in a round or the dataset for the round
 
         Returns:
             List of instance ids from the dataset
         """
+        if isinstance(dataset_path, RoundDataset):
+            return dataset_path.instance_ids
         with open(dataset_path, "r") as dataset:
             instance_ids = dataset.readlines()
             instance_ids = [instance_id.strip() for instance_id in instance_ids]
         return instance_ids
 
+    def _round_result(self, result: AgentResultType) -> ResultType:
+        """
+        Convert results provided by the agent for posting them to the harness.
+
+        Args:
+            result: Path to results, results in memory or an array with a row for every instance
+
+        Returns:
+            Path to results or results in memory
+        """
+        if isinstance(result, np.ndarray):
+            return array_to_result(self.instance_ids, result)
+        return result
+
     @skip_stage("FeatureExtraction", ({}, {}))
     def _run_feature_extraction(
         self, fe_params: FeatureExtractionParams, instance_ids: List[str]
@@ -89,11 +130,11 @@ class VisualRound:
         Returns:
             Tuple for feature and logit dictionary for a round
         """
-        rfeature_dict, rlogit_dict = {}, {}
-        if len(self.features_dict) > 0 and len(self.logit_dict) > 0:
-            for instance_id in instance_ids:
-                rfeature_dict[instance_id] = self.features_dict[instance_id]
-                rlogit_dict[instance_id] = self.logit_dict[instance_id]
+        self.features_replayed = self.feature_provider.has_features()
+        if self.features_replayed:
+            rfeature_dict, rlogit_dict = self.feature_provider.get_round_features(
+                instance_ids
+            )
         else:
             fe_toolset = fe_params.get_toolset()
             rfeature_dict, rlogit_dict = self.algorithm.execute(
@@ -119,7 +160,4 @@ class VisualRound:
             None
         """
         wd_result = self.algorithm.execute(wcd_params.get_toolset(), "WorldDetection")
-        self.harness.post_results(
-            {"detection": wd_result}, self.test_id, round_id, self.session_id
-        )
-        safe_remove(wd_result)
+        self.result_poster.post({"detection": self._round_result(wd_result)}, round_id)
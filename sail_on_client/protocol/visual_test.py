@@ -3,14 +3,24 @@
 import logging
 import os
 import pickle as pkl
-from typing import Union, Tuple, Dict, List
+from typing import Union, Tuple, Dict, List, Optional
 import ubelt as ub
 
 from sail_on_client.harness.test_and_evaluation_harness import (
     TestAndEvaluationHarnessType,
 )
+from sail_on_client.protocol.feature_provider import (
+    DEFAULT_FEATURE_CACHE_SIZE,
+    FeatureProvider,
+)
 from sail_on_client.protocol.visual_round import VisualRound
 from sail_on_client.utils.decorators import skip_stage
+from sail_on_client.utils.feature_store import (
+    FEATURE_FORMATS,
+    FEATURE_STORE_EXT,
+    is_feature_store,
+    save_feature_store,
+)
 from sail_on_client.protocol.ond_dataclasses import (
     AlgorithmAttributes as ONDAlgorithmAttributes,
 )
@@ -37,6 +47,8 @@ class VisualTest:
         skip_stages: List[str],
         use_consolidated_features: bool,
         use_saved_features: bool,
+        feature_format: str = "pickle",
+        feature_cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
     ) -> None:
         """
         Construct visual test.
@@ -52,6 +64,8 @@ class VisualTest:
             skip_stages: List of stages that would be skipped
             use_consolidated_features: Flag for using consolidated features
             use_saved_features: Flag for using saved features
+            feature_format: Format used for saving features, one of pickle or mmap
+            feature_cache_size: Number of instances whose saved features are cached
 
         Returns:
             None
@@ -66,33 +80,52 @@ class VisualTest:
         self.skip_stages = skip_stages
         self.use_consolidated_features = use_consolidated_features
         self.use_saved_features = use_saved_features
-
-    def _restore_features(self, test_id: str) -> Tuple[Dict, Dict]:
+        if feature_format not in FEATURE_FORMATS:
+            raise ValueError(
+                f"Feature format should be one of {FEATURE_FORMATS}, got {feature_format}"
+            )
+        self.feature_format = feature_format
+        self.feature_cache_size = feature_cache_size
+
+    def _feature_path(self, test_id: str) -> str:
         """
-        Private function to restore features.
+        Private function to find the path of saved features.
 
         Args:
            test_id: An identifier for the test
 
         Returns:
-            Tuple of dictionary with features and logits obtained from the feature extractor
+            Path to a pickle file or a feature store with features for the test
         """
-        features_dict: Dict = {}
-        logit_dict: Dict = {}
         algorithm_name = self.algorithm_attributes.name
-        if self.use_saved_features:
-            if os.path.isdir(self.feature_dir):
-                if self.use_consolidated_features:
-                    feature_fname = f"{algorithm_name}_features.pkl"
-                else:
-                    feature_fname = f"{test_id}_{algorithm_name}_features.pkl"
-                feature_path = os.path.join(self.feature_dir, feature_fname)
-                test_features = pkl.load(open(feature_path, "rb"))
-            else:
-                test_features = pkl.load(open(self.feature_dir, "rb"))
-            features_dict = test_features["features_dict"]
-            logit_dict = test_features["logit_dict"]
-        return features_dict, logit_dict
+        if is_feature_store(self.feature_dir) or not os.path.isdir(self.feature_dir):
+            return self.feature_dir
+        if self.use_consolidated_features:
+            feature_fname = f"{algorithm_name}_features"
+        else:
+            feature_fname = f"{test_id}_{algorithm_name}_features"
+        feature_path = os.path.join(self.feature_dir, feature_fname)
+        # Prefer memory mapped features over pickled features
+        if is_feature_store(feature_path + FEATURE_STORE_EXT):
+            return feature_path + FEATURE_STORE_EXT
+        return feature_path + ".pkl"
+
+    def _create_feature_provider(self, test_id: str) -> Optional[FeatureProvider]:
+        """
+        Private function to create a provider that restores features lazily.
+
+        Args:
+           test_id: An identifier for the test
+
+        Returns:
+            Provider for saved features or None if saved features are not used
+        """
+        if not self.use_saved_features:
+            return None
+        return FeatureProvider(
+            feature_path=self._feature_path(test_id),
+            cache_size=self.feature_cache_size,
+        )
 
     def _aggregate_features_across_round(
         self, round_instance: VisualRound, feature_dict: Dict, logit_dict: Dict
@@ -108,6 +141,9 @@ class VisualTest:
         Return:
             Tuple of features and logits with features and logits from the round
         """
+        if getattr(round_instance, "features_replayed", False):
+            # Features replayed from saved features are not saved again
+            return feature_dict, logit_dict
         feature_dict.update(getattr(round_instance, "rfeature_dict", {}))
         logit_dict.update(getattr(round_instance, "rlogit_dict", {}))
         return feature_dict, logit_dict
@@ -130,8 +166,15 @@ class VisualTest:
         ub.ensuredir(self.feature_dir)
         algorithm_name = self.algorithm_attributes.name
         feature_path = os.path.join(
-            self.feature_dir, f"{test_id}_{algorithm_name}_features.pkl"
+            self.feature_dir, f"{test_id}_{algorithm_name}_features"
         )
-        log.info(f"Saving features in {feature_path}")
-        with open(feature_path, "wb") as f:
-            pkl.dump({"features_dict": feature_dict, "logit_dict": logit_dict}, f)
+        features = {"features_dict": feature_dict, "logit_dict": logit_dict}
+        if self.feature_format == "mmap":
+            feature_path = feature_path + FEATURE_STORE_EXT
+            log.info(f"Saving features in {feature_path}")
+            save_feature_store(feature_path, features)
+        else:
+            feature_path = feature_path + ".pkl"
+            log.info(f"Saving features in {feature_path}")
+            with open(feature_path, "wb") as f:
+                pkl.dump(features, f)
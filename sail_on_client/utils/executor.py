@@ -0,0 +1,103 @@
+"""Executors for running tests concurrently in protocols."""
+
+import contextlib
+import json
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Tuple, Type, Union
+
+EXECUTORS = ["serial", "thread", "process"]
+
+# Harness shared with the workers or class and config used to create one
+HarnessSpec = Union[Any, Tuple[Type, Dict]]
+
+_worker_state = threading.local()
+
+
+def create_executor(executor: str, num_workers: int) -> Optional[Executor]:
+    """
+    Create a pool for running tests concurrently.
+
+    Args:
+        executor: One of serial, thread or process
+        num_workers: Number of workers in the pool
+
+    Returns:
+        An executor or None if the tests are run serially
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Executor should be one of {EXECUTORS}, got {executor}")
+    if executor == "serial":
+        return None
+    if num_workers < 1:
+        raise ValueError(f"Number of workers should be positive, got {num_workers}")
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=num_workers)
+    return ProcessPoolExecutor(max_workers=num_workers)
+
+
+def worker_instance(cls: Type, config: Dict) -> Any:
+    """
+    Get an instance of a configurable class that is owned by the current worker.
+
+    Instances are created once per thread (and thus once per process in a
+    process pool) from the configuration of the instance used by the
+    protocol, so workers never share the state of agents. Instances are
+    kept until the worker exits, so harnesses and other instances that hold
+    resources which should be closed are created with worker_harness.
+
+    Args:
+        cls: Configurable class of the instance
+        config: Configuration used to create the instance
+
+    Returns:
+        An instance of cls
+    """
+    if not hasattr(_worker_state, "instances"):
+        _worker_state.instances = {}
+    key = (cls, json.dumps(config, sort_keys=True, default=str))
+    if key not in _worker_state.instances:
+        _worker_state.instances[key] = cls.from_config(config)
+    return _worker_state.instances[key]
+
+
+def worker_harness_spec(harness: Any, executor: str) -> HarnessSpec:
+    """
+    Get the harness used by the workers of an executor.
+
+    Thread safe harnesses are shared by the workers of a thread executor,
+    e.g. an AsyncParHarness runs the requests of every worker on its event
+    loop. Otherwise every worker creates a harness from the configuration.
+
+    Args:
+        harness: Harness used by the protocol
+        executor: One of serial, thread or process
+
+    Returns:
+        The harness or the class and configuration of the harness
+    """
+    if executor == "thread" and harness.thread_safe:
+        return harness
+    return (type(harness), harness.get_config())
+
+
+@contextlib.contextmanager
+def worker_harness(harness_spec: HarnessSpec) -> Iterator[Any]:
+    """
+    Get the harness for a test run by a worker.
+
+    A harness created by the worker is closed after the test, while a
+    shared harness is closed by the protocol.
+
+    Args:
+        harness_spec: Harness returned by worker_harness_spec
+
+    Returns:
+        Iterator with the harness
+    """
+    if not isinstance(harness_spec, tuple):
+        yield harness_spec
+        return
+    cls, config = harness_spec
+    with cls.from_config(config) as harness:
+        yield harness
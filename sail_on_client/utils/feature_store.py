@@ -0,0 +1,402 @@
+"""Memory mapped store for features saved by the client."""
+
+import json
+import os
+import pickle as pkl
+import struct
+import sys
+from types import TracebackType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Type, Union
+
+import numpy as np
+import ubelt as ub
+
+FEATURE_FORMATS = ["pickle", "mmap"]
+FEATURE_STORE_EXT = ".store"
+_INDEX_FNAME = "index.json"
+# Bytes reserved for the header of arrays written by the store
+_NPY_HEADER_SIZE = 256
+# Types of features restored from the store
+_NUMPY, _TORCH = "numpy", "torch"
+
+
+def _value_type(value: Any) -> str:
+    """
+    Get the type of features saved in the store without importing torch.
+
+    Args:
+        value: Features for an instance
+
+    Returns:
+        Name of the type used for restoring the features
+    """
+    if isinstance(value, np.ndarray):
+        return _NUMPY
+    torch = sys.modules.get("torch")
+    if torch is not None and isinstance(value, torch.Tensor):
+        return _TORCH
+    raise ValueError(
+        f"Expected numpy arrays or torch tensors, got {type(value).__name__}"
+    )
+
+
+def _restore_value(value: np.ndarray, value_type: str) -> Any:
+    """
+    Convert a row read from the store to the type of the saved features.
+
+    Args:
+        value: Row read from the store
+        value_type: Name of the type of the saved features
+
+    Returns:
+        Features with the type used when they were saved
+    """
+    if value_type == _TORCH:
+        import torch
+
+        return torch.from_numpy(value)
+    return value
+
+
+class FeatureArrayMapping(Mapping):
+    """
+    Read only mapping from instance ids to rows of memory mapped arrays.
+
+    Only the rows that are accessed are read from the disk, so features for
+    a test can be restored without loading the entire array in memory.
+    Features that are dictionaries of arrays, e.g. logits for multiple
+    heads, are stored with an array for every key of the dictionary.
+    Rows are restored as numpy arrays or as torch tensors on the cpu if
+    the saved features were tensors.
+    """
+
+    def __init__(
+        self,
+        instance_ids: List[str],
+        array_paths: Union[str, Dict[Any, str]],
+        value_types: Union[str, Dict[Any, str]] = _NUMPY,
+    ) -> None:
+        """
+        Construct mapping for an array in a feature store.
+
+        Args:
+            instance_ids: Identifier for every row of the array
+            array_paths: Path to the array saved in npy format or a dictionary
+                         with the path to an array for every key of the features
+            value_types: Type of the saved features, numpy or torch, or a
+                         dictionary with the type for every key of the features
+
+        Returns:
+            None
+        """
+        self.array_paths = array_paths
+        self.value_types = value_types
+        self.arrays: Union[np.ndarray, Dict[Any, np.ndarray]]
+        if isinstance(array_paths, str):
+            self.arrays = np.load(array_paths, mmap_mode="r")
+        else:
+            self.arrays = {
+                field: np.load(array_path, mmap_mode="r")
+                for field, array_path in array_paths.items()
+            }
+        self._row_index = {
+            instance_id: row for row, instance_id in enumerate(instance_ids)
+        }
+
+    def _value_type(self, field: Any = None) -> str:
+        """Private function to get the type of the features for a key."""
+        if isinstance(self.value_types, dict):
+            return self.value_types.get(field, _NUMPY)
+        return self.value_types
+
+    def __getitem__(self, instance_id: str) -> Any:
+        """Get a copy of the row associated with an instance id."""
+        row = self._row_index[instance_id]
+        if isinstance(self.arrays, dict):
+            return {
+                field: _restore_value(np.array(array[row]), self._value_type(field))
+                for field, array in self.arrays.items()
+            }
+        return _restore_value(np.array(self.arrays[row]), self._value_type())
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over instance ids in the order of the rows."""
+        return iter(self._row_index)
+
+    def __len__(self) -> int:
+        """Get number of instances in the mapping."""
+        return len(self._row_index)
+
+    def __contains__(self, instance_id: Any) -> bool:
+        """Check if the mapping has a row for an instance id."""
+        return instance_id in self._row_index
+
+
+class _ArrayWriter:
+    """Private class to write rows of an array before the number of rows is known."""
+
+    def __init__(self, array_path: str) -> None:
+        self.array_path = array_path
+        self.value_type: Optional[str] = None
+        self.dtype: Optional[np.dtype] = None
+        self.row_shape: Tuple[int, ...] = ()
+        self.num_rows = 0
+        self._file = open(array_path, "w+b")
+        # The header is written on close once the shape of the array is known
+        self._file.write(b"\x00" * _NPY_HEADER_SIZE)
+
+    def write(self, row: int, value: Any) -> None:
+        value_type = _value_type(value)
+        if self.value_type is None:
+            self.value_type = value_type
+        if value_type != self.value_type:
+            raise ValueError(f"Expected {self.value_type} features, got {value_type}")
+        if value_type == _TORCH:
+            value = value.detach().cpu().numpy()
+        if self.dtype is None:
+            if value.dtype.hasobject:
+                raise ValueError(f"Expected numeric features, got {value.dtype}")
+            self.dtype, self.row_shape = value.dtype, value.shape
+        if value.shape != self.row_shape:
+            raise ValueError(
+                f"Expected features with shape {self.row_shape}, got {value.shape}"
+            )
+        row_bytes = np.ascontiguousarray(value, dtype=self.dtype).tobytes()
+        self._file.seek(_NPY_HEADER_SIZE + row * len(row_bytes))
+        self._file.write(row_bytes)
+        self.num_rows = max(self.num_rows, row + 1)
+
+    def close(self) -> None:
+        if self.dtype is None:
+            self.dtype = np.dtype(np.float64)
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(self.dtype),
+                "fortran_order": False,
+                "shape": (self.num_rows,) + self.row_shape,
+            }
+        ).encode("latin1")
+        # Magic string, version and header length use the first 10 bytes
+        header_len = _NPY_HEADER_SIZE - 10
+        if len(header) >= header_len:
+            raise ValueError(f"Features with shape {self.row_shape} are not supported")
+        self._file.seek(0)
+        self._file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", header_len))
+        self._file.write(header.ljust(header_len - 1) + b"\n")
+        self._file.close()
+
+
+class FeatureStoreWriter:
+    """
+    Write features to a feature store incrementally.
+
+    Features are written to the disk as they are added, so features from
+    multiple files can be aggregated without keeping all of them in memory.
+    Features added for an instance id that is already in the store replace
+    the previous features, similar to updating a dictionary.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Construct writer for a feature store.
+
+        Args:
+            path: Directory used for the feature store
+
+        Returns:
+            None
+        """
+        self.path = path
+        ub.ensuredir(path)
+        self._index_path = os.path.join(path, _INDEX_FNAME)
+        # The index is written last so partially written stores are not used
+        if os.path.exists(self._index_path):
+            os.remove(self._index_path)
+        self._instance_ids: Dict[str, Dict[str, int]] = {}
+        self._writers: Dict[str, Union[_ArrayWriter, Dict[str, _ArrayWriter]]] = {}
+
+    def __enter__(self) -> "FeatureStoreWriter":
+        """Use the writer for adding features."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Finish writing the store, the index is not written on errors."""
+        self.close(write_index=exc_type is None)
+
+    def _create_writers(
+        self, name: str, value: Any
+    ) -> Union[_ArrayWriter, Dict[str, _ArrayWriter]]:
+        """
+        Private function to create writers based on the first value of features.
+
+        Args:
+            name: Name of the features
+            value: Features for the first instance
+
+        Returns:
+            Writer for the array or a dictionary with a writer for every key
+        """
+        if not isinstance(value, Mapping):
+            return _ArrayWriter(os.path.join(self.path, f"{name}.npy"))
+        for field in value:
+            # Keys are saved in the json index which only preserves str and int
+            if not isinstance(field, (str, int)) or isinstance(field, bool):
+                raise ValueError(
+                    f"Expected str or int keys, got {type(field).__name__}"
+                )
+        return {
+            field: _ArrayWriter(os.path.join(self.path, f"{name}.{field_idx}.npy"))
+            for field_idx, field in enumerate(value)
+        }
+
+    def update(self, features: Mapping[str, Mapping]) -> None:
+        """
+        Add features to the store.
+
+        Args:
+            features: Dictionary of mappings from instance id to features, e.g.
+                      features_dict and logit_dict
+
+        Returns:
+            None
+        """
+        for name, feature_mapping in features.items():
+            instance_ids = self._instance_ids.setdefault(name, {})
+            for instance_id, value in feature_mapping.items():
+                if name not in self._writers:
+                    self._writers[name] = self._create_writers(name, value)
+                writers = self._writers[name]
+                row = instance_ids.setdefault(instance_id, len(instance_ids))
+                try:
+                    if isinstance(writers, dict):
+                        if not isinstance(value, Mapping) or set(value) != set(writers):
+                            raise ValueError(f"Expected keys {sorted(writers)}")
+                        for field, writer in writers.items():
+                            writer.write(row, value[field])
+                    else:
+                        writers.write(row, value)
+                except ValueError as e:
+                    raise ValueError(f"Invalid {name} for {instance_id}: {e}")
+
+    def close(self, write_index: bool = True) -> None:
+        """
+        Finish writing the arrays and write the index of the store.
+
+        Args:
+            write_index: Flag to write the index that makes the store usable
+
+        Returns:
+            None
+        """
+        index: Dict[str, Dict] = {}
+        for name, instance_ids in self._instance_ids.items():
+            writers = self._writers.get(name)
+            if writers is None:
+                writers = self._create_writers(name, None)
+            entry: Dict[str, Any] = {"instance_ids": list(instance_ids)}
+            if isinstance(writers, dict):
+                entry["fields"] = []
+                for field, writer in writers.items():
+                    writer.close()
+                    entry["fields"].append(
+                        {
+                            "key": field,
+                            "file": os.path.basename(writer.array_path),
+                            "type": writer.value_type or _NUMPY,
+                        }
+                    )
+            else:
+                writers.close()
+                entry["file"] = os.path.basename(writers.array_path)
+                entry["type"] = writers.value_type or _NUMPY
+            index[name] = entry
+        self._instance_ids, self._writers = {}, {}
+        if write_index:
+            with open(self._index_path, "w") as f:
+                json.dump(index, f)
+
+
+def is_feature_store(path: str) -> bool:
+    """
+    Check if a path is a feature store.
+
+    Args:
+        path: Path to a file or a directory
+
+    Returns:
+        True if the path is a directory with a feature store
+    """
+    return os.path.isfile(os.path.join(path, _INDEX_FNAME))
+
+
+def save_feature_store(path: str, features: Mapping[str, Mapping]) -> None:
+    """
+    Save features in a feature store.
+
+    Every mapping is saved as a contiguous array with a row for every
+    instance, so the values of a mapping should have identical shapes.
+    Values should be numpy arrays, torch tensors or dictionaries of them
+    with str or int keys, and are restored with the same types.
+
+    Args:
+        path: Directory used for the feature store
+        features: Dictionary of mappings from instance id to features, e.g.
+                  features_dict and logit_dict
+
+    Returns:
+        None
+    """
+    with FeatureStoreWriter(path) as writer:
+        writer.update(features)
+
+
+def load_feature_store(path: str) -> Dict[str, FeatureArrayMapping]:
+    """
+    Load features from a feature store without reading the arrays.
+
+    Args:
+        path: Directory used for the feature store
+
+    Returns:
+        Dictionary of mappings from instance id to features
+    """
+    with open(os.path.join(path, _INDEX_FNAME), "r") as f:
+        index = json.load(f)
+    feature_mappings = {}
+    for name, entry in index.items():
+        array_paths: Union[str, Dict[Any, str]]
+        value_types: Union[str, Dict[Any, str]]
+        if "fields" in entry:
+            fields = entry["fields"]
+            array_paths = {
+                field["key"]: os.path.join(path, field["file"]) for field in fields
+            }
+            value_types = {field["key"]: field["type"] for field in fields}
+        else:
+            array_paths = os.path.join(path, entry["file"])
+            value_types = entry["type"]
+        feature_mappings[name] = FeatureArrayMapping(
+            entry["instance_ids"], array_paths, value_types
+        )
+    return feature_mappings
+
+
+def load_features(feature_path: str) -> Mapping[str, Mapping]:
+    """
+    Load features from a pickle file or a feature store.
+
+    Args:
+        feature_path: Path to a pickle file or a feature store
+
+    Returns:
+        Dictionary of mappings from instance id to features
+    """
+    if is_feature_store(feature_path):
+        return load_feature_store(feature_path)
+    with open(feature_path, "rb") as f:
+        return pkl.load(f)
@@ -33,7 +33,9 @@ def safe_remove_results(results: dict) -> None:
         None
     """
     for result_files in results.values():
-        safe_remove(result_files)
+        # Results in memory are not stored in a file
+        if isinstance(result_files, str):
+            safe_remove(result_files)
 
 
 def merge_dictionaries(base_dict: Dict, other_dict: Dict, exclude_keys: List) -> Dict:
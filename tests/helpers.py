@@ -7,6 +7,8 @@ import shutil
 import ubelt as ub
 import multiprocessing
 import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -50,6 +52,60 @@ def get_local_harness_params():
         yield data_dir, temp_dir, gt_dir, gt_config
 
 
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Handler that replicates responses of the server for a few endpoints."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, status, body=b""):
+        self.server.client_addresses.append(self.client_address)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        """Respond to metadata and dataset requests."""
+        if self.path.startswith("/test/metadata"):
+            self._respond(200, b'{"protocol": "OND", "round_size": 2}')
+        elif self.path.startswith("/session/dataset"):
+            self._respond(200, b"a.png\nb.png\n")
+        else:
+            self._respond(404)
+
+    def do_POST(self):  # noqa: N802
+        """Respond to session and result requests and record the uploaded files."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.posted.append((self.path, body))
+        if self.path.startswith("/session/results"):
+            self._respond(200)
+        elif self.path.startswith("/session"):
+            self._respond(200, b'{"session_id": "1234"}')
+        else:
+            self._respond(404)
+
+    def do_DELETE(self):  # noqa: N802
+        """Respond to test completion requests."""
+        self._respond(200)
+
+    def log_message(self, format, *args):
+        """Disable logging requests."""
+        pass
+
+
+@pytest.fixture(scope="function")
+def stand_in_server():
+    """Fixture to run a local stand-in for the server that records client connections and uploads."""
+    httpd = ThreadingHTTPServer(("localhost", 0), _StandInHandler)
+    httpd.client_addresses = []
+    httpd.posted = []
+    server_thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    server_thread.start()
+    yield f"http://localhost:{httpd.server_address[1]}", httpd.client_addresses, httpd.posted
+    httpd.shutdown()
+    httpd.server_close()
+
+
 @pytest.fixture(scope="function")
 def get_par_harness_params():
     """Fixture to provide par harness parameters."""
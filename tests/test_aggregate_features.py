@@ -1,9 +1,18 @@
 """Tests for aggregating features."""
 
+from functools import partial
 from tempfile import TemporaryDirectory
+import glob
 import os
 import pickle as pkl
 
+import numpy as np
+import pytest
+
+from sail_on_client import aggregate_features as aggregate_features_module
+from sail_on_client.aggregate_features import aggregate_features, iter_features
+from sail_on_client.utils.feature_store import load_feature_store
+
 
 def _get_feature_keys(feature_path):
     """
@@ -53,3 +62,108 @@ def test_aggregate_features(script_runner):
         op_video_ids = _get_feature_keys(op_path)
         assert op_video_ids.intersection(f1_video_ids) == f1_video_ids
         assert op_video_ids.intersection(f2_video_ids) == f2_video_ids
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_aggregate_features_mmap(tmpdir, workers):
+    """
+    Test aggregating features in a feature store.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving aggregated features
+        workers (int): Number of processes used for reading feature files
+
+    Returns:
+        None
+    """
+    test_path = os.path.dirname(__file__)
+    feature_path = os.path.join(test_path, "mock_results", "activity_recognition")
+    feature_paths = [
+        os.path.join(feature_path, "OND.2.10006.9373345_timesformer_features.pkl"),
+        os.path.join(feature_path, "OND.2.10007.9373345_timesformer_features.pkl"),
+    ]
+    pkl_path = str(tmpdir.join("aggregated_timesformer_features.pkl"))
+    store_path = str(tmpdir.join("aggregated_timesformer_features.store"))
+    aggregate_features(feature_paths, pkl_path)
+    aggregate_features(feature_paths, store_path, "mmap", workers)
+    expected_features = pkl.load(open(pkl_path, "rb"))
+    features = load_feature_store(store_path)
+    assert set(features.keys()) == set(expected_features.keys())
+    for feature_key, expected_mapping in expected_features.items():
+        assert set(features[feature_key]) == set(expected_mapping)
+        for instance_id, expected_value in expected_mapping.items():
+            value = features[feature_key][instance_id]
+            if isinstance(expected_value, dict):
+                for field, field_value in expected_value.items():
+                    np.testing.assert_array_equal(value[field], field_value)
+            else:
+                np.testing.assert_array_equal(value, expected_value)
+    # Feature stores can be aggregated with pickle files
+    repickled_path = str(tmpdir.join("repickled_timesformer_features.pkl"))
+    aggregate_features([store_path], repickled_path)
+    repickled_features = pkl.load(open(repickled_path, "rb"))
+    assert set(repickled_features["features_dict"]) == set(
+        expected_features["features_dict"]
+    )
+
+
+def _mock_feature_paths():
+    """Get paths to feature files with mock results."""
+    test_path = os.path.dirname(__file__)
+    feature_path = os.path.join(test_path, "mock_results", "activity_recognition")
+    return [
+        os.path.join(feature_path, "OND.2.10006.9373345_timesformer_features.pkl"),
+        os.path.join(feature_path, "OND.2.10007.9373345_timesformer_features.pkl"),
+    ]
+
+
+def test_aggregate_features_pickle_workers(tmpdir):
+    """
+    Test workers do not change features aggregated in a pickle file.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving aggregated features
+
+    Returns:
+        None
+    """
+    feature_paths = _mock_feature_paths()
+    serial_path = str(tmpdir.join("serial.pkl"))
+    parallel_path = str(tmpdir.join("parallel.pkl"))
+    aggregate_features(feature_paths, serial_path, "pickle", 1)
+    aggregate_features(feature_paths, parallel_path, "pickle", 2)
+    with open(serial_path, "rb") as f:
+        serial_features = pkl.load(f)
+    with open(parallel_path, "rb") as f:
+        parallel_features = pkl.load(f)
+    for feature_key, serial_mapping in serial_features.items():
+        parallel_mapping = parallel_features[feature_key]
+        assert list(parallel_mapping) == list(serial_mapping)
+        for instance_id, serial_value in serial_mapping.items():
+            assert type(parallel_mapping[instance_id]) is type(serial_value)
+
+
+def test_iter_features_bounded(tmpdir, monkeypatch):
+    """
+    Test conversions ahead of the consumed file are bounded.
+
+    Args:
+        tmpdir (py.path.local): Directory used for temporary feature stores
+        monkeypatch: Fixture to change the temporary directory of the module
+
+    Returns:
+        None
+    """
+    monkeypatch.setattr(
+        aggregate_features_module,
+        "TemporaryDirectory",
+        partial(TemporaryDirectory, dir=str(tmpdir)),
+    )
+    feature_paths = _mock_feature_paths() * 3
+    num_features = 0
+    for features in iter_features(feature_paths, workers=2, max_in_flight=2):
+        num_features += 1
+        assert "features_dict" in features
+        assert len(glob.glob(str(tmpdir.join("*", "*.store")))) <= 2
+    assert num_features == len(feature_paths)
+    assert glob.glob(str(tmpdir.join("*"))) == []
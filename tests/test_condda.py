@@ -214,3 +214,54 @@ def test_feature_extraction(
         feature_dir="",
     )
     condda.run_protocol({})
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_run_protocol_with_scheduler(
+    condda_params, condda_harness_instance, condda_algorithm_instance, executor
+):
+    """
+    Test running tests with a scheduler completes tests for all sessions.
+
+    Args:
+        condda_params (tuple): Tuple to configure CONDDA parameters with all defaults
+        condda_harness_instance: An instance of local harness
+        condda_algorithm_instance: An instance of PreComputedCONDDAAgent
+        executor (str): Executor used for running tests
+
+    Return:
+        None
+    """
+    import glob
+    import json
+
+    algorithms = {
+        "PreComputedCONDDAAgent": condda_algorithm_instance,
+        "OtherPreComputedCONDDAAgent": condda_algorithm_instance,
+    }
+    dataset_root, domain, seed, test_ids, save_dir = condda_params
+    condda = Condda(
+        algorithms,
+        dataset_root,
+        domain,
+        condda_harness_instance,
+        save_dir,
+        seed,
+        test_ids,
+        executor=executor,
+        num_workers=2,
+        max_in_flight=1,
+    )
+    condda.run_protocol({})
+    sessions = []
+    for session_file in glob.glob(
+        os.path.join(condda_harness_instance.result_dir, "*.json")
+    ):
+        with open(session_file, "r") as f:
+            session_info = json.load(f)
+        if "created" in session_info:
+            sessions.append(session_info)
+    assert len(sessions) == len(algorithms)
+    for session_info in sessions:
+        assert session_info["tests"]["completed_tests"] == test_ids
+        assert "termination" in session_info
@@ -0,0 +1,76 @@
+"""Tests for DatasetPrefetcher."""
+
+import os
+import pytest
+
+from sail_on_client.protocol.dataset_prefetcher import DatasetPrefetcher
+
+TEST_ID = "OND.10.90001.2100554"
+
+
+def _session_request(harness):
+    """
+    Private function to create a session for the test.
+
+    Args:
+        harness (LocalHarness): An instance of local harness
+
+    Return:
+        session id
+    """
+    return harness.session_request(
+        [TEST_ID], "OND", "activity_recognition", "0.1.1", [], 0.5
+    )
+
+
+@pytest.mark.parametrize("lookahead", [0, 1, 3])
+def test_iterate_rounds(ond_harness_instance, lookahead):
+    """
+    Test prefetcher provides the same datasets as requesting rounds on demand.
+
+    Args:
+        ond_harness_instance (LocalHarness): An instance of local harness
+        lookahead (int): Number of rounds requested ahead of the current round
+
+    Return:
+        None
+    """
+    session_id = _session_request(ond_harness_instance)
+    expected = []
+    with DatasetPrefetcher(ond_harness_instance, session_id, TEST_ID) as datasets:
+        for round_id, dataset in datasets:
+            with open(dataset, "r") as f:
+                expected.append((round_id, f.read()))
+    assert len(expected) > 1
+    rounds = []
+    with DatasetPrefetcher(
+        ond_harness_instance, session_id, TEST_ID, lookahead
+    ) as datasets:
+        for round_id, dataset in datasets:
+            with open(dataset, "r") as f:
+                rounds.append((round_id, f.read()))
+    assert rounds == expected
+
+
+def test_close_removes_prefetched_datasets(ond_harness_instance):
+    """
+    Test datasets that were prefetched but not used are removed.
+
+    Args:
+        ond_harness_instance (LocalHarness): An instance of local harness
+
+    Return:
+        None
+    """
+    session_id = _session_request(ond_harness_instance)
+    with DatasetPrefetcher(ond_harness_instance, session_id, TEST_ID, 2) as datasets:
+        for round_id, dataset in datasets:
+            break
+    assert round_id == 0
+    assert os.path.exists(dataset)
+    dataset_dir = os.path.dirname(dataset)
+    for prefetched_round in [1, 2]:
+        prefetched_dataset = os.path.join(
+            dataset_dir, f"{session_id}.{TEST_ID}.{prefetched_round}.csv"
+        )
+        assert not os.path.exists(prefetched_dataset)
@@ -3,6 +3,7 @@
 import pytest
 import numpy as np
 import math
+import pandas as pd
 
 from sail_on_client.evaluate.utils import (
     check_novel_validity,
@@ -11,6 +12,8 @@ from sail_on_client.evaluate.utils import (
     top3_accuracy,
     get_rolling_stats,
     get_first_detect_novelty,
+    topk_correct,
+    PrefixAccuracy,
 )
 
 
@@ -96,3 +99,28 @@ def test_get_first_detect_novelty(seeded_rng):
     p_novel = seeded_rng.random((100))
     first_novelty = get_first_detect_novelty(p_novel, 0.5)
     assert first_novelty == 3
+
+
+@pytest.mark.parametrize("k", [1, 3, 6])
+def test_topk_correct(seeded_rng, k):
+    """Test partial sort correctness matches full sort with ties."""
+    gt = seeded_rng.integers(low=0, high=6, size=1000)
+    p_class = np.round(seeded_rng.random((1000, 6)), 1)
+    p_class[::97, 2] = np.nan
+    expected = np.any(np.argsort(-p_class)[:, :k] - gt[:, np.newaxis] == 0, axis=1)
+    assert np.array_equal(topk_correct(p_class, gt, k), expected.astype(int))
+
+
+@pytest.mark.parametrize("window_size", [1, 10, 100, 400])
+def test_prefix_accuracy(seeded_rng, window_size):
+    """Test segment accuracy and rolling stats match results on sliced vectors."""
+    correct = seeded_rng.integers(low=0, high=2, size=1000)
+    prefix = PrefixAccuracy(correct, window_size)
+    for start, end in [(0, 1000), (0, 250), (250, 1000), (900, 1000), (995, 1000)]:
+        segment = correct[start:end]
+        assert prefix.accuracy(start, end) == round(
+            float(np.sum(segment)) / segment.shape[0], 5
+        )
+        rolling_mean = pd.Series(segment).rolling(window=window_size).mean()
+        expected = [rolling_mean.mean(), rolling_mean.std()]
+        np.testing.assert_array_equal(prefix.rolling_stats(start, end), expected)
@@ -0,0 +1,101 @@
+"""Tests for evaluation engine."""
+
+import math
+import numpy as np
+import pandas as pd
+import pytest
+
+from sail_on_client.evaluate.evaluation_engine import (
+    evaluate_accuracy,
+    evaluate_program_metrics,
+)
+from sail_on_client.evaluate.image_classification import ImageClassificationMetrics
+
+
+def _assert_same_results(results, expected):
+    """Private function to check results are identical including NaNs."""
+    assert list(results.keys()) == list(expected.keys())
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            if key == "m_acc_failed":
+                # Keys for tests without incorrect predictions come from a set
+                assert sorted(results[key].keys()) == sorted(value.keys())
+                value = {k: value[k] for k in results[key].keys()}
+            _assert_same_results(results[key], value)
+        elif isinstance(value, float) and math.isnan(value):
+            assert math.isnan(results[key])
+        else:
+            assert results[key] == value, key
+
+
+def _legacy_results(metric, detections, classifications, gt):
+    """Private function to compute results with the metric functions."""
+    results = {}
+    results["m_num"] = metric.m_num(detections[1], gt[1])
+    results["m_num_stats"] = metric.m_num_stats(detections[1], gt[1])
+    results["m_ndp"] = metric.m_ndp(classifications[1], gt[1])
+    results["m_ndp_pre"] = metric.m_ndp_pre(classifications[1], gt[1])
+    results["m_ndp_post"] = metric.m_ndp_post(classifications[1], gt[1])
+    results["m_acc"] = metric.m_acc(gt[1], classifications, gt[2], 100, 5)
+    results["m_acc_failed"] = metric.m_ndp_failed_reaction(
+        detections[1], gt[1], classifications, gt[2]
+    )
+    results["m_is_cdt_and_is_early"] = metric.m_is_cdt_and_is_early(
+        results["m_num_stats"]["GT_indx"],
+        results["m_num_stats"]["P_indx_0.5"],
+        gt.shape[0],
+    )
+    return results
+
+
+@pytest.fixture(scope="function")
+def synthetic_test():
+    """Fixture to create a test with ties in class probabilities."""
+    rng = np.random.default_rng(2022)
+    num_samples, num_classes = 1250, 8
+    ids = [f"{idx}.png" for idx in range(num_samples)]
+    gt_novel = np.zeros(num_samples, dtype=int)
+    gt_novel[430:] = rng.integers(0, 2, size=num_samples - 430)
+    gt_novel[430] = 1
+    gt = pd.DataFrame(
+        {
+            0: ids,
+            1: gt_novel,
+            2: rng.integers(0, num_classes - 1, size=num_samples),
+        }
+    )
+    # Coarse probabilities create ties between classes
+    class_prob = np.round(rng.random((num_samples, num_classes)), 1)
+    classifications = pd.DataFrame(class_prob)
+    classifications.insert(0, "id", ids)
+    classifications.columns = range(num_classes + 1)
+    detections = pd.DataFrame({0: ids, 1: np.round(rng.random(num_samples), 2)})
+    return detections, classifications, gt
+
+
+@pytest.mark.parametrize("has_novelty", [True, False])
+def test_evaluate_program_metrics(synthetic_test, has_novelty):
+    """
+    Test program metrics from the engine are identical to metric functions.
+
+    Args:
+        synthetic_test (tuple): Detections, classifications and ground truth
+        has_novelty (bool): Flag to keep novel samples in the ground truth
+
+    Return:
+        None
+    """
+    detections, classifications, gt = synthetic_test
+    if not has_novelty:
+        gt[1] = 0
+    metric = ImageClassificationMetrics("OND", 0, 1, 2)
+    results = evaluate_program_metrics(
+        metric, detections, classifications, gt, 1, 1, 1, 2, 100, 5
+    )
+    _assert_same_results(
+        results, _legacy_results(metric, detections, classifications, gt)
+    )
+    _assert_same_results(
+        evaluate_accuracy(classifications, gt, 1, 2, 100, 0),
+        metric.m_acc(gt[1], classifications, gt[2], 100, 0),
+    )
@@ -0,0 +1,80 @@
+"""Tests for executors used by the protocols."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sail_on_client.utils.executor import (
+    worker_harness,
+    worker_harness_spec,
+    worker_instance,
+)
+
+
+class _ClosableHarness:
+    """Configurable harness that records if it was closed."""
+
+    thread_safe = False
+
+    def __init__(self, url):
+        self.url = url
+        self.closed = False
+
+    def get_config(self):
+        return {"url": self.url}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closed = True
+
+
+def test_worker_instance():
+    """
+    Test instances are cached for every worker.
+
+    Return:
+        None
+    """
+    config = {"url": "http://localhost"}
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(worker_instance, _ClosableHarness, config).result()
+        second = pool.submit(worker_instance, _ClosableHarness, config).result()
+    assert first is second
+    assert worker_instance(_ClosableHarness, config) is not first
+
+
+def test_worker_harness():
+    """
+    Test harnesses created by workers are closed after the test.
+
+    Return:
+        None
+    """
+    shared_harness = _ClosableHarness("http://localhost")
+    harness_spec = worker_harness_spec(shared_harness, "thread")
+    with worker_harness(harness_spec) as harness:
+        assert harness is not shared_harness
+        assert harness.url == "http://localhost"
+        assert not harness.closed
+    assert harness.closed
+
+
+def test_worker_harness_shared():
+    """
+    Test thread safe harnesses are shared by the workers of a thread executor.
+
+    Return:
+        None
+    """
+    shared_harness = _ClosableHarness("http://localhost")
+    shared_harness.thread_safe = True
+    with worker_harness(worker_harness_spec(shared_harness, "thread")) as harness:
+        assert harness is shared_harness
+    # The protocol closes the shared harness
+    assert not shared_harness.closed
+    harness_spec = worker_harness_spec(shared_harness, "process")
+    assert harness_spec == (_ClosableHarness, {"url": "http://localhost"})
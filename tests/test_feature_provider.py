@@ -0,0 +1,81 @@
+"""Tests for feature provider."""
+
+import pickle as pkl
+
+import numpy as np
+
+from sail_on_client.protocol.feature_provider import FeatureProvider
+from sail_on_client.utils.feature_store import save_feature_store
+
+
+def _create_features(num_instances):
+    """
+    Create features and logits for instances.
+
+    Args:
+        num_instances: Number of instances with features
+
+    Returns:
+        Dictionary with features_dict and logit_dict
+    """
+    rng = np.random.default_rng(0)
+    return {
+        "features_dict": {f"{idx}.png": rng.random(8) for idx in range(num_instances)},
+        "logit_dict": {f"{idx}.png": rng.random(3) for idx in range(num_instances)},
+    }
+
+
+def test_get_round_features(tmpdir):
+    """
+    Test features are loaded lazily and provided for instances in a round.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving features
+
+    Return:
+        None
+    """
+    features = _create_features(10)
+    feature_path = str(tmpdir.join("Agent_features.pkl"))
+    with open(feature_path, "wb") as f:
+        pkl.dump(features, f)
+    feature_provider = FeatureProvider(feature_path=feature_path, cache_size=2)
+    assert feature_provider._features_dict is None
+    assert feature_provider.has_features()
+    instance_ids = ["3.png", "5.png", "7.png"]
+    rfeature_dict, rlogit_dict = feature_provider.get_round_features(instance_ids)
+    assert list(rfeature_dict) == instance_ids
+    assert list(rlogit_dict) == instance_ids
+    for instance_id in instance_ids:
+        np.testing.assert_array_equal(
+            rfeature_dict[instance_id], features["features_dict"][instance_id]
+        )
+        np.testing.assert_array_equal(
+            rlogit_dict[instance_id], features["logit_dict"][instance_id]
+        )
+    # Only the most recently used instances are cached
+    assert list(feature_provider._cache) == ["5.png", "7.png"]
+    feature_provider.get_round_features(["5.png", "1.png"])
+    assert list(feature_provider._cache) == ["5.png", "1.png"]
+
+
+def test_feature_store_and_empty_features(tmpdir):
+    """
+    Test provider with features from a feature store and without features.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving features
+
+    Return:
+        None
+    """
+    features = _create_features(4)
+    store_path = str(tmpdir.join("Agent_features.store"))
+    save_feature_store(store_path, features)
+    feature_provider = FeatureProvider(feature_path=store_path, cache_size=0)
+    rfeature_dict, _ = feature_provider.get_round_features(["0.png", "2.png"])
+    np.testing.assert_array_equal(
+        rfeature_dict["2.png"], features["features_dict"]["2.png"]
+    )
+    assert len(feature_provider._cache) == 0
+    assert not FeatureProvider({}, {}).has_features()
@@ -0,0 +1,160 @@
+"""Tests for feature store."""
+
+import numpy as np
+import pytest
+
+from sail_on_client.utils.feature_store import (
+    FeatureArrayMapping,
+    FeatureStoreWriter,
+    is_feature_store,
+    load_feature_store,
+    save_feature_store,
+)
+
+
+def test_save_and_load(tmpdir):
+    """
+    Test features restored from a store are identical to saved features.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving the store
+
+    Return:
+        None
+    """
+    rng = np.random.default_rng(0)
+    features = {
+        "features_dict": {f"{idx}.png": rng.random(16) for idx in range(10)},
+        "logit_dict": {f"{idx}.png": rng.random((2, 3)) for idx in range(10)},
+    }
+    store_path = str(tmpdir.join("OND.1.1.1234_Agent_features.store"))
+    assert not is_feature_store(store_path)
+    save_feature_store(store_path, features)
+    assert is_feature_store(store_path)
+    restored = load_feature_store(store_path)
+    for name, feature_mapping in features.items():
+        restored_mapping = restored[name]
+        assert isinstance(restored_mapping, FeatureArrayMapping)
+        assert isinstance(restored_mapping.arrays, np.memmap)
+        assert list(restored_mapping) == list(feature_mapping)
+        assert len(restored_mapping) == len(feature_mapping)
+        assert "missing.png" not in restored_mapping
+        for instance_id, value in feature_mapping.items():
+            np.testing.assert_array_equal(restored_mapping[instance_id], value)
+
+
+def test_save_empty_and_mismatched_shapes(tmpdir):
+    """
+    Test stores for empty features and features with different shapes.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving the store
+
+    Return:
+        None
+    """
+    store_path = str(tmpdir.join("empty.store"))
+    save_feature_store(store_path, {"features_dict": {}, "logit_dict": {}})
+    restored = load_feature_store(store_path)
+    assert len(restored["features_dict"]) == 0
+    with pytest.raises(ValueError):
+        save_feature_store(
+            str(tmpdir.join("mismatched.store")),
+            {"features_dict": {"a.png": np.zeros(2), "b.png": np.zeros(3)}},
+        )
+    assert not is_feature_store(str(tmpdir.join("mismatched.store")))
+
+
+def test_feature_store_writer(tmpdir):
+    """
+    Test writing features incrementally with features that are dictionaries.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving the store
+
+    Return:
+        None
+    """
+    rng = np.random.default_rng(0)
+    first = {
+        "features_dict": {f"{idx}.png": rng.random(4) for idx in range(3)},
+        "logit_dict": {
+            f"{idx}.png": {"class_preds": rng.random(5), "known": rng.random(1)}
+            for idx in range(3)
+        },
+    }
+    second = {
+        "features_dict": {f"{idx}.png": rng.random(4) for idx in range(2, 5)},
+        "logit_dict": {
+            f"{idx}.png": {"class_preds": rng.random(5), "known": rng.random(1)}
+            for idx in range(2, 5)
+        },
+    }
+    store_path = str(tmpdir.join("aggregated.store"))
+    with FeatureStoreWriter(store_path) as writer:
+        writer.update(first)
+        assert not is_feature_store(store_path)
+        writer.update(second)
+    expected = {name: {**first[name], **second[name]} for name in first}
+    restored = load_feature_store(store_path)
+    assert list(restored["features_dict"]) == list(expected["features_dict"])
+    for instance_id, value in expected["features_dict"].items():
+        np.testing.assert_array_equal(restored["features_dict"][instance_id], value)
+    for instance_id, value in expected["logit_dict"].items():
+        restored_value = restored["logit_dict"][instance_id]
+        assert set(restored_value) == set(value)
+        for field, field_value in value.items():
+            np.testing.assert_array_equal(restored_value[field], field_value)
+    with pytest.raises(ValueError):
+        with FeatureStoreWriter(store_path) as writer:
+            writer.update({"logit_dict": {"a.png": {"known": np.zeros(1)}}})
+            writer.update({"logit_dict": {"b.png": np.zeros(1)}})
+    assert not is_feature_store(store_path)
+
+
+def test_save_and_load_types(tmpdir):
+    """
+    Test tensors and keys of dictionaries are restored with their types.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving the store
+
+    Return:
+        None
+    """
+    torch = pytest.importorskip("torch")
+    features = {
+        "features_dict": {f"{idx}.png": torch.rand(4) for idx in range(3)},
+        "logit_dict": {
+            f"{idx}.png": {0: torch.rand(5), "known": np.random.random(1)}
+            for idx in range(3)
+        },
+    }
+    store_path = str(tmpdir.join("typed.store"))
+    save_feature_store(store_path, features)
+    restored = load_feature_store(store_path)
+    for instance_id, value in features["features_dict"].items():
+        restored_value = restored["features_dict"][instance_id]
+        assert isinstance(restored_value, torch.Tensor)
+        assert torch.equal(restored_value, value)
+    for instance_id, value in features["logit_dict"].items():
+        restored_value = restored["logit_dict"][instance_id]
+        assert set(restored_value) == {0, "known"}
+        assert isinstance(restored_value[0], torch.Tensor)
+        assert torch.equal(restored_value[0], value[0])
+        assert isinstance(restored_value["known"], np.ndarray)
+        np.testing.assert_array_equal(restored_value["known"], value["known"])
+    with pytest.raises(ValueError, match="numpy arrays or torch tensors"):
+        save_feature_store(
+            str(tmpdir.join("list.store")), {"features_dict": {"a.png": [0.1, 0.2]}}
+        )
+    with pytest.raises(ValueError, match="str or int keys"):
+        save_feature_store(
+            str(tmpdir.join("tuple.store")),
+            {"logit_dict": {"a.png": {(0, 1): np.zeros(2)}}},
+        )
+    with pytest.raises(ValueError, match="Expected torch features"):
+        save_feature_store(
+            str(tmpdir.join("mixed.store")),
+            {"features_dict": {"a.png": torch.zeros(2), "b.png": np.zeros(2)}},
+        )
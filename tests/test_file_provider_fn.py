@@ -0,0 +1,71 @@
+"""Tests for feedback functions used by file provider."""
+
+import os
+import pytest
+
+from sail_on_client.harness.constants import ProtocolConstants
+from sail_on_client.harness.file_provider_fn import (
+    get_classificaton_score_feedback,
+    get_single_gt_feedback,
+)
+
+
+@pytest.fixture(scope="function")
+def feedback_files(tmpdir):
+    """Fixture to create ground truth and classification results for a test."""
+    gt_path = os.path.join(tmpdir, "OND.1.1.1234_single_df.csv")
+    with open(gt_path, "w") as f:
+        f.write("file,detection,class\n")
+        f.write("a.png,0,1\n")
+        f.write("b.png,0,2\n")
+        f.write("c.png,1,0\n")
+        f.write("d.png,1,0\n")
+    result_path = os.path.join(tmpdir, "OND.1.1.1234_classification.csv")
+    with open(result_path, "w") as f:
+        f.write("a.png,0.1,0.8,0.1\n")
+        f.write("b.png,0.6,0.2,0.2\n")
+        f.write("c.png,0.5,0.5,0.0\n")
+        f.write("d.png,0.2,0.3,0.5\n")
+    return gt_path, result_path
+
+
+def test_classification_score_feedback(feedback_files):
+    """Test accuracy over the results, ties resolve to the first class."""
+    gt_path, result_path = feedback_files
+    feedback = get_classificaton_score_feedback(
+        gt_path, [result_path], [], {"columns": [1]}
+    )
+    assert feedback == {"accuracy": 0.5}
+
+
+@pytest.mark.parametrize(
+    "feedback_ids,return_incorrect,expected",
+    [
+        (None, ProtocolConstants.CLASSIFICATION, {"d.png": "0"}),
+        (
+            ["d.png", "a.png"],
+            ProtocolConstants.CLASSIFICATION,
+            {"a.png": "1", "d.png": "0"},
+        ),
+        (None, None, {"c.png": "0", "d.png": "0"}),
+    ],
+)
+def test_single_gt_feedback(feedback_files, feedback_ids, return_incorrect, expected):
+    """Test feedback for incorrect samples in the last round."""
+    gt_path, result_path = feedback_files
+    metadata = {
+        "columns": [1],
+        "round_size": 2,
+        "return_incorrect": return_incorrect,
+    }
+    feedback = get_single_gt_feedback(gt_path, [result_path], feedback_ids, metadata)
+    assert feedback == expected
+    assert list(feedback.keys()) == list(expected.keys())
+
+
+def test_single_gt_feedback_misconfigured(feedback_files):
+    """Test misconfigured feedback raises an error."""
+    gt_path, result_path = feedback_files
+    metadata = {"columns": [1], "round_size": 2, "return_incorrect": "invalid"}
+    with pytest.raises(Exception, match="misconfigured"):
+        get_single_gt_feedback(gt_path, [result_path], None, metadata)
@@ -0,0 +1,84 @@
+"""Tests for ground truth store."""
+
+import csv
+import os
+import pytest
+
+from sail_on_client.harness.file_provider_fn import (
+    read_feedback_file,
+    read_gt_csv_file,
+    read_gt_feedback,
+)
+from sail_on_client.harness.ground_truth_store import GroundTruthStore
+
+
+@pytest.fixture(scope="function")
+def gt_file(tmpdir):
+    """Fixture to create a small ground truth file."""
+    gt_path = os.path.join(tmpdir, "OND.1.1.1234_single_df.csv")
+    with open(gt_path, "w") as f:
+        f.write("file,detection,class\n")
+        f.write("a.png, 0, 1\n")
+        f.write("b.png, 0, 2\n")
+        f.write("c.png, 1, 3\n")
+        f.write("d.png, 1\n")
+        f.write("e.png, 1, 5\n")
+    return gt_path
+
+
+def test_rows(gt_file):
+    """Test parsed rows match the csv reader."""
+    store = GroundTruthStore()
+    table = store.get(gt_file)
+    assert table.rows() == read_gt_csv_file(gt_file)
+    assert table.dataset_ids == ["a.png", "b.png", "c.png", "d.png", "e.png"]
+
+
+@pytest.mark.parametrize(
+    "feedback_ids,check_constrained",
+    [
+        (None, True),
+        (None, False),
+        (["e.png", "a.png"], False),
+        (["e.png", "a.png"], True),
+        (["missing.png"], False),
+    ],
+)
+def test_feedback_rows(gt_file, feedback_ids, check_constrained):
+    """Test feedback from store matches feedback read from file."""
+    metadata = {"round_size": 2}
+    with open(gt_file, "r") as f:
+        csv_reader = csv.reader(f, delimiter=",", quotechar="|")
+        next(csv_reader)
+        expected = read_feedback_file(
+            csv_reader, feedback_ids, metadata, check_constrained
+        )
+    feedback = read_gt_feedback(gt_file, feedback_ids, metadata, check_constrained)
+    assert feedback == expected
+    assert list(feedback.keys()) == list(expected.keys())
+
+
+def test_cache_invalidation(gt_file):
+    """Test modified files are parsed again."""
+    store = GroundTruthStore()
+    table = store.get(gt_file)
+    assert store.get(gt_file) is table
+    with open(gt_file, "a") as f:
+        f.write("f.png, 0, 6\n")
+    updated_table = store.get(gt_file)
+    assert updated_table is not table
+    assert updated_table.dataset_ids[-1] == "f.png"
+    store.invalidate(gt_file)
+    assert store.cached_files() == ()
+
+
+def test_eviction(tmpdir, gt_file):
+    """Test least recently used files are evicted."""
+    other_gt_file = os.path.join(tmpdir, "OND.1.1.5678_single_df.csv")
+    with open(gt_file, "r") as f, open(other_gt_file, "w") as of:
+        of.write(f.read())
+    store = GroundTruthStore(max_bytes=os.path.getsize(gt_file))
+    store.get(gt_file)
+    store.get(other_gt_file)
+    assert store.cached_files() == (os.path.abspath(other_gt_file),)
+    assert store.current_bytes == os.path.getsize(other_gt_file)
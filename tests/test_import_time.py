@@ -0,0 +1,79 @@
+"""Tests for modules imported when the client starts."""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+# Modules imported by smqtk when the plugins are discovered
+PLUGIN_MODULES = [
+    "sail_on_client.client_launcher",
+    "sail_on_client.protocol.ond_protocol",
+    "sail_on_client.protocol.condda_protocol",
+    "sail_on_client.harness.local_harness",
+    "sail_on_client.harness.par_harness",
+    "sail_on_client.harness.async_par_harness",
+    "sail_on_client.agent.mock_ond_agents",
+    "sail_on_client.agent.mock_condda_agents",
+    "sail_on_client.agent.pre_computed_detector",
+    "sail_on_client.agent.pre_computed_reaction_agent",
+]
+
+# Dependencies that should only be imported when they are used
+LAZY_MODULES = [
+    "httpx",
+    "matplotlib",
+    "nltk",
+    "pandas",
+    "rapidfuzz",
+    "scipy",
+    "sklearn",
+    "torch",
+]
+
+
+def _imported_modules(module_names, sentinel_dir):
+    """
+    Private function to get lazy modules imported along with modules in a new process.
+
+    Lazy modules that are not installed are replaced by empty packages, so
+    modules importing them when they are loaded are detected even without
+    the optional dependencies.
+
+    Args:
+        module_names: Name of the modules that are imported
+        sentinel_dir: Directory used for the packages replacing missing modules
+
+    Returns:
+        Names of lazy modules that were imported
+    """
+    for lazy_module in LAZY_MODULES:
+        if importlib.util.find_spec(lazy_module) is None:
+            os.makedirs(os.path.join(sentinel_dir, lazy_module))
+            with open(os.path.join(sentinel_dir, lazy_module, "__init__.py"), "w"):
+                pass
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(sentinel_dir), *filter(None, [env.get("PYTHONPATH")])]
+    )
+    script = "\n".join(
+        [
+            "import json, sys",
+            *[f"import {module_name}" for module_name in module_names],
+            f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))",
+        ]
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        check=True,
+        env=env,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(output.decode("utf-8").splitlines()[-1])
+
+
+def test_plugins_import_lazily(tmpdir):
+    """Test discovering the plugins does not import heavy dependencies."""
+    assert _imported_modules(PLUGIN_MODULES, str(tmpdir)) == []
@@ -1,5 +1,7 @@
 """Tests for PAR Interface."""
 
+import glob
+import io
 import os
 import pytest
 
@@ -187,6 +189,35 @@ def test_dataset_request(get_local_harness_params):
     assert expected_image_ids == ["n01484850_18013.JPEG", "n01484850_24624.JPEG"]
 
 
+def test_round_dataset_request(get_local_harness_params):
+    """
+    Tests for dataset request with instance ids for the round.
+
+    Args:
+        get_local_harness_params (tuple): Tuple to configure local harness
+
+    Return:
+        None
+    """
+    from sail_on_client.harness.local_harness import LocalHarness
+    from sail_on_client.harness.round_dataset import RoundDataset
+
+    data_dir, result_dir, gt_dir, gt_config = get_local_harness_params
+
+    local_interface = LocalHarness(data_dir, result_dir, gt_dir, gt_config)
+
+    session_id = _initialize_session(local_interface, "OND")
+    dataset = local_interface.round_dataset_request("OND.1.1.1234", 0, session_id)
+    expected = os.path.join(
+        local_interface.temp_dir_name, f"{session_id}.OND.1.1.1234.0.csv"
+    )
+    assert dataset.path == expected
+    assert os.fspath(dataset) == expected
+    assert dataset.instance_ids == _read_image_ids(expected)
+    assert RoundDataset.from_file(expected) == dataset
+    assert len(dataset) == 2
+
+
 @pytest.mark.parametrize(
     "protocol_constant", ["detection", "classification", "characterization"]
 )
@@ -217,6 +248,49 @@ def test_post_results(get_local_harness_params, protocol_constant, protocol_name
     )
 
 
+@pytest.mark.parametrize("result_type", [str, bytes, io.StringIO, io.BytesIO])
+def test_post_results_in_memory(get_local_harness_params, result_type):
+    """
+    Tests for post results with results in memory.
+
+    Args:
+        get_local_harness_params (tuple): Tuple to configure local interface
+        result_type (type): Type used for the contents of the results
+
+    Return:
+        None
+    """
+    from sail_on_client.harness.local_harness import LocalHarness
+
+    data_dir, result_dir, gt_dir, gt_config = get_local_harness_params
+    local_interface = LocalHarness(data_dir, result_dir, gt_dir, gt_config)
+    session_id = _initialize_session(local_interface, "OND")
+    result_file = os.path.join(
+        os.path.dirname(__file__), "test_results_OND.1.1.1234.csv"
+    )
+    with open(result_file, "r") as f:
+        contents = f.read()
+    if result_type is bytes:
+        result = contents.encode("utf-8")
+    elif result_type is io.BytesIO:
+        result = io.BytesIO(contents.encode("utf-8"))
+    elif result_type is io.StringIO:
+        result = io.StringIO(contents)
+    else:
+        result = result_file
+    local_interface.post_results(
+        {"classification": result}, "OND.1.1.1234", 0, session_id
+    )
+    posted_file = os.path.join(
+        result_dir,
+        "OND",
+        "image_classification",
+        f"{session_id}.OND.1.1.1234_classification.csv",
+    )
+    with open(posted_file, "r") as f:
+        assert f.read() == contents
+
+
 @pytest.mark.parametrize(
     "feedback_mapping",
     (
@@ -269,6 +343,73 @@ def test_feedback_request(get_local_harness_params, feedback_mapping, protocol_n
     assert expected == response
 
 
+def test_detection_state(get_local_harness_params):
+    """
+    Tests for detection state tracked while posting results.
+
+    Args:
+        get_local_harness_params (tuple): Tuple to configure local interface
+
+    Return:
+        None
+    """
+    from sail_on_client.harness.local_harness import LocalHarness
+    from sail_on_client.harness.file_provider_fn import get_session_test_info
+
+    data_dir, result_dir, gt_dir, gt_config = get_local_harness_params
+    local_interface = LocalHarness(data_dir, result_dir, gt_dir, gt_config)
+    session_id = _initialize_session(local_interface, "OND", hints=["red_light"])
+    result_file = os.path.join(
+        os.path.dirname(__file__), "test_results_OND.1.1.1234.csv"
+    )
+    local_interface.post_results(
+        {"detection": result_file}, "OND.1.1.1234", 0, session_id
+    )
+    test_info = get_session_test_info(result_dir, session_id, "OND.1.1.1234")
+    assert test_info["post_results"]["detection state"] == {
+        "max_score": 1.0,
+        "red_light_seen": True,
+        "first_crossing_round": 0,
+    }
+
+
+def test_malformed_detection(get_local_harness_params):
+    """
+    Test malformed detection results are rejected before anything is written.
+
+    Args:
+        get_local_harness_params (tuple): Tuple to configure local interface
+
+    Return:
+        None
+    """
+    from sail_on_client.errors import ProtocolError
+    from sail_on_client.harness.local_harness import LocalHarness
+    from sail_on_client.harness.file_provider_fn import get_session_test_info
+
+    data_dir, result_dir, gt_dir, gt_config = get_local_harness_params
+    local_interface = LocalHarness(data_dir, result_dir, gt_dir, gt_config)
+    session_id = _initialize_session(local_interface, "OND")
+    with pytest.raises(ProtocolError) as error:
+        local_interface.post_results(
+            {"detection": b"a.png\n", "classification": b"a.png,1.0\n"},
+            "OND.1.1.1234",
+            0,
+            session_id,
+        )
+    assert error.value.reason == "CantReadFile"
+    result_files = glob.glob(
+        os.path.join(result_dir, "OND", "image_classification", "*.csv")
+    )
+    assert result_files == []
+    test_info = get_session_test_info(result_dir, session_id, "OND.1.1.1234")
+    assert "post_results" not in test_info
+    # Detection can still be posted for the round once the results are fixed
+    local_interface.post_results(
+        {"detection": b"a.png,0.9\n"}, "OND.1.1.1234", 0, session_id
+    )
+
+
 def test_image_classification_evaluate(get_local_harness_params):
     """
     Test evaluate with rounds.
@@ -418,6 +559,138 @@ def test_transcripts_evaluate(get_dt_local_harness_params):
     local_interface.evaluate("OND.0.90001.8714062", 0, session_id, baseline_session_id)
 
 
+def test_vectorized_evaluate(get_ar_local_harness_params):
+    """
+    Test evaluate with vectorized metrics matches evaluate with metric functions.
+
+    Args:
+        get_ar_local_harness_params (tuple): Tuple to configure local interface
+
+    Return:
+        None
+    """
+    import math
+    from sail_on_client.harness.local_harness import LocalHarness
+
+    data_dir, result_dir, gt_dir, gt_config = get_ar_local_harness_params
+    local_interface = LocalHarness(data_dir, result_dir, gt_dir, gt_config)
+    vectorized_interface = LocalHarness(
+        data_dir, result_dir, gt_dir, gt_config, vectorized_metrics=True
+    )
+    session_id = _initialize_session(local_interface, "OND", "activity_recognition")
+    baseline_session_id = _initialize_session(
+        local_interface, "OND", "activity_recognition"
+    )
+    result_folder = os.path.join(
+        os.path.dirname(__file__), "mock_results", "activity_recognition"
+    )
+    results = {
+        "detection": os.path.join(
+            result_folder, "OND.10.90001.2100554_PreComputedONDAgent_detection.csv"
+        ),
+        "classification": os.path.join(
+            result_folder,
+            "OND.10.90001.2100554_PreComputedONDAgent_classification.csv",
+        ),
+    }
+    baseline_result = {
+        "classification": os.path.join(
+            result_folder,
+            "OND.10.90001.2100554_BaselinePreComputedONDAgent_classification.csv",
+        ),
+    }
+    local_interface.post_results(results, "OND.10.90001.2100554", 0, session_id)
+    local_interface.post_results(
+        baseline_result, "OND.10.90001.2100554", 0, baseline_session_id
+    )
+    expected = local_interface.evaluate(
+        "OND.10.90001.2100554", 0, session_id, baseline_session_id
+    )
+    evaluation = vectorized_interface.evaluate(
+        "OND.10.90001.2100554", 0, session_id, baseline_session_id
+    )
+    assert list(evaluation.keys()) == list(expected.keys())
+    for metric_name, metric_values in expected.items():
+        assert sorted(evaluation[metric_name].keys()) == sorted(metric_values.keys())
+        for key, value in metric_values.items():
+            if isinstance(value, float) and math.isnan(value):
+                assert math.isnan(evaluation[metric_name][key])
+            else:
+                assert evaluation[metric_name][key] == value
+
+
+def test_evaluate_batch(tmpdir, get_ar_local_harness_params):
+    """
+    Test batch evaluation across processes matches evaluating every test.
+
+    Args:
+        tmpdir (str): Directory for a copy of the data with an additional test
+        get_ar_local_harness_params (tuple): Tuple to configure local interface
+
+    Return:
+        None
+    """
+    import json
+    import shutil
+    from sail_on_client.harness.local_harness import LocalHarness
+    from sail_on_client.utils.numpy_encoder import NumpyEncoder
+
+    data_dir, result_dir, _, _ = get_ar_local_harness_params
+    gt_dir = os.path.join(tmpdir, "OND", "activity_recognition")
+    shutil.copytree(os.path.join(data_dir, "OND", "activity_recognition"), gt_dir)
+    test_ids = ["OND.10.90001.2100554", "OND.10.90001.2100555"]
+    for suffix in ["_single_df.csv", "_metadata.json"]:
+        shutil.copy(
+            os.path.join(gt_dir, f"{test_ids[0]}{suffix}"),
+            os.path.join(gt_dir, f"{test_ids[1]}{suffix}"),
+        )
+    gt_config = os.path.join(gt_dir, "activity_recognition.json")
+    local_interface = LocalHarness(
+        str(tmpdir), result_dir, gt_dir, gt_config, evaluation_workers=2
+    )
+    session_ids = [
+        _initialize_session(local_interface, "OND", "activity_recognition")
+        for _ in range(2)
+    ]
+    baseline_session_id = _initialize_session(
+        local_interface, "OND", "activity_recognition"
+    )
+    result_folder = os.path.join(
+        os.path.dirname(__file__), "mock_results", "activity_recognition"
+    )
+    results = {
+        "detection": os.path.join(
+            result_folder, "OND.10.90001.2100554_PreComputedONDAgent_detection.csv"
+        ),
+        "classification": os.path.join(
+            result_folder,
+            "OND.10.90001.2100554_PreComputedONDAgent_classification.csv",
+        ),
+    }
+    baseline_result = {
+        "classification": os.path.join(
+            result_folder,
+            "OND.10.90001.2100554_BaselinePreComputedONDAgent_classification.csv",
+        ),
+    }
+    for test_id in test_ids:
+        for session_id in session_ids:
+            local_interface.post_results(results, test_id, 0, session_id)
+        local_interface.post_results(baseline_result, test_id, 0, baseline_session_id)
+    session_test_ids = [
+        (session_id, test_id) for session_id in session_ids for test_id in test_ids
+    ]
+    evaluations = local_interface.evaluate_batch(
+        session_test_ids, 0, baseline_session_id
+    )
+    assert len(evaluations) == len(session_test_ids)
+    for (session_id, test_id), evaluation in zip(session_test_ids, evaluations):
+        expected = local_interface.evaluate(test_id, 0, session_id, baseline_session_id)
+        assert json.dumps(evaluation, cls=NumpyEncoder) == json.dumps(
+            expected, cls=NumpyEncoder
+        )
+
+
 def test_image_classification_evaluate_roundwise(get_local_harness_params):
     """
     Test evaluate with rounds.
@@ -8,10 +8,12 @@ from sail_on_client.evaluate.metrics import (
     m_ndp_post,
     m_ndp_failed_reaction,
     m_acc,
+    multi_threshold_confusion,
 )
 
 import pytest
 import os
+import numpy as np
 import pandas as pd
 
 
@@ -165,3 +167,19 @@ def test_m_acc(detection_files, classification_file, expected_ar_m_acc_values):
     gt_class_idx = gt[3].to_numpy()
     m_acc_val = m_acc(gt[1], class_prob, gt_class_idx, 100, 5)
     assert m_acc_val == expected_ar_m_acc_values
+
+
+def test_multi_threshold_confusion():
+    """Test confusion matrices for multiple thresholds match masks."""
+    rng = np.random.default_rng(2022)
+    p_novel = np.round(rng.random(500), 2)
+    p_novel[::37] = np.nan
+    gt_novel = rng.integers(0, 2, size=500)
+    thresholds = np.linspace(0, 1, 201)
+    confusion = multi_threshold_confusion(p_novel, gt_novel, thresholds)
+    for idx, thresh in enumerate(thresholds):
+        preds = p_novel > thresh
+        assert confusion["TP"][idx] == np.sum(preds & (gt_novel == 1))
+        assert confusion["FP"][idx] == np.sum(preds & (gt_novel == 0))
+        assert confusion["TN"][idx] == np.sum(~preds & (gt_novel == 0))
+        assert confusion["FN"][idx] == np.sum(~preds & (gt_novel == 1))
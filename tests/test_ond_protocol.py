@@ -260,3 +260,60 @@ def test_reaction_baseline(
         is_eval_roundwise_enabled=True,
     )
     ond.run_protocol({})
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_run_protocol_with_executor(
+    tmpdir, ond_params, ond_reaction_baseline_params, ond_algorithm_instance, executor
+):
+    """
+    Test running tests concurrently produces the same scores as running serially.
+
+    Args:
+        tmpdir (str): Directory for results of the serial and concurrent runs
+        ond_params (tuple): Tuple to configure OND parameters with all defaults
+        ond_reaction_baseline_params (tuple): Tuple for testing with baseline
+        ond_algorithm_instance: An instance of PreComputedONDAgent
+        executor (str): Executor used for running tests
+
+    Return:
+        None
+    """
+    import json
+
+    dataset_root, domain, seed, test_ids, _ = ond_params
+    baseline_class, _, baseline_algorithm = ond_reaction_baseline_params
+    gt_dir = os.path.join(dataset_root, "OND", "activity_recognition")
+    gt_config = os.path.join(gt_dir, "activity_recognition.json")
+    scores = {}
+    for run_executor in ["serial", executor]:
+        run_dir = os.path.join(tmpdir, run_executor)
+        save_dir = os.path.join(run_dir, "scores")
+        os.makedirs(save_dir)
+        harness = LocalHarness(
+            dataset_root, os.path.join(run_dir, "results"), gt_dir, gt_config
+        )
+        algorithms = {"PreComputedONDAgent": ond_algorithm_instance}
+        algorithms.update(baseline_algorithm)
+        ond = ONDProtocol(
+            algorithms,
+            dataset_root,
+            domain,
+            harness,
+            save_dir,
+            seed,
+            test_ids,
+            baseline_class=baseline_class,
+            has_reaction_baseline=True,
+            is_eval_enabled=True,
+            is_eval_roundwise_enabled=True,
+            executor=run_executor,
+            num_workers=2,
+        )
+        ond.run_protocol({})
+        scores[run_executor] = {}
+        for score_file in sorted(os.listdir(save_dir)):
+            with open(os.path.join(save_dir, score_file), "r") as f:
+                scores[run_executor][score_file] = json.load(f)
+    assert scores[executor] == scores["serial"]
+    assert len(scores["serial"]) == len(test_ids)
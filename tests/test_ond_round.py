@@ -1,6 +1,8 @@
 """Tests for ONDRound."""
 
+import os
 import numpy as np
+import pandas as pd
 
 from sail_on_client.protocol.ond_round import ONDRound
 
@@ -114,3 +116,55 @@ def test_call_with_features(ond_harness_instance, ond_algorithm_instance):
         test_ids[0],
     )
     ond_round_with_features(dataset, 0)
+
+
+def test_call_with_array_results(ond_harness_instance):
+    """
+    Test __call__ of ONDRound with an agent that provides arrays as results.
+
+    Args:
+        ond_harness_instance: Instance of local interface
+
+    Returns:
+        None
+    """
+    from sail_on_client.agent.pre_computed_detector import PreComputedONDAgent
+    from sail_on_client.harness.results import open_result
+
+    class _ArrayAgent(PreComputedONDAgent):
+        def _generate_step_result(self, toolset, step_descriptor):
+            result = super()._generate_step_result(toolset, step_descriptor)
+            with open_result(result) as f:
+                result_df = pd.read_csv(f, header=None)
+            return result_df.iloc[:, 1:].to_numpy()
+
+    cache_dir = os.path.join(
+        os.path.dirname(__file__), "mock_results", "activity_recognition"
+    )
+    algorithm = _ArrayAgent("PreComputedONDAgent", cache_dir, False, 32)
+    test_ids = ["OND.10.90001.2100554"]
+    session_id = ond_harness_instance.session_request(
+        test_ids, "OND", "activity_recognition", "0.0.0", [], 0.5
+    )
+    dataset = ond_harness_instance.dataset_request(test_ids[0], 0, session_id)
+    algorithm.execute({"test_id": test_ids[0]}, "Initialize")
+    ond_round = ONDRound(
+        algorithm,
+        "",
+        {},
+        ond_harness_instance,
+        {},
+        "",
+        session_id,
+        [],
+        test_ids[0],
+    )
+    ond_round(dataset, 0)
+    posted_file = os.path.join(
+        ond_harness_instance.result_dir,
+        "OND",
+        "activity_recognition",
+        f"{session_id}.{test_ids[0]}_classification.csv",
+    )
+    posted_df = pd.read_csv(posted_file, header=None)
+    assert posted_df[0].tolist() == ONDRound.get_instance_ids(dataset)
@@ -206,3 +206,172 @@ def test_call_with_features(ond_harness_instance, ond_algorithm_instance):
             True,
         )
         ond_test(test_ids[0])
+
+
+def test_call_with_prefetch(ond_harness_instance, ond_algorithm_instance):
+    """
+    Test __call__ of ONDTest with datasets prefetched in the background.
+
+    Args:
+        ond_harness_instance: Instance of local interface
+        ond_algorithm_instance: Instance of PreComputedDetector
+
+    Returns:
+        None
+    """
+    test_ids = ["OND.10.90001.2100554"]
+    algorithm_attribute = create_algorithm_attribute(
+        ALGORITHM_NAME,
+        ond_algorithm_instance,
+        False,
+        False,
+        {},
+        "",
+        test_ids,
+    )
+    session_id = ond_harness_instance.session_request(
+        test_ids,
+        PROTOCOL,
+        DOMAIN,
+        algorithm_attribute.named_version(),
+        [],
+        algorithm_attribute.detection_threshold,
+    )
+    algorithm_attribute.session_id = session_id
+    ond_test = ONDTest(
+        algorithm_attribute,
+        "",
+        DOMAIN,
+        FEEDBACK_TYPE,
+        "",
+        ond_harness_instance,
+        "",
+        session_id,
+        [],
+        False,
+        False,
+        prefetch_rounds=2,
+    )
+    ond_test(test_ids[0])
+    assert ond_harness_instance.resume_session(session_id) == test_ids
+
+
+def test_call_with_background_posting(ond_harness_instance, ond_algorithm_instance):
+    """
+    Test __call__ of ONDTest with results posted in the background.
+
+    Args:
+        ond_harness_instance: Instance of local interface
+        ond_algorithm_instance: Instance of PreComputedDetector
+
+    Returns:
+        None
+    """
+    test_ids = ["OND.10.90001.2100554"]
+    algorithm_attribute = create_algorithm_attribute(
+        ALGORITHM_NAME,
+        ond_algorithm_instance,
+        False,
+        False,
+        {},
+        "",
+        test_ids,
+    )
+    session_id = ond_harness_instance.session_request(
+        test_ids,
+        PROTOCOL,
+        DOMAIN,
+        algorithm_attribute.named_version(),
+        [],
+        algorithm_attribute.detection_threshold,
+    )
+    algorithm_attribute.session_id = session_id
+    ond_test = ONDTest(
+        algorithm_attribute,
+        "",
+        DOMAIN,
+        FEEDBACK_TYPE,
+        "",
+        ond_harness_instance,
+        "",
+        session_id,
+        [],
+        False,
+        False,
+        background_posting=True,
+    )
+    test_score = ond_test(test_ids[0])
+    assert "Round 0" in test_score
+    assert ond_harness_instance.resume_session(session_id) == test_ids
+
+
+def test_call_with_feature_store(ond_harness_instance, ond_algorithm_instance):
+    """
+    Test __call__ of ONDTest with features saved in a feature store.
+
+    Args:
+        ond_harness_instance: Instance of local interface
+        ond_algorithm_instance: Instance of PreComputedDetector
+
+    Returns:
+        None
+    """
+    from sail_on_client.utils.feature_store import (
+        FeatureArrayMapping,
+        save_feature_store,
+    )
+
+    test_ids = ["OND.10.90001.2100554"]
+    algorithm_attribute = create_algorithm_attribute(
+        ALGORITHM_NAME,
+        ond_algorithm_instance,
+        False,
+        False,
+        {},
+        "",
+        test_ids,
+    )
+    session_id = ond_harness_instance.session_request(
+        test_ids,
+        PROTOCOL,
+        DOMAIN,
+        algorithm_attribute.named_version(),
+        [],
+        algorithm_attribute.detection_threshold,
+    )
+    with TemporaryDirectory() as tempdirectory:
+        create_temp_features(tempdirectory, test_ids[0])
+        pkl_path = os.path.join(tempdirectory, f"{ALGORITHM_NAME}_features.pkl")
+        with open(pkl_path, "rb") as f:
+            features = pkl.load(f)
+        save_feature_store(
+            os.path.join(tempdirectory, f"{ALGORITHM_NAME}_features.store"), features
+        )
+        os.remove(pkl_path)
+        algorithm_attribute.session_id = session_id
+        ond_test = ONDTest(
+            algorithm_attribute,
+            "",
+            DOMAIN,
+            FEEDBACK_TYPE,
+            tempdirectory,
+            ond_harness_instance,
+            tempdirectory,
+            session_id,
+            [],
+            True,
+            True,
+            feature_format="mmap",
+        )
+        feature_provider = ond_test._create_feature_provider(test_ids[0])
+        assert feature_provider.feature_path.endswith(".store")
+        features_dict, logit_dict = feature_provider._load()
+        assert isinstance(features_dict, FeatureArrayMapping)
+        assert isinstance(logit_dict, FeatureArrayMapping)
+        ond_test(test_ids[0])
+        # Features replayed from the store are not saved again
+        assert not os.path.exists(
+            os.path.join(
+                tempdirectory, f"{test_ids[0]}_{ALGORITHM_NAME}_features.store"
+            )
+        )
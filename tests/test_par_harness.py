@@ -412,3 +412,172 @@ def test_get_metadata(server_setup, get_par_harness_params):
     session_id = _initialize_session(par_interface, "OND", ["red_light"])
     metadata = par_interface.get_test_metadata(session_id, "OND.1.1.1234")
     assert "n01484850_4515.JPEG" == metadata["red_light"]
+
+
+@pytest.mark.parametrize("keep_alive", [True, False])
+def test_connection_reuse(tmpdir, stand_in_server, keep_alive):
+    """
+    Test requests reuse connections only when keep alive is enabled.
+
+    Args:
+        tmpdir (str): Directory used for saving files
+        stand_in_server (tuple): Tuple with url, client addresses and uploads of the requests
+        keep_alive (bool): Flag to reuse connections across requests
+
+    Return:
+        None
+    """
+    from sail_on_client.harness.par_harness import ParHarness
+
+    url, client_addresses, _ = stand_in_server
+    par_interface = ParHarness(
+        url, str(tmpdir), keep_alive=keep_alive, connect_timeout=5, read_timeout=5
+    )
+    for round_id in range(3):
+        par_interface.get_test_metadata("1234", "OND.1.1.1234")
+        par_interface.dataset_request("OND.1.1.1234", round_id, "1234")
+    par_interface.complete_test("1234", "OND.1.1.1234")
+    par_interface.close()
+    assert len(client_addresses) == 7
+    if keep_alive:
+        assert len(set(client_addresses)) == 1
+    else:
+        assert len(set(client_addresses)) == 7
+    assert ParHarness.from_config(par_interface.get_config()).keep_alive == keep_alive
+
+
+def test_async_par_harness(tmpdir, stand_in_server):
+    """
+    Test async harness issues concurrent requests on pooled connections.
+
+    Args:
+        tmpdir (str): Directory used for saving files
+        stand_in_server (tuple): Tuple with url, client addresses and uploads of the requests
+
+    Return:
+        None
+    """
+    pytest.importorskip("httpx")
+    from sail_on_client.harness.async_par_harness import AsyncParHarness
+
+    url, client_addresses, _ = stand_in_server
+    par_interface = AsyncParHarness(
+        url, str(tmpdir), pool_maxsize=2, connect_timeout=5, read_timeout=5
+    )
+    metadata = par_interface.get_test_metadata("1234", "OND.1.1.1234")
+    assert metadata["round_size"] == 2
+    futures = [
+        par_interface.submit(
+            par_interface.dataset_request_async("OND.1.1.1234", round_id, "1234")
+        )
+        for round_id in range(6)
+    ]
+    for round_id, future in enumerate(futures):
+        filename = future.result()
+        assert os.path.basename(filename) == f"1234.OND.1.1.1234.{round_id}.csv"
+        with open(filename, "r") as f:
+            assert f.read() == "a.png\nb.png\n"
+    par_interface.complete_test("1234", "OND.1.1.1234")
+    par_interface.close()
+    assert len(client_addresses) == 8
+    assert len(set(client_addresses)) <= 2
+    config = par_interface.get_config()
+    assert AsyncParHarness.from_config(config).pool_maxsize == 2
+
+
+@pytest.mark.parametrize("harness_name", ["ParHarness", "AsyncParHarness"])
+def test_par_harness_uploads(tmpdir, stand_in_server, harness_name):
+    """
+    Test blocking and async harness upload the same files.
+
+    Args:
+        tmpdir (str): Directory used for saving files
+        stand_in_server (tuple): Tuple with url, client addresses and uploads of the requests
+        harness_name (str): Name of the harness class
+
+    Return:
+        None
+    """
+    if harness_name == "AsyncParHarness":
+        pytest.importorskip("httpx")
+    from sail_on_client.harness.par_harness import ParHarness
+    from sail_on_client.harness.async_par_harness import AsyncParHarness
+
+    harness_cls = {"ParHarness": ParHarness, "AsyncParHarness": AsyncParHarness}
+    url, _, posted = stand_in_server
+    with harness_cls[harness_name](url, str(tmpdir), read_timeout=5) as par_interface:
+        session_id = par_interface.session_request(
+            ["OND.1.1.1234"], "OND", "image_classification", "0.1.1", [], 0.5
+        )
+        assert session_id == "1234"
+        par_interface.post_results(
+            {"detection": b"a.png,0.9\n"}, "OND.1.1.1234", 0, session_id
+        )
+    (session_path, session_body), (results_path, results_body) = posted
+    assert session_path == "/session"
+    assert b'name="test_ids"' in session_body
+    assert b"OND.1.1.1234\n" in session_body
+    assert results_path == "/session/results"
+    assert b'name="test_identification"' in results_body
+    assert b'name="detection_file"' in results_body
+    assert b"a.png,0.9\n" in results_body
+
+
+def test_async_par_harness_close(tmpdir, stand_in_server):
+    """
+    Test async harness shares the state of ParHarness and stops the event loop on close.
+
+    Args:
+        tmpdir (str): Directory used for saving files
+        stand_in_server (tuple): Tuple with url, client addresses and uploads of the requests
+
+    Return:
+        None
+    """
+    pytest.importorskip("httpx")
+    from sail_on_client.harness.async_par_harness import AsyncParHarness
+
+    url, _, _ = stand_in_server
+    par_interface = AsyncParHarness(url, str(tmpdir), connect_timeout=5)
+    assert par_interface._timeout() == (5, None)
+    assert par_interface.session is not None
+    with par_interface:
+        par_interface.get_test_metadata("1234", "OND.1.1.1234")
+        loop_thread = par_interface._loop_thread
+        assert loop_thread.is_alive()
+    assert par_interface._loop is None
+    assert not loop_thread.is_alive()
+    # The harness acquires a new event loop for requests after it is closed
+    assert par_interface.get_test_metadata("1234", "OND.1.1.1234")["round_size"] == 2
+    par_interface.close()
+
+
+def test_async_par_harness_threads(tmpdir, stand_in_server):
+    """
+    Test workers of a thread executor share the event loop of an async harness.
+
+    Args:
+        tmpdir (str): Directory used for saving files
+        stand_in_server (tuple): Tuple with url, client addresses and uploads of the requests
+
+    Return:
+        None
+    """
+    pytest.importorskip("httpx")
+    from concurrent.futures import ThreadPoolExecutor
+    from sail_on_client.harness.async_par_harness import AsyncParHarness
+    from sail_on_client.utils.executor import worker_harness, worker_harness_spec
+
+    def _get_metadata(harness_spec):
+        with worker_harness(harness_spec) as harness:
+            metadata = harness.get_test_metadata("1234", "OND.1.1.1234")
+            return harness, metadata["round_size"]
+
+    url, _, _ = stand_in_server
+    with AsyncParHarness(url, str(tmpdir)) as par_interface:
+        harness_spec = worker_harness_spec(par_interface, "thread")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(_get_metadata, [harness_spec] * 8))
+        assert results == [(par_interface, 2)] * 8
+        assert par_interface._loop_thread.is_alive()
+    assert par_interface._loop is None
@@ -225,6 +225,39 @@ def test_ond_classification(
     )
 
 
+def test_ond_round_slices(precomputed_ond_agent_with_features):
+    """
+    Test precomputed detector provides rows of the cached results for every round.
+
+    Args:
+        precomputed_ond_agent_with_features (PreComputedONDAgent): An instance of PreComputedONDAgent
+
+    Return:
+        None
+    """
+    import pandas as pd
+
+    toolset = {"test_id": "OND.10.90001.2100554"}
+    result_path = precomputed_ond_agent_with_features._get_result_path(
+        toolset, "detection"
+    )
+    expected_df = pd.read_csv(result_path, header=None)
+    round_results = []
+    for round_id in range(expected_df.shape[0] // 32 + 2):
+        toolset["round_id"] = round_id
+        round_results.append(
+            precomputed_ond_agent_with_features.execute(toolset, "WorldDetection")
+        )
+    assert all(
+        len(round_result.splitlines()) == 32 for round_result in round_results[:-2]
+    )
+    assert round_results[-1] == b""
+    with open(result_path, "rb") as f:
+        assert b"".join(round_results) == f.read()
+    # The result file is read once for the test
+    assert list(precomputed_ond_agent_with_features._result_index) == [result_path]
+
+
 def test_ond_characterization(precomputed_ond_agent_with_features):
     """
     Test precomputed detector characterization.
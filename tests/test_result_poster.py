@@ -0,0 +1,156 @@
+"""Tests for ResultPoster."""
+
+import threading
+import pytest
+
+from sail_on_client.protocol.result_poster import ResultPoster
+
+
+class _RecordingHarness:
+    """Harness that records posted results and the thread posting them."""
+
+    def __init__(self, fail_round=None):
+        self.posts = []
+        self.fail_round = fail_round
+
+    def post_results(self, result_files, test_id, round_id, session_id):
+        if round_id == self.fail_round:
+            raise RuntimeError(f"Failed to post round {round_id}")
+        self.posts.append(
+            (sorted(result_files), round_id, threading.current_thread().name)
+        )
+
+    def get_feedback_request(
+        self, feedback_ids, feedback_type, test_id, round_id, session_id
+    ):
+        return f"{round_id}_{feedback_type}.csv"
+
+    def evaluate_round_wise(self, test_id, round_id, session_id):
+        return {"posted_rounds": [post[1] for post in self.posts]}
+
+
+def _result_files(tmpdir, round_id):
+    """
+    Private function to create result files for a round.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving files
+        round_id (int): Identifier for the round
+
+    Return:
+        Dictionary with path of detection and classification results
+    """
+    result_files = {}
+    for result_type in ["detection", "classification"]:
+        result_file = tmpdir.join(f"{result_type}_{round_id}.csv")
+        result_file.write("a.png,0.5\n")
+        result_files[result_type] = str(result_file)
+    return result_files
+
+
+def test_post_immediately(tmpdir):
+    """
+    Test results are posted one request at a time without background posting.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving files
+
+    Return:
+        None
+    """
+    harness = _RecordingHarness()
+    result_files = _result_files(tmpdir, 0)
+    with ResultPoster(harness, "1234", "OND.1.1.1234") as result_poster:
+        result_poster.post({"detection": result_files["detection"]}, 0)
+        assert harness.posts == [(["detection"], 0, "MainThread")]
+        result_poster.post({"classification": result_files["classification"]}, 0)
+        result_poster.flush()
+    assert len(harness.posts) == 2
+    assert tmpdir.listdir() == []
+
+
+def test_post_in_background(tmpdir):
+    """
+    Test results of a round are coalesced and posted in order in the background.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving files
+
+    Return:
+        None
+    """
+    harness = _RecordingHarness()
+    with ResultPoster(harness, "1234", "OND.1.1.1234", True) as result_poster:
+        for round_id in range(3):
+            result_files = _result_files(tmpdir, round_id)
+            result_poster.post({"detection": result_files["detection"]}, round_id)
+            result_poster.post(
+                {"classification": result_files["classification"]}, round_id
+            )
+            result_poster.flush()
+        feedback = result_poster.get_feedback_request(
+            ["a.png"], "classification", "OND.1.1.1234", 2, "1234"
+        )
+        assert feedback == "2_classification.csv"
+        assert [post[1] for post in harness.posts] == [0, 1, 2]
+    for result_types, _, thread_name in harness.posts:
+        assert result_types == ["classification", "detection"]
+        assert thread_name.startswith("ResultPoster")
+    assert tmpdir.listdir() == []
+
+
+def test_post_in_background_error(tmpdir):
+    """
+    Test errors from posting results in the background are raised.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving files
+
+    Return:
+        None
+    """
+    harness = _RecordingHarness(fail_round=1)
+    with pytest.raises(RuntimeError, match="round 1"):
+        with ResultPoster(harness, "1234", "OND.1.1.1234", True) as result_poster:
+            for round_id in range(3):
+                result_poster.post(_result_files(tmpdir, round_id), round_id)
+    assert [post[1] for post in harness.posts] == [0]
+
+
+def test_evaluate_round_wise(tmpdir):
+    """
+    Test rounds are evaluated after their results are posted.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving files
+
+    Return:
+        None
+    """
+    harness = _RecordingHarness()
+    with ResultPoster(harness, "1234", "OND.1.1.1234") as result_poster:
+        result_poster.post(_result_files(tmpdir, 0), 0)
+        round_score = result_poster.evaluate_round_wise(0)
+        assert round_score.result() == {"posted_rounds": [0]}
+    harness = _RecordingHarness()
+    posting = threading.Event()
+    post_results = harness.post_results
+
+    def _blocking_post(*args):
+        posting.wait()
+        post_results(*args)
+
+    harness.post_results = _blocking_post
+    with ResultPoster(harness, "1234", "OND.1.1.1234", True) as result_poster:
+        round_scores = []
+        for round_id in range(3):
+            result_poster.post(_result_files(tmpdir, round_id), round_id)
+            round_scores.append(result_poster.evaluate_round_wise(round_id))
+        # Evaluation does not block the caller while results are being posted
+        assert not any(round_score.done() for round_score in round_scores)
+        posting.set()
+    assert [round_score.result()["posted_rounds"] for round_score in round_scores] == [
+        [0],
+        [0, 1],
+        [0, 1, 2],
+    ]
@@ -0,0 +1,62 @@
+"""Tests for results posted to the harness."""
+
+import io
+import numpy as np
+import pytest
+
+from sail_on_client.harness.results import (
+    array_to_result,
+    is_result_file,
+    open_result,
+    read_result,
+)
+
+CONTENTS = "a.png,0.5\nb.png,0.25\n"
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        CONTENTS.encode("utf-8"),
+        io.StringIO(CONTENTS),
+        io.BytesIO(CONTENTS.encode("utf-8")),
+    ],
+)
+def test_read_result(tmpdir, result):
+    """
+    Test contents of results in files and in memory are identical.
+
+    Args:
+        tmpdir (py.path.local): Directory used for saving files
+        result (object): Results in memory
+
+    Return:
+        None
+    """
+    result_file = tmpdir.join("detection.csv")
+    result_file.write(CONTENTS)
+    assert is_result_file(str(result_file))
+    assert not is_result_file(result)
+    assert read_result(str(result_file)) == CONTENTS
+    assert read_result(result) == CONTENTS
+    with open_result(str(result_file)) as f:
+        assert f.read() == CONTENTS.encode("utf-8")
+    with open_result(result) as f:
+        assert f.read() == CONTENTS.encode("utf-8")
+    with pytest.raises(TypeError):
+        read_result(0.5)
+
+
+def test_array_to_result():
+    """
+    Test conversion of arrays to results for a round.
+
+    Return:
+        None
+    """
+    result = array_to_result(["a.png", "b.png"], np.array([0.5, 0.25]))
+    assert read_result(result) == CONTENTS
+    result = array_to_result(["a.png", "b.png"], np.array([[0.5, 0.5], [1.0, 0.0]]))
+    assert read_result(result) == "a.png,0.5,0.5\nb.png,1.0,0.0\n"
+    with pytest.raises(ValueError):
+        array_to_result(["a.png"], np.array([0.5, 0.25]))
@@ -0,0 +1,134 @@
+"""Tests for round wise evaluation."""
+
+import json
+import os
+
+import pandas as pd
+
+from sail_on_client.evaluate import create_metric_instance
+from sail_on_client.evaluate.round_wise_evaluator import RoundWiseEvaluator
+
+TEST_ID = "OND.10.90001.2100554"
+ROUND_SIZE = 32
+
+
+def _classification_rounds():
+    """
+    Get classification results for the rounds of the test.
+
+    Returns:
+        List with the contents of the classification results for every round
+    """
+    result_path = os.path.join(
+        os.path.dirname(__file__),
+        "mock_results",
+        "activity_recognition",
+        f"{TEST_ID}_PreComputedONDAgent_classification.csv",
+    )
+    with open(result_path, "r") as f:
+        lines = f.readlines()
+    return [
+        "".join(lines[start : start + ROUND_SIZE])
+        for start in range(0, len(lines), ROUND_SIZE)
+    ]
+
+
+def test_evaluate_round_wise(ond_harness_instance):
+    """
+    Test incremental evaluation matches evaluating the entire results for every round.
+
+    Args:
+        ond_harness_instance: Instance of local interface
+
+    Returns:
+        None
+    """
+    session_id = ond_harness_instance.session_request(
+        [TEST_ID], "OND", "activity_recognition", "0.0.0", [], 0.5
+    )
+    with open(ond_harness_instance.gt_config, "r") as f:
+        metric = create_metric_instance("OND", "activity_recognition", json.load(f))
+    gt = pd.read_csv(
+        os.path.join(ond_harness_instance.gt_dir, f"{TEST_ID}_single_df.csv"),
+        sep=",",
+        header=None,
+        skiprows=1,
+        quotechar="|",
+    )
+    classification_path = os.path.join(
+        ond_harness_instance.result_dir,
+        "OND",
+        "activity_recognition",
+        f"{session_id}.{TEST_ID}_classification.csv",
+    )
+    for round_id, classification in enumerate(_classification_rounds()):
+        ond_harness_instance.post_results(
+            {"classification": classification.encode("utf-8")},
+            TEST_ID,
+            round_id,
+            session_id,
+        )
+        results = ond_harness_instance.evaluate_round_wise(
+            TEST_ID, round_id, session_id
+        )
+        classifications = pd.read_csv(
+            classification_path, sep=",", header=None, quotechar="|"
+        )
+        start, end = round_id * ROUND_SIZE, (round_id + 1) * ROUND_SIZE
+        expected = metric.m_acc_round_wise(
+            classifications[start:end],
+            gt.iloc[start:end][metric.classification_id],
+            round_id,
+        )
+        assert results == {f"m_acc_round_{round_id}": expected}
+    evaluator = ond_harness_instance._round_wise_evaluators[(session_id, TEST_ID)]
+    # Only rows of the rounds that were not evaluated are kept
+    assert len(evaluator._classifications) == 0
+    assert evaluator.num_evaluated == gt.shape[0]
+    ond_harness_instance.complete_test(session_id, TEST_ID)
+    assert (session_id, TEST_ID) not in ond_harness_instance._round_wise_evaluators
+
+
+def test_evaluate_earlier_round(ond_harness_instance):
+    """
+    Test evaluating a round again after later rounds and the running accuracy.
+
+    Args:
+        ond_harness_instance: Instance of local interface
+
+    Returns:
+        None
+    """
+    session_id = ond_harness_instance.session_request(
+        [TEST_ID], "OND", "activity_recognition", "0.0.0", [], 0.5
+    )
+    classification_rounds = _classification_rounds()
+    for round_id in range(2):
+        ond_harness_instance.post_results(
+            {"classification": classification_rounds[round_id].encode("utf-8")},
+            TEST_ID,
+            round_id,
+            session_id,
+        )
+    with open(ond_harness_instance.gt_config, "r") as f:
+        metric = create_metric_instance("OND", "activity_recognition", json.load(f))
+    evaluator = RoundWiseEvaluator(
+        os.path.join(ond_harness_instance.gt_dir, f"{TEST_ID}_single_df.csv"),
+        os.path.join(
+            ond_harness_instance.result_dir,
+            "OND",
+            "activity_recognition",
+            f"{session_id}.{TEST_ID}_classification.csv",
+        ),
+        metric,
+        ROUND_SIZE,
+    )
+    first_round = evaluator.evaluate(0)
+    second_round = evaluator.evaluate(1)
+    assert evaluator.evaluate(0) == first_round
+    assert evaluator.num_evaluated == 2 * ROUND_SIZE
+    running_accuracy = evaluator.running_accuracy()
+    expected_top1 = (
+        first_round["top1_accuracy_round_0"] + second_round["top1_accuracy_round_1"]
+    ) / 2
+    assert abs(running_accuracy["top1_accuracy"] - expected_top1) < 1e-9
@@ -0,0 +1,118 @@
+"""Tests for session journal."""
+
+import json
+import os
+import pytest
+
+from sail_on_client.errors.errors import ProtocolError
+from sail_on_client.harness.file_provider_fn import (
+    get_session_info,
+    get_session_test_info,
+    log_result_types,
+    log_session,
+    reset_session_test,
+)
+from sail_on_client.harness.session_journal import SessionJournal, _journals
+
+
+def _create_session(folder, session_id="1234"):
+    """Private function to log a session with a test."""
+    log_session(folder, session_id, "created", content={"protocol": "OND"})
+    for round_id in range(3):
+        log_session(
+            folder, session_id, "data_request", test_id="t.1", round_id=round_id
+        )
+        log_session(
+            folder,
+            session_id,
+            "post_results",
+            test_id="t.1",
+            round_id=round_id,
+            content={"last round": str(round_id)},
+            content_loc="activity",
+        )
+        log_result_types(folder, session_id, "t.1", round_id, ["detection"])
+    return session_id
+
+
+def test_session_info(tmpdir):
+    """Test session information is rebuilt from the journal."""
+    session_id = _create_session(tmpdir)
+    info = get_session_info(tmpdir, session_id)
+    assert info["created"]["protocol"] == "OND"
+    test_info = get_session_test_info(tmpdir, session_id, "t.1")
+    assert test_info["data_request"]["last round"] == "2"
+    assert test_info["post_results"]["rounds"]["1"]["types"] == ["detection"]
+    assert len(test_info["data_request"]["rounds"]) == 3
+    # A journal that was not used to log the activity sees the same state
+    journal = SessionJournal(str(tmpdir), session_id)
+    assert journal.session_info() == info
+    assert journal.test_info("t.1") == test_info
+
+
+def test_completion_and_termination(tmpdir):
+    """Test completion and termination write legacy files and raise errors."""
+    session_id = _create_session(tmpdir)
+    journal = SessionJournal(str(tmpdir), session_id)
+    assert not journal.is_test_completed("t.1")
+    log_session(tmpdir, session_id, "completion", test_id="t.1")
+    assert journal.is_test_completed("t.1")
+    assert not journal.is_terminated()
+    with pytest.raises(ProtocolError):
+        get_session_test_info(tmpdir, session_id, "t.1")
+    with open(os.path.join(tmpdir, f"{session_id}.t.1.json"), "r") as f:
+        assert "completion" in json.load(f)
+    log_session(tmpdir, session_id, "termination")
+    assert journal.is_terminated()
+    with pytest.raises(ProtocolError):
+        get_session_info(tmpdir, session_id)
+    info = get_session_info(tmpdir, session_id, in_process_only=False)
+    assert info["tests"]["completed_tests"] == ["t.1"]
+    with open(os.path.join(tmpdir, f"{session_id}.json"), "r") as f:
+        assert json.load(f) == info
+
+
+def test_compaction(tmpdir):
+    """Test compaction keeps the state of the session."""
+    journal = SessionJournal(str(tmpdir), "1234", compact_every=4)
+    with journal.transaction():
+        journal.log("created", content={"protocol": "OND"})
+    for round_id in range(10):
+        with journal.transaction():
+            journal.log("data_request", test_id="t.1", round_id=round_id)
+    with open(journal.path, "r") as f:
+        assert len(f.readlines()) < 4
+    other_journal = SessionJournal(str(tmpdir), "1234")
+    assert other_journal.test_info("t.1") == journal.test_info("t.1")
+    assert len(journal.test_info("t.1")["data_request"]["rounds"]) == 10
+
+
+def test_reset_and_legacy_files(tmpdir):
+    """Test resetting a test and restoring a session from legacy files."""
+    session_id = _create_session(tmpdir)
+    reset_session_test(tmpdir, session_id, "t.1")
+    assert get_session_test_info(tmpdir, session_id, "t.1") == {}
+    with open(os.path.join(tmpdir, "5678.json"), "w") as f:
+        json.dump({"created": {"protocol": "OND"}}, f)
+    with open(os.path.join(tmpdir, "5678.t.2.json"), "w") as f:
+        json.dump({"data_request": {"last round": "0"}}, f)
+    assert get_session_info(tmpdir, "5678") == {"created": {"protocol": "OND"}}
+    log_session(tmpdir, "5678", "data_request", test_id="t.2", round_id=1)
+    test_info = get_session_test_info(tmpdir, "5678", "t.2")
+    assert test_info["data_request"]["last round"] == "1"
+    assert get_session_info(tmpdir, "5678") == {"created": {"protocol": "OND"}}
+
+
+def test_termination_releases_journal(tmpdir):
+    """Test terminating a session releases the journal and keeps the lock file."""
+    session_id = _create_session(tmpdir)
+    key = (os.path.abspath(tmpdir), session_id)
+    assert key in _journals
+    assert os.path.exists(os.path.join(tmpdir, f"{session_id}.jsonl.lock"))
+    log_session(tmpdir, session_id, "termination")
+    assert key not in _journals
+    # Other processes may still hold a lock on the file
+    assert os.path.exists(os.path.join(tmpdir, f"{session_id}.jsonl.lock"))
+    info = get_session_info(tmpdir, session_id, in_process_only=False)
+    assert "termination" in info
+    assert info["created"]["protocol"] == "OND"
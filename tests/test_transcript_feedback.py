@@ -0,0 +1,76 @@
+"""Tests for transcript feedback."""
+
+import os
+import random
+
+import nltk
+import pytest
+
+from sail_on_client.harness import transcript_feedback as transcript_feedback_module
+from sail_on_client.harness.ground_truth_store import GroundTruthStore
+from sail_on_client.harness.transcript_feedback import (
+    TranscriptFeedback,
+    edit_distance,
+    edit_distances,
+    normalize_transcript,
+)
+
+
+@pytest.fixture(params=[True, False], ids=["default", "pure_python"])
+def distance_backend(request, monkeypatch):
+    """Fixture to run tests with the default backend and the pure python fallback."""
+    if not request.param:
+        monkeypatch.setattr(transcript_feedback_module, "_levenshtein", lambda: None)
+    return request.param
+
+
+def test_normalize_transcript():
+    """Test normalization of transcripts."""
+    # Separators are kept as tokens, so spaces between words are doubled
+    assert (
+        normalize_transcript('a "quoted";  word|s, here.')
+        == "a  quoted  words , here . "
+    )
+    assert normalize_transcript("") == ""
+
+
+@pytest.mark.parametrize(
+    "source,target",
+    [("", ""), ("", "abc"), ("abc", ""), ("kitten", "sitting"), ("flaw", "lawn")],
+)
+def test_edit_distance(source, target, distance_backend):
+    """Test edit distance for simple strings."""
+    assert edit_distance(source, target) == nltk.edit_distance(source, target)
+
+
+def test_edit_distances_random(distance_backend):
+    """Test edit distances match nltk for random strings."""
+    rng = random.Random(0)
+    alphabet = "abcde é"
+    pairs = [
+        (
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 90))),
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 90))),
+        )
+        for _ in range(200)
+    ]
+    expected = [nltk.edit_distance(source, target) for source, target in pairs]
+    assert edit_distances(pairs) == expected
+
+
+def test_levenshtein_feedback(tmpdir):
+    """Test feedback uses normalized ground truth cached for the test."""
+    gt_path = os.path.join(tmpdir, "OND.1.1.1234_single_df.csv")
+    with open(gt_path, "w") as f:
+        f.write("file,transcript,writer\n")
+        f.write("a.png,hello; world,w1\n")
+        f.write("b.png,foo bar,w2\n")
+    feedback = TranscriptFeedback(GroundTruthStore())
+    ground_truth = {"a.png": ["hello; world", "w1"], "b.png": ["foo bar", "w2"]}
+    results = {"a.png": ["hello world"], "b.png": ["fob bar"]}
+    assert feedback.levenshtein_feedback(gt_path, ground_truth, results, [0, 1]) == {
+        "a.png": [0, 11],
+        "b.png": [1, 8],
+    }
+    table = feedback.store.get(gt_path)
+    assert feedback._normalized[table]["hello; world"] == "hello  world"
@@ -55,6 +55,22 @@ def test_feature_extraction_params_get_toolset(feature_extraction_params):
     }
 
 
+def test_feature_extraction_params_with_dataset_ids(feature_extraction_params):
+    """
+    Test FeatureExtractionParams get_toolset with instance ids for the dataset.
+
+    Args:
+        feature_extraction_params: Dictionary with parameters to initialize FeatureExtractionParams
+
+    Returns:
+        None
+    """
+    fe_params = FeatureExtractionParams(
+        **feature_extraction_params, dataset_ids=["a.png", "b.png"]
+    )
+    assert fe_params.get_toolset()["dataset_ids"] == ["a.png", "b.png"]
+
+
 def test_world_change_detection_initialize(world_change_detection_params):
     """
     Test WorldChangeDetectionParams __init__.